@@ -0,0 +1,80 @@
+"""
+比较 page_parser 的定位解析与 BeautifulSoup 整页解析。
+
+fixtures 下的语音记录页与头像文件页按 PRTS（MediaWiki）页面结构构造，
+保留了导航、脚本配置、注释和文件历史等大段无关内容，注释与脚本中还
+故意放了形似目标属性的文本。脚本先确认两种方式提取结果一致，再分别
+计时。
+
+用法：python benchmarks/bench_page_parser.py [重复次数]
+"""
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, Optional
+
+from bs4 import BeautifulSoup
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+sys.path.insert(0, str(ROOT))
+
+from page_parser import extract_og_image, extract_voice_base  # noqa: E402
+
+
+def soup_voice_base(html: str) -> Optional[str]:
+    """改动前的实现：整页建树后查找第一个带 data-voice-base 的 div。"""
+    voice_div = BeautifulSoup(html, "html.parser").find(
+        "div",
+        attrs={"data-voice-base": True},
+    )
+    return None if not voice_div else str(voice_div.get("data-voice-base") or "")
+
+
+def soup_og_image(html: str) -> Optional[str]:
+    """改动前的实现：整页建树后查找 og:image meta。"""
+    meta = BeautifulSoup(html, "html.parser").find(
+        "meta",
+        attrs={"property": "og:image"},
+    )
+    return None if not meta else str(meta.get("content") or "")
+
+
+CASES = [
+    ("voice_page.html", "data-voice-base", extract_voice_base, soup_voice_base),
+    ("avatar_page.html", "og:image", extract_og_image, soup_og_image),
+]
+
+
+def best_ms(func: Callable[[str], Optional[str]], html: str, number: int) -> float:
+    timings = timeit.repeat(lambda: func(html), number=number, repeat=5)
+    return min(timings) / number * 1000
+
+
+def main() -> int:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    failed = False
+
+    for filename, field, fast, fallback in CASES:
+        html = (FIXTURES / filename).read_text(encoding="utf-8")
+        expected = fallback(html)
+        actual = fast(html)
+
+        if expected is None or actual != expected:
+            print(f"{filename}: {field} 不一致\n  定位解析: {actual!r}\n  BeautifulSoup: {expected!r}")
+            failed = True
+            continue
+
+        fast_ms = best_ms(fast, html, number)
+        soup_ms = best_ms(fallback, html, max(1, number // 10))
+        print(
+            f"{filename} ({len(html) // 1024} KB) {field}: "
+            f"定位解析 {fast_ms:.3f} ms，BeautifulSoup {soup_ms:.1f} ms，"
+            f"约 {soup_ms / fast_ms:.0f} 倍"
+        )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
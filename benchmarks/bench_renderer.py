@@ -0,0 +1,105 @@
+"""
+比较渲染器页面底图（网格背景、页眉、页脚）的逐线绘制与缓存贴图。
+
+逐线绘制按改动前的 _draw_background 逐条画网格线，再调用 _draw_header /
+_draw_footer；贴图路径与现在的 render_help / render_image 相同，使用
+_draw_background 的网格条带以及 _paste_header / _paste_footer。两条路径
+先核对像素完全一致，再分别计时。尺寸为帮助页的 1080x1440 与一张高列表图。
+
+用法：python benchmarks/bench_renderer.py [重复次数] [列表图高度]
+"""
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+from PIL import Image, ImageChops, ImageDraw
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from renderer import VoiceRenderer  # noqa: E402
+
+PAGE_CODE = "DB-03"
+TITLE = "干员语音档案"
+
+
+def legacy_background(
+    renderer: VoiceRenderer, image: Image.Image, draw: ImageDraw.ImageDraw
+) -> None:
+    """改动前的 _draw_background：整页填色后逐条绘制网格线。"""
+    width, height = image.size
+    draw.rectangle((0, 0, width, height), fill=renderer.COLOR_BG)
+
+    for x in range(0, width, renderer.GRID_STEP):
+        draw.line((x, 0, x, height), fill=renderer.COLOR_GRID, width=1)
+    for y in range(0, height, renderer.GRID_STEP):
+        draw.line((0, y, width, y), fill=renderer.COLOR_GRID, width=1)
+
+    draw.rectangle((20, 20, width - 20, height - 20), outline=(45, 51, 54), width=1)
+    draw.rectangle((20, 20, 27, height - 20), fill=renderer.COLOR_YELLOW)
+
+    mark = 18
+    for x, y, sx, sy in (
+        (35, 35, 1, 1),
+        (width - 35, 35, -1, 1),
+        (35, height - 35, 1, -1),
+        (width - 35, height - 35, -1, -1),
+    ):
+        draw.line((x, y, x + sx * mark, y), fill=renderer.COLOR_MUTED, width=2)
+        draw.line((x, y, x, y + sy * mark), fill=renderer.COLOR_MUTED, width=2)
+
+
+def draw_chrome(renderer: VoiceRenderer, width: int, height: int) -> Image.Image:
+    image = renderer._new_rgba((width, height), renderer.COLOR_BG + (255,))
+    draw = ImageDraw.Draw(image)
+    legacy_background(renderer, image, draw)
+    renderer._draw_header(draw, width, page_code=PAGE_CODE, title=TITLE)
+    renderer._draw_footer(draw, width, height)
+    return image
+
+
+def paste_chrome(renderer: VoiceRenderer, width: int, height: int) -> Image.Image:
+    image = renderer._new_rgba((width, height), renderer.COLOR_BG + (255,))
+    draw = ImageDraw.Draw(image)
+    renderer._draw_background(image, draw)
+    renderer._paste_header(image, page_code=PAGE_CODE, title=TITLE)
+    renderer._paste_footer(image)
+    return image
+
+
+def best_ms(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main() -> int:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    tall = int(sys.argv[2]) if len(sys.argv) > 2 else 14000
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        renderer = VoiceRenderer(output_dir=output_dir)
+        width = renderer.CANVAS_WIDTH
+        failed = False
+
+        for height in (1440, tall):
+            expected = draw_chrome(renderer, width, height)
+            # 首次调用同时建立贴图缓存，计时只统计命中缓存后的开销。
+            actual = paste_chrome(renderer, width, height)
+
+            if ImageChops.difference(expected, actual).getbbox() is not None:
+                print(f"{width}x{height}: 贴图结果与逐线绘制不一致")
+                failed = True
+                continue
+
+            draw_ms = best_ms(lambda: draw_chrome(renderer, width, height), number)
+            paste_ms = best_ms(lambda: paste_chrome(renderer, width, height), number)
+            print(
+                f"{width}x{height}: 逐线绘制 {draw_ms:.2f} ms，"
+                f"贴图 {paste_ms:.2f} ms，每次渲染节省 {draw_ms - paste_ms:.2f} ms"
+            )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
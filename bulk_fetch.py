@@ -0,0 +1,353 @@
+"""批量下载调度：多名角色按优先级排队下载，进度持久化到磁盘，重启后可继续。"""
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from astrbot.api import logger
+
+from . import constants
+from .data_source import VoiceManager
+
+# 来源优先级：绑定引用的角色最先下载，其次是别称目标，最后是手动指定。
+SOURCE_PRIORITY = {"binding": 0, "alias": 1, "manual": 2}
+
+
+def collect_targets(
+    custom_mappings: Dict[str, dict],
+    custom_aliases: Dict[str, str],
+    characters: Optional[Iterable[str]] = None,
+    *,
+    bindings_only: bool = False,
+) -> List[Tuple[str, str]]:
+    """
+    生成 (角色, 来源) 列表。
+
+    未指定角色时下载所有绑定引用的角色与用户自定义别称的目标，内置别称
+    不计入；bindings_only 为真时只下载绑定引用的角色。指定角色时只下载
+    这些角色，其中被绑定引用的角色仍标记为绑定来源以便优先处理。
+    """
+    bound = [
+        str(info.get("character", ""))
+        for info in custom_mappings.values()
+        if isinstance(info, dict)
+    ]
+
+    if characters is None:
+        targets = [(character, "binding") for character in bound]
+
+        if not bindings_only:
+            targets.extend((target, "alias") for target in custom_aliases.values())
+
+        return targets
+
+    bound_bases = {VoiceManager._base_character(character) for character in bound}
+    return [
+        (
+            character,
+            "binding"
+            if VoiceManager._base_character(character) in bound_bases
+            else "manual",
+        )
+        for character in characters
+    ]
+
+
+class BulkFetchScheduler:
+    """
+    批量语音下载调度器。
+
+    同一时间最多 concurrency 名角色并行下载，具体文件请求仍受
+    VoiceManager 按主机划分的全局并发额度限制。每名角色的语音批量落盘
+    后统一改名，语音索引在任务期间合并写入；每完成一名角色都会原子写入
+    进度文件，插件重启后未完成的角色可以继续下载；用户主动取消的任务
+    记为 cancelled，重启后不自动继续，只能手动恢复。
+    """
+
+    STATE_VERSION = 1
+
+    def __init__(
+        self,
+        voice_mgr: VoiceManager,
+        state_file: Path,
+        *,
+        on_fetched: Optional[Callable[[], None]] = None,
+        concurrency: int = constants.BULK_FETCH_CONCURRENCY,
+    ) -> None:
+        self.voice_mgr = voice_mgr
+        self.state_file = Path(state_file)
+        self.on_fetched = on_fetched
+        self.concurrency = max(1, int(concurrency))
+        self._task: Optional[asyncio.Task] = None
+        self._state: Optional[Dict[str, Any]] = self._load_state()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def resumable(self) -> bool:
+        return (
+            not self.running
+            and self._state is not None
+            and any(item["status"] == "pending" for item in self._state["items"])
+        )
+
+    @property
+    def auto_resumable(self) -> bool:
+        """插件退出打断的任务可在启动时自动继续；用户取消的任务不会。"""
+        return (
+            self.resumable
+            and self._state is not None
+            and self._state.get("status") == "paused"
+        )
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        if not self.state_file.is_file():
+            return None
+
+        try:
+            with self.state_file.open("r", encoding="utf-8") as handle:
+                state = json.load(handle)
+
+            if (
+                not isinstance(state, dict)
+                or state.get("version") != self.STATE_VERSION
+                or not isinstance(state.get("items"), list)
+            ):
+                return None
+
+            items = []
+
+            for item in state["items"]:
+                if not isinstance(item, dict) or not self.voice_mgr.validate_character(
+                    item.get("character")
+                ):
+                    continue
+
+                status = item.get("status")
+                # 上次退出时正在下载的角色重新排队。
+                if status not in {"done", "failed"}:
+                    status = "pending"
+
+                items.append(
+                    {
+                        "character": item["character"],
+                        "source": str(item.get("source", "manual")),
+                        "status": status,
+                        "message": str(item.get("message", "")),
+                    }
+                )
+
+            state["items"] = items
+
+            if state.get("status") == "running":
+                state["status"] = "paused"
+
+            state["languages"] = str(state.get("languages", ""))
+            state["includeSkin"] = bool(state.get("includeSkin", False))
+            return state
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning(f"读取批量下载进度失败，已忽略: {exc}")
+            return None
+
+    def _save_state(self) -> None:
+        if self._state is None:
+            return
+
+        self._state["updatedAt"] = time.time()
+
+        try:
+            self.voice_mgr._atomic_write_json(self.state_file, self._state)
+        except OSError as exc:
+            logger.warning(f"保存批量下载进度失败: {exc}")
+
+    def plan(
+        self,
+        targets: Iterable[Tuple[str, str]],
+    ) -> List[Dict[str, str]]:
+        """
+        把 (角色, 来源) 规范为基础角色并去重，按来源优先级稳定排序。
+
+        同一角色出现在多个来源时取优先级最高的来源。
+        """
+        planned: Dict[str, str] = {}
+
+        for character, source in targets:
+            parsed = self.voice_mgr._parse_character_reference(str(character).strip())
+
+            if not parsed:
+                continue
+
+            base_character = self.voice_mgr.resolve_operator_alias(parsed[0])
+
+            if not self.voice_mgr.validate_character(base_character):
+                continue
+
+            previous = planned.get(base_character)
+
+            if previous is None or SOURCE_PRIORITY.get(
+                source, len(SOURCE_PRIORITY)
+            ) < SOURCE_PRIORITY.get(previous, len(SOURCE_PRIORITY)):
+                planned[base_character] = source
+
+        ordered = sorted(
+            planned.items(),
+            key=lambda item: SOURCE_PRIORITY.get(item[1], len(SOURCE_PRIORITY)),
+        )
+        return [
+            {
+                "character": character,
+                "source": source,
+                "status": "pending",
+                "message": "",
+            }
+            for character, source in ordered
+        ]
+
+    def start(
+        self,
+        targets: Iterable[Tuple[str, str]],
+        *,
+        languages: str,
+        include_skin: bool,
+    ) -> Tuple[bool, str]:
+        """新建批量任务；已有任务运行时拒绝，未完成的旧进度会被替换。"""
+        if self.running:
+            return False, "已有批量下载任务正在执行"
+
+        items = self.plan(targets)
+
+        if not items:
+            return False, "没有需要下载的角色"
+
+        self._state = {
+            "version": self.STATE_VERSION,
+            "createdAt": time.time(),
+            "updatedAt": time.time(),
+            "languages": str(languages),
+            "includeSkin": bool(include_skin),
+            "status": "running",
+            "items": items,
+        }
+        self._save_state()
+        self._task = asyncio.create_task(self._run())
+        return True, f"已开始批量下载 {len(items)} 名角色"
+
+    def resume(self) -> Tuple[bool, str]:
+        """继续上次未完成的批量任务。"""
+        if self.running:
+            return False, "批量下载任务正在执行"
+
+        if not self.resumable:
+            return False, "没有可继续的批量下载任务"
+
+        assert self._state is not None
+        self._state["status"] = "running"
+        self._save_state()
+        self._task = asyncio.create_task(self._run())
+        pending = sum(item["status"] == "pending" for item in self._state["items"])
+        return True, f"继续批量下载，剩余 {pending} 名角色"
+
+    async def stop(self, *, cancel: bool = False) -> None:
+        """
+        停止调度；未完成的角色保留为待下载。
+
+        插件退出时任务记为 paused，下次启动自动继续；cancel 为真表示用户
+        主动取消，任务记为 cancelled，之后只能手动继续。
+        """
+        task = self._task
+        self._task = None
+
+        if task is None or task.done():
+            return
+
+        task.cancel()
+
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+        if cancel and self._state is not None:
+            self._state["status"] = "cancelled"
+            self._save_state()
+
+    def progress(self) -> Dict[str, Any]:
+        """返回批量任务的状态与计数，供命令和 Page 展示。"""
+        if self._state is None:
+            return {"status": "idle", "total": 0, "items": []}
+
+        items = self._state["items"]
+        counts = {
+            status: sum(item["status"] == status for item in items)
+            for status in ("pending", "running", "done", "failed")
+        }
+        return {
+            "status": self._state.get("status", "idle"),
+            "running": self.running,
+            "resumable": self.resumable,
+            "languages": self._state["languages"],
+            "includeSkin": self._state["includeSkin"],
+            "total": len(items),
+            **counts,
+            "items": [dict(item) for item in items],
+        }
+
+    async def _run(self) -> None:
+        assert self._state is not None
+        state = self._state
+        queue: asyncio.Queue = asyncio.Queue()
+
+        for item in state["items"]:
+            if item["status"] == "pending":
+                queue.put_nowait(item)
+
+        logger.info(f"批量下载开始，待处理 {queue.qsize()} 名角色")
+
+        async def worker() -> None:
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                item["status"] = "running"
+
+                try:
+                    success, message = await self.voice_mgr.fetch_character_voices(
+                        item["character"],
+                        state["includeSkin"],
+                        state["languages"],
+                        group_commit=True,
+                    )
+                except asyncio.CancelledError:
+                    item["status"] = "pending"
+                    raise
+                except Exception as exc:
+                    logger.warning(f"批量下载 {item['character']} 异常: {exc}")
+                    success, message = False, str(exc)
+
+                item["status"] = "done" if success else "failed"
+                item["message"] = message
+                self._save_state()
+
+                if success and self.on_fetched is not None:
+                    self.on_fetched()
+
+        try:
+            with self.voice_mgr.deferred_index_writes():
+                await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+            state["status"] = "completed"
+            logger.info(
+                "批量下载结束："
+                f"成功 {sum(item['status'] == 'done' for item in state['items'])}，"
+                f"失败 {sum(item['status'] == 'failed' for item in state['items'])}"
+            )
+        except asyncio.CancelledError:
+            state["status"] = "paused"
+            raise
+        finally:
+            self._save_state()
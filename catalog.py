@@ -0,0 +1,425 @@
+"""PRTS 干员目录：离线保存全部干员名、皮肤、语音 key 与头像链接，供匹配和下载决策使用。"""
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+from astrbot.api import logger
+
+from . import constants
+from .fuzzy_index import FuzzyCandidate, FuzzyIndex
+from .page_parser import extract_attribute_values
+from .rate_limit import CircuitOpenError
+
+
+class CatalogError(Exception):
+    pass
+
+
+class OperatorCatalog:
+    """
+    干员目录快照。
+
+    干员名来自干员一览页面，按 ETag / Last-Modified 增量刷新；皮肤与语言
+    来自各干员的语音记录页（复用 VoiceManager 的语音 key 缓存），只补齐
+    缺失或过期的条目；头像链接在下载头像时顺带记录。
+    """
+
+    CATALOG_VERSION = 1
+
+    def __init__(self, voice_mgr, catalog_file: Path) -> None:
+        self.voice_mgr = voice_mgr
+        self.catalog_file = Path(catalog_file)
+        # 干员名 -> 语言代码、皮肤名 -> 语言代码、头像链接、详情更新时间。
+        self.operators: Dict[str, Dict[str, Any]] = {}
+        self._roster: Dict[str, Any] = {}
+        self._dirty = False
+        self._fuzzy_index = FuzzyIndex()
+        self._refresh_lock = asyncio.Lock()
+        # 名称未命中时最近一次条件刷新名单的时间与结果。
+        self._miss_refreshed_at = 0.0
+        self._miss_refresh_ok = True
+        # 后台补齐详情的任务与进度。
+        self._detail_task: Optional[asyncio.Task] = None
+        self._detail_progress: Dict[str, int] = {}
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.operators)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name in self.operators
+
+    @property
+    def ready(self) -> bool:
+        """是否已经有可用的干员名单；为空时调用方应回退到原有的在线判断。"""
+        return bool(self.operators)
+
+    def _load(self) -> None:
+        if not self.catalog_file.is_file():
+            return
+
+        try:
+            with self.catalog_file.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+
+            if (
+                not isinstance(payload, dict)
+                or payload.get("version") != self.CATALOG_VERSION
+                or not isinstance(payload.get("operators"), dict)
+            ):
+                return
+
+            roster = payload.get("roster")
+            self._roster = roster if isinstance(roster, dict) else {}
+
+            for name, entry in payload["operators"].items():
+                if not self.voice_mgr.validate_character(name) or not isinstance(
+                    entry, dict
+                ):
+                    continue
+
+                self.operators[name] = self._normalize_entry(entry)
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning(f"读取干员目录失败，将重新获取: {exc}")
+
+        self._rebuild_fuzzy_index()
+
+    @staticmethod
+    def _normalize_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+        languages = entry.get("languages")
+        skins = entry.get("skins")
+        avatar = entry.get("avatar")
+        details_at = entry.get("detailsAt")
+
+        return {
+            "languages": [
+                str(code) for code in languages if isinstance(code, str)
+            ]
+            if isinstance(languages, list)
+            else [],
+            "skins": {
+                str(name): [str(code) for code in codes if isinstance(code, str)]
+                for name, codes in skins.items()
+                if isinstance(codes, list)
+            }
+            if isinstance(skins, dict)
+            else {},
+            "avatar": avatar if isinstance(avatar, str) else None,
+            "detailsAt": details_at if isinstance(details_at, (int, float)) else None,
+        }
+
+    def save_if_dirty(self) -> None:
+        """下载过程中记录的详情与头像在此统一落盘。"""
+        if self._dirty:
+            self._save()
+
+    def _save(self) -> None:
+        self._dirty = False
+
+        try:
+            self.voice_mgr._atomic_write_json(
+                self.catalog_file,
+                {
+                    "version": self.CATALOG_VERSION,
+                    "roster": self._roster,
+                    "operators": self.operators,
+                },
+            )
+        except OSError as exc:
+            logger.warning(f"保存干员目录失败: {exc}")
+
+    def _rebuild_fuzzy_index(self) -> None:
+        terms = []
+
+        for name, entry in self.operators.items():
+            terms.append((name, name))
+            terms.extend((skin, name) for skin in entry["skins"])
+
+        self._fuzzy_index.replace_group("roster", terms)
+
+    def entry(self, name: str) -> Optional[Dict[str, Any]]:
+        """返回某干员的目录信息，含已缓存的 PRTS 语音 key。"""
+        entry = self.operators.get(name)
+
+        if entry is None:
+            return None
+
+        cached = self.voice_mgr._voice_key_cache.get(name) or {}
+        return {
+            "name": name,
+            **entry,
+            "voiceKeys": dict(cached.get("map") or {}),
+        }
+
+    def fuzzy_match(
+        self,
+        name: str,
+        *,
+        limit: int = 1,
+        cutoff: float = constants.FUZZY_MATCH_THRESHOLD,
+    ) -> List[FuzzyCandidate]:
+        """在全部 PRTS 干员（含皮肤名）中模糊匹配，返回 (干员名, 匹配词, 相似度)。"""
+        return self._fuzzy_index.search(name, limit=limit, cutoff=cutoff)
+
+    def record_avatar(self, name: str, url: str) -> None:
+        entry = self.operators.get(name)
+
+        if entry is None or entry.get("avatar") == url:
+            return
+
+        entry["avatar"] = url
+        self._dirty = True
+
+    def record_voice_map(self, name: str, voice_map: Dict[str, str]) -> None:
+        """根据语音记录页的 语言标签 -> voice key 更新语言与皮肤信息。"""
+        languages = set()
+        skins: Dict[str, set] = {}
+
+        for label, voice_key in voice_map.items():
+            if label == "语音key":
+                continue
+
+            language = self.voice_mgr._language_from_label(label)
+
+            if self.voice_mgr._is_skin_label(label):
+                skin_name = self.voice_mgr._skin_name_from_label(label, voice_key)
+                skins.setdefault(skin_name, set()).add(language)
+            else:
+                languages.add(language)
+
+        entry = self.operators.setdefault(name, self._normalize_entry({}))
+        entry["languages"] = sorted(languages)
+        entry["skins"] = {
+            skin_name: sorted(codes) for skin_name, codes in sorted(skins.items())
+        }
+        entry["detailsAt"] = time.time()
+        self._dirty = True
+
+    async def refresh_roster(self, *, force: bool = False) -> Tuple[int, int]:
+        """
+        刷新干员名单，返回 (新增数, 移除数)。
+
+        有效期内不发请求；过期后带条件请求，页面未变化时只更新时间戳。
+        """
+        async with self._refresh_lock:
+            fetched_at = self._roster.get("fetchedAt")
+
+            if (
+                not force
+                and self.operators
+                and isinstance(fetched_at, (int, float))
+                and time.time() - fetched_at < constants.CATALOG_TTL
+            ):
+                return 0, 0
+
+            headers = {}
+
+            if self.operators and self._roster.get("etag"):
+                headers["If-None-Match"] = self._roster["etag"]
+
+            if self.operators and self._roster.get("lastModified"):
+                headers["If-Modified-Since"] = self._roster["lastModified"]
+
+            session = self.voice_mgr._get_session()
+
+            try:
+                limiter = await self.voice_mgr._rate_limiter.acquire(
+                    constants.PRTS_ROSTER_PAGE_URL
+                )
+            except CircuitOpenError as exc:
+                raise CatalogError(str(exc)) from exc
+
+            try:
+                async with session.get(
+                    constants.PRTS_ROSTER_PAGE_URL,
+                    headers=headers or None,
+                ) as response:
+                    limiter.observe(response.status, response.headers)
+
+                    if response.status == 304:
+                        self._roster["fetchedAt"] = time.time()
+                        self._save()
+                        return 0, 0
+
+                    if response.status != 200:
+                        raise CatalogError(f"获取干员一览失败: HTTP {response.status}")
+
+                    html = await response.text()
+                    etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                limiter.observe_error()
+                raise CatalogError(f"访问 PRTS 时网络异常: {exc}") from exc
+
+            names = await self.voice_mgr._parse_pool.run(
+                extract_attribute_values,
+                html,
+                constants.PRTS_ROSTER_NAME_ATTRIBUTE,
+            )
+            names = [name for name in names if self.voice_mgr.validate_character(name)]
+
+            if not names:
+                raise CatalogError("干员一览页面结构可能已变化：未找到干员名称")
+
+            current = set(names)
+            added = current - self.operators.keys()
+            removed = self.operators.keys() - current
+
+            for name in removed:
+                self.operators.pop(name, None)
+
+            for name in sorted(added):
+                self.operators[name] = self._normalize_entry({})
+
+            self._roster = {
+                "etag": etag,
+                "lastModified": last_modified,
+                "fetchedAt": time.time(),
+            }
+            self._rebuild_fuzzy_index()
+            self._save()
+            self.voice_mgr._rebuild_pinyin_index()
+
+            if added or removed:
+                logger.info(f"干员目录已更新：新增 {len(added)}，移除 {len(removed)}")
+
+            return len(added), len(removed)
+
+    async def refresh_on_miss(self) -> bool:
+        """
+        名称不在名单中时条件刷新名单，返回名单是否可信。
+
+        新干员可能在名单有效期内上线，因此不等过期，直接按 ETag 条件请求；
+        两次刷新至少间隔 CATALOG_MISS_REFRESH_INTERVAL，间隔内沿用上次结果。
+        """
+        now = time.time()
+
+        if now - self._miss_refreshed_at < constants.CATALOG_MISS_REFRESH_INTERVAL:
+            return self._miss_refresh_ok
+
+        self._miss_refreshed_at = now
+
+        try:
+            await self.refresh_roster(force=True)
+            self._miss_refresh_ok = True
+        except CatalogError as exc:
+            logger.warning(f"刷新 PRTS 干员目录失败: {exc}")
+            self._miss_refresh_ok = False
+
+        return self._miss_refresh_ok
+
+    def stale_operators(self) -> List[str]:
+        """尚未获取或已超过有效期的干员详情。"""
+        now = time.time()
+        return [
+            name
+            for name, entry in self.operators.items()
+            if entry["detailsAt"] is None
+            or now - entry["detailsAt"] >= constants.CATALOG_TTL
+        ]
+
+    async def refresh_details(self, *, limit: Optional[int] = None) -> Tuple[int, int]:
+        """
+        补齐缺失或过期的干员详情，返回 (成功数, 失败数)。
+
+        每次最多处理 limit 名干员，可多次调用逐步补齐；按批处理，每批结束
+        后落盘，中途取消时已获取的详情不会丢失。
+        """
+        pending = self.stale_operators()
+
+        if limit is not None:
+            pending = pending[: max(0, limit)]
+
+        semaphore = asyncio.Semaphore(constants.CATALOG_DETAIL_CONCURRENCY)
+        results = {"updated": 0, "failed": 0}
+        self._detail_progress = {"total": len(pending), "updated": 0, "failed": 0}
+
+        async def refresh_one(name: str) -> None:
+            async with semaphore:
+                try:
+                    voice_map = await self.voice_mgr._get_character_id_map(name)
+                except Exception as exc:
+                    logger.debug(f"获取 {name} 的目录详情失败: {exc}")
+                    voice_map = None
+
+            if voice_map:
+                self.record_voice_map(name, voice_map)
+                results["updated"] += 1
+            else:
+                results["failed"] += 1
+
+            self._detail_progress.update(results)
+
+        batch_size = constants.CATALOG_DETAIL_BATCH
+
+        for start in range(0, len(pending), batch_size):
+            await asyncio.gather(
+                *(refresh_one(name) for name in pending[start : start + batch_size])
+            )
+
+            if self._dirty:
+                self._rebuild_fuzzy_index()
+
+            self.save_if_dirty()
+
+        return results["updated"], results["failed"]
+
+    @property
+    def refreshing_details(self) -> bool:
+        return self._detail_task is not None and not self._detail_task.done()
+
+    def detail_progress(self) -> Dict[str, int]:
+        """最近一次补齐详情的进度：total / updated / failed。"""
+        return dict(self._detail_progress)
+
+    def start_detail_refresh(self) -> Optional[int]:
+        """在后台补齐全部缺失或过期的详情，返回待补齐数量；已在补齐时返回 None。"""
+        if self.refreshing_details:
+            return None
+
+        pending = len(self.stale_operators())
+        self._detail_task = asyncio.create_task(self._run_detail_refresh())
+        return pending
+
+    async def _run_detail_refresh(self) -> None:
+        try:
+            updated, failed = await self.refresh_details()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error(f"补齐干员目录详情失败: {exc}", exc_info=True)
+            return
+
+        logger.info(f"干员目录详情补齐完成：更新 {updated} 名，失败 {failed} 名")
+
+    async def stop(self) -> None:
+        """插件停用时取消后台补齐，并保存已经获取到的详情。"""
+        task = self._detail_task
+        self._detail_task = None
+
+        if task is None or task.done():
+            return
+
+        task.cancel()
+
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+        self.save_if_dirty()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "operators": len(self.operators),
+            "detailed": sum(
+                entry["detailsAt"] is not None for entry in self.operators.values()
+            ),
+            "skins": sum(len(entry["skins"]) for entry in self.operators.values()),
+            "rosterFetchedAt": self._roster.get("fetchedAt"),
+            "refreshingDetails": self.refreshing_details,
+            "detailProgress": self.detail_progress(),
+        }
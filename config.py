@@ -2,6 +2,8 @@
 from dataclasses import dataclass
 from typing import Any, Dict
 
+from . import constants
+
 
 @dataclass
 class PluginConfig:
@@ -13,6 +15,9 @@ class PluginConfig:
         auto_download_skin: 下载时是否包含皮肤语音
         default_language_rank: 播放时的语言优先级 (1:方言 2:中文 3:日语 4:英语 5:韩语 6:意语)
         auto_download_language: 执行下载指令时默认下载哪些语言
+        download_concurrency: 单个 PRTS 主机同时进行的语音下载数
+        watch_voice_dir: 是否监听语音目录变化并增量更新索引，替代定时全量扫描
+        lazy_download: 自动下载时先只下载要播放的一条语音，其余语音在后台补齐
     """
 
     auto_download: bool = True
@@ -20,6 +25,9 @@ class PluginConfig:
     auto_download_skin: bool = True
     default_language_rank: str = "123456"
     auto_download_language: str = "123"
+    download_concurrency: int = constants.DOWNLOAD_CONCURRENCY
+    watch_voice_dir: bool = False
+    lazy_download: bool = False
 
     @classmethod
     def from_dict(cls, config: Dict[str, Any]) -> "PluginConfig":
@@ -37,8 +45,24 @@ class PluginConfig:
             auto_download_skin=config.get("auto_download_skin", True),
             default_language_rank=config.get("default_language_rank", "123456"),
             auto_download_language=config.get("auto_download_language", "123"),
+            download_concurrency=cls._positive_int(
+                config.get("download_concurrency"),
+                constants.DOWNLOAD_CONCURRENCY,
+            ),
+            watch_voice_dir=config.get("watch_voice_dir", False),
+            lazy_download=config.get("lazy_download", False),
         )
 
+    @staticmethod
+    def _positive_int(value: Any, default: int) -> int:
+        """把配置值转换为正整数，非法值回退到默认值。"""
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            return default
+
+        return number if number > 0 else default
+
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式
 
@@ -51,4 +75,7 @@ class PluginConfig:
             "auto_download_skin": self.auto_download_skin,
             "default_language_rank": self.default_language_rank,
             "auto_download_language": self.auto_download_language,
+            "download_concurrency": self.download_concurrency,
+            "watch_voice_dir": self.watch_voice_dir,
+            "lazy_download": self.lazy_download,
         }
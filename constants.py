@@ -15,6 +15,7 @@ PLUGIN_VERSION = "3.7.4"
 
 MAX_VOICE_BYTES = 20 * 1024 * 1024  # 20MB - 单个语音文件大小上限
 MAX_IMAGE_BYTES = 10 * 1024 * 1024  # 10MB - 单个图片文件大小上限
+DOWNLOAD_CHUNK_BYTES = 64 * 1024  # 下载时每次写入磁盘的块大小
 MAX_UPLOAD_BYTES = 24 * 1024 * 1024  # 24MB - 单个上传文件大小上限
 MAX_IMPORT_BYTES = 220 * 1024 * 1024  # 220MB - ZIP 导入总大小上限
 MAX_PREVIEW_BYTES = 12 * 1024 * 1024  # 12MB - 预览文件大小上限
@@ -24,13 +25,23 @@ MAX_PREVIEW_BYTES = 12 * 1024 * 1024  # 12MB - 预览文件大小上限
 # ============================================================
 
 SCAN_CACHE_DURATION = 60  # 秒 - 语音文件扫描缓存时间
+SCAN_MTIME_GRACE = 2  # 秒 - 修改时间过近的目录不复用扫描结果，规避粗粒度时间戳
+WATCH_POLL_INTERVAL = 5  # 秒 - 目录监听回退为轮询时的检查间隔
+WATCH_DEBOUNCE_MS = 800  # 毫秒 - 目录事件合并窗口，批量下载时避免反复重扫
 MAX_DOWNLOAD_LOCKS = 200  # 下载锁 LRU 缓存大小
+RECENT_FETCH_TTL = 60  # 秒 - 同一角色刚下载成功后，相同请求直接复用结果的时间
+MAX_RECENT_FETCHES = 64  # 最近下载结果缓存条目数
+MAX_VOICE_KEY_CACHE_ENTRIES = 1000  # 语音 key 缓存最多保留的角色数，超出时淘汰最久未刷新的条目
+MAX_WAV_CACHE_ITEMS = 50000  # WAV 文件头校验结果 LRU 缓存大小
 MAX_IMPORT_MEMBERS = 160  # ZIP 导入最大文件数量
 MAX_AUDIT_ITEMS = 500  # 审计日志最大保留条目数
 MAX_TASK_ITEMS = 100  # 后台任务最大保留条目数
 MAX_OPERATION_PREVIEWS = 8  # 操作预览最大保留数量
 OPERATION_PREVIEW_TTL = 15 * 60  # 15分钟 - 操作预览过期时间
 ORPHAN_UPLOAD_TTL = 3600  # 1小时 - 孤儿临时文件清理时间
+VOICE_KEY_CACHE_TTL = 6 * 3600  # 6小时 - 角色语音 key 缓存有效期，过期后按 ETag 重新验证
+CATALOG_TTL = 24 * 3600  # 24小时 - 干员目录名单与详情的有效期
+CATALOG_MISS_REFRESH_INTERVAL = 5 * 60  # 5分钟 - 名称未命中目录时两次条件刷新名单的最小间隔
 
 # ============================================================
 # 匹配阈值与输入长度
@@ -50,8 +61,52 @@ UNKNOWN_LANGUAGE_COLOR = (100, 100, 100)  # 未知语言代码的标签底色
 # ============================================================
 
 DOWNLOAD_RETRIES = 3  # 语音下载重试次数
+DOWNLOAD_CONCURRENCY = 6  # 单个主机同时进行的语音下载数上限
+BULK_FETCH_CONCURRENCY = 2  # 批量下载时同时处理的角色数
+LAZY_VOICE_ATTEMPTS = 3  # 单条下载随机语音时，遇到 404 最多换几条
+CATALOG_DETAIL_CONCURRENCY = 2  # 补齐干员目录详情时的并发请求数
+CATALOG_DETAIL_BATCH = 40  # 后台补齐干员目录详情时每批处理的干员数，每批结束后落盘
 CHARACTER_PAGE_RETRIES = 3  # 角色页请求重试次数
 RETRYABLE_PAGE_STATUSES = {429, 500, 502, 503, 504}  # 可重试的 HTTP 状态码
+RETRY_BACKOFF_BASE = 0.4  # 重试退避基数（秒），第 n 次重试等待 base * 2**n
+
+# ============================================================
+# HTTP 连接池
+# ============================================================
+
+HTTP_POOL_LIMIT = 32  # 共享会话的最大连接数
+HTTP_POOL_LIMIT_PER_HOST = 8  # 单个主机的最大连接数（不低于下载并发数 + 2）
+HTTP_DNS_CACHE_TTL = 300  # DNS 解析缓存时间（秒）
+HTTP_KEEPALIVE_TIMEOUT = 30  # 空闲连接保持时间（秒）
+
+# ============================================================
+# PRTS 限流与熔断（按主机）
+# ============================================================
+
+RATE_LIMIT_RATE = 8  # 每秒补充的令牌数（正常速率）
+RATE_LIMIT_BURST = 16  # 令牌桶容量
+RATE_LIMIT_MIN_RATE = 0.5  # 连续 429/5xx 后速率下限
+RATE_LIMIT_RECOVERY = 0.25  # 每次正常响应后恢复的速率
+RATE_LIMIT_MAX_WAIT = 30  # 单次请求最长等待令牌或 Retry-After 的秒数，超出直接失败
+BREAKER_FAILURE_THRESHOLD = 5  # 连续失败达到此次数后熔断
+BREAKER_COOLDOWN = 30  # 首次熔断的冷却时间（秒），探测失败后翻倍
+BREAKER_MAX_COOLDOWN = 600  # 熔断冷却时间上限（秒）
+BREAKER_PROBE_TIMEOUT = 60  # 半开状态下探测请求的最长占用时间（秒）
+
+# ============================================================
+# 批量提交
+# ============================================================
+
+GROUP_COMMIT_SYNCFS_MIN = 8  # 一批文件达到此数量时改用 syncfs 一次性落盘
+VOICE_INDEX_FLUSH_INTERVAL = 30  # 批量任务期间语音索引最短写入间隔（秒）
+VOICE_KEY_CACHE_FLUSH_DELAY = 5  # 语音 key 缓存变化后合并写入的等待时间（秒）
+
+# ============================================================
+# 解析线程池
+# ============================================================
+
+PARSE_POOL_WORKERS = 2  # 页面解析与图片校验线程数
+PARSE_POOL_QUEUE = 16  # 线程池内最多排队的任务数，超出时在事件循环中等待
 
 # ============================================================
 # 版本号
@@ -238,6 +293,10 @@ PRTS_AUDIO_BASE_URL = "https://torappu.prts.wiki/assets/audio"
 PRTS_VOICE_PAGE_URL = PRTS_BASE_URL + "w/{character}/语音记录"
 PRTS_AVATAR_PAGE_URL = PRTS_BASE_URL + "w/文件:头像_{character}.png"
 
+# 干员一览页面，每名干员对应一个带 data-zh（中文名）属性的数据节点
+PRTS_ROSTER_PAGE_URL = PRTS_BASE_URL + "w/干员一览"
+PRTS_ROSTER_NAME_ATTRIBUTE = "data-zh"
+
 # ============================================================
 # HTTP Headers
 # ============================================================
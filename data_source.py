@@ -1,22 +1,33 @@
 import asyncio
+import glob
 import hashlib
 import json
 import os
+import random
 import re
 import shutil
 import tempfile
+import threading
+import time
 from collections import OrderedDict
-from io import BytesIO
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from stat import S_ISDIR, S_ISREG
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 from urllib.parse import quote, urljoin, urlparse
 
 import aiohttp
 from astrbot.api import logger
-from bs4 import BeautifulSoup
 from PIL import Image as PILImage
 
 from . import constants
+from .catalog import OperatorCatalog
+from .fuzzy_index import FuzzyCandidate, FuzzyIndex
+from .group_commit import GroupCommit
+from .page_parser import extract_og_image, extract_voice_base
+from .pinyin_index import PinyinIndex
+from .rate_limit import CircuitOpenError, PRTSRateLimiter
+from .worker_pool import BoundedWorkerPool
 
 
 class PRTSLookupError(Exception):
@@ -35,10 +46,19 @@ class VoiceManager:
     MAX_SKIN_ID_LENGTH = 80
     MAX_VOICE_BYTES = constants.MAX_VOICE_BYTES
     MAX_IMAGE_BYTES = constants.MAX_IMAGE_BYTES
+    DOWNLOAD_CHUNK_BYTES = constants.DOWNLOAD_CHUNK_BYTES
+    PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
     DOWNLOAD_RETRIES = constants.DOWNLOAD_RETRIES
+    DOWNLOAD_CONCURRENCY = constants.DOWNLOAD_CONCURRENCY
     CHARACTER_PAGE_RETRIES = constants.CHARACTER_PAGE_RETRIES
     RETRYABLE_PAGE_STATUSES = constants.RETRYABLE_PAGE_STATUSES
     VOICE_RESOURCE_MAP_VERSION = constants.VOICE_RESOURCE_MAP_VERSION
+    SCAN_MTIME_GRACE_NS = constants.SCAN_MTIME_GRACE * 1_000_000_000
+    VOICE_KEY_CACHE_TTL = constants.VOICE_KEY_CACHE_TTL
+    VOICE_INDEX_FLUSH_INTERVAL = constants.VOICE_INDEX_FLUSH_INTERVAL
+    VOICE_KEY_CACHE_FLUSH_DELAY = constants.VOICE_KEY_CACHE_FLUSH_DELAY
+    MAX_VOICE_KEY_CACHE_ENTRIES = constants.MAX_VOICE_KEY_CACHE_ENTRIES
+    RECENT_FETCH_TTL = constants.RECENT_FETCH_TTL
 
     _SAFE_COMPONENT_RE = re.compile(
         r"^[\w\- .·()（）]+$",
@@ -50,14 +70,22 @@ class VoiceManager:
         self,
         data_dir: Path,
         plugin_dir: Union[str, Path],
+        *,
+        download_concurrency: int = constants.DOWNLOAD_CONCURRENCY,
     ):
         self.data_dir = Path(data_dir)
         self.plugin_dir = Path(plugin_dir)
         self.voices_dir = self.data_dir / "voices"
         self.assets_dir = self.data_dir / "assets"
+        # 渲染器缓存的已裁切头像，文件名为 {角色}.{尺寸}.{签名}.png
+        self.avatar_thumbs_dir = self.data_dir / "avatar_thumbs"
         self.operator_alias_file = self.data_dir / "operator_aliases.json"
+        self.wav_cache_file = self.data_dir / "wav_validation_cache.json"
+        self.voice_key_cache_file = self.data_dir / "voice_key_cache.json"
         self.operator_aliases: Dict[str, str] = dict(constants.OPERATOR_ALIAS)
         self._custom_operator_aliases: Dict[str, str] = {}
+        # 别称增删成功后调用，插件据此重新编译依赖别称解析的快捷触发词。
+        self.on_aliases_changed: Optional[Callable[[], None]] = None
 
         # 兼容原 main.py。
         self.voice_index: Dict[
@@ -80,21 +108,87 @@ class VoiceManager:
             ],
         ] = {}
 
+        # 规范引用 -> (语言, 语音) -> 扫描时确认有效的文件路径。皮肤缺失条目
+        # 已展开为基础语音回退路径，播放时只需查表，无需再访问文件系统。
+        self._voice_paths: Dict[
+            str,
+            Dict[Tuple[str, str], Path],
+        ] = {}
+
         # 角色 -> 稳定皮肤资源 ID -> 展示名、目录名、各语言 PRTS voice key。
         self.skin_metadata: Dict[
             str,
             Dict[str, Dict[str, Any]],
         ] = {}
 
+        # 语言目录相对路径 -> 目录签名 (st_mtime_ns, st_ino) 与上次扫描到的语音。
+        # 签名不变时复用结果，不再逐个打开 WAV 校验文件头。
+        self._directory_scans: Dict[str, Dict[str, Any]] = {}
+        self._scanned_directories: set[str] = set()
+        # 全量扫描与按角色重扫共用这把锁，同一时间只有一个扫描在修改索引。
+        self.scan_lock = asyncio.Lock()
+
+        # 语音树内相对路径 -> (大小, st_mtime_ns, 是否有效)。Page 管理端通过
+        # 同一个 VoiceManager 校验，因此两边共享缓存；扫描线程也会读写，需加锁。
+        self._wav_validation_cache: OrderedDict[str, Tuple[int, int, bool]] = (
+            OrderedDict()
+        )
+        self._wav_cache_lock = threading.Lock()
+        self._wav_cache_dirty = False
+
+        # 基础角色 -> PRTS 语音 key 映射、ETag、Last-Modified 与获取时间。
+        # 有效期内不再请求语音记录页，过期后带条件请求重新验证。按最近刷新
+        # 顺序排列，超出 MAX_VOICE_KEY_CACHE_ENTRIES 时淘汰最早的条目。
+        self._voice_key_cache: Dict[str, Dict[str, Any]] = {}
+        # 缓存有变化时延迟 VOICE_KEY_CACHE_FLUSH_DELAY 秒在线程中合并写入。
+        self._voice_key_cache_dirty = False
+        self._voice_key_flush_task: Optional[asyncio.Task] = None
+
+        # 基础名、皮肤展示名与干员别称的模糊匹配索引，扫描时按角色更新。
+        self._fuzzy_index = FuzzyIndex()
+        # 本地角色与别称的全拼、首字母索引，字母输入可离线解析为中文名。
+        self._pinyin_index = PinyinIndex()
+
         # 使用 OrderedDict 实现 LRU 缓存，避免无限增长
         self._download_locks: OrderedDict[str, asyncio.Lock] = OrderedDict()
         self._max_locks = constants.MAX_DOWNLOAD_LOCKS
 
+        # 下载参数 (角色, 含皮肤, 语言序号, 要求无失败) -> 进行中的下载任务与
+        # 等待者数量。相同参数的并发请求共享同一次下载。
+        self._inflight_fetches: Dict[Tuple[str, bool, str, bool], Dict[str, Any]] = {}
+        # 同样的键 -> (完成时间, 结果)，只记录成功的下载。
+        self._recent_fetches: OrderedDict[
+            Tuple[str, bool, str, bool],
+            Tuple[float, Tuple[bool, str]],
+        ] = OrderedDict()
+
+        # 主机 -> 并发下载信号量，所有角色共享同一主机的下载额度。
+        self._download_concurrency = max(1, int(download_concurrency))
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # 未完成的 .part 文件 -> If-Range 校验值（强 ETag 或 Last-Modified）。
+        # 只有记录了校验值的残留文件才会用 Range 续传，否则从头下载。
+        self._partial_validators: Dict[str, str] = {}
+        # PRTS 各主机共享的令牌桶与熔断器，所有页面与资源请求都经过它。
+        self._rate_limiter = PRTSRateLimiter()
+
+        # 插件生命周期内共享的 HTTP 会话，复用到 prts.wiki 与 torappu 的连接，
+        # 首次请求时在事件循环内创建，由 close() 关闭。
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # 页面解析与 PNG 校验在独立的有界线程池中执行，避免批量下载时
+        # 阻塞其他消息处理。
+        self._parse_pool = BoundedWorkerPool("mrfz-parse")
+
         # v3 及更早版本按连续编号下载过语音，已有 WAV 可能内容与名称错位。
         # 迁移按“角色 + 语言”记录，只有整组请求没有真实失败时才清除。
         self._voice_resource_map_version = self.VOICE_RESOURCE_MAP_VERSION
         self._voice_remap_pending: set[Tuple[str, str]] = set()
 
+        # 批量任务期间合并语音索引写入，见 deferred_index_writes()。
+        self._index_write_deferrals = 0
+        self._index_dirty = False
+        self._index_saved_at = 0.0
+
         for directory in (
             self.data_dir,
             self.voices_dir,
@@ -106,7 +200,12 @@ class VoiceManager:
             )
 
         self._load_skin_metadata()
+        self._load_wav_validation_cache()
+        self._load_voice_key_cache()
+        # PRTS 全部干员的离线目录，用于区分拼写错误与尚未下载的干员。
+        self.catalog = OperatorCatalog(self, self.data_dir / "prts_catalog.json")
         self._load_operator_aliases()
+        self._refresh_alias_indexes()
         self.scan_voice_files()
 
     def _load_operator_aliases(self) -> None:
@@ -156,8 +255,17 @@ class VoiceManager:
                 pass
             return False
 
+    @property
+    def custom_operator_aliases(self) -> Dict[str, str]:
+        """用户自定义或改写过的别称，不含未改动的内置别称。"""
+        return dict(self._custom_operator_aliases)
+
     def resolve_operator_alias(self, character: str) -> str:
-        """按原样或忽略大小写解析干员别称，最多展开一层。"""
+        """
+        按原样或忽略大小写解析干员别称，最多展开一层。
+
+        拼音输入只在 /mrfz 入口另行解析，这里不做猜测。
+        """
         value = character.strip()
         if value in self.operator_aliases:
             return self.operator_aliases[value]
@@ -191,6 +299,8 @@ class VoiceManager:
             else:
                 self._custom_operator_aliases[alias] = previous_custom
             return False, "别称保存失败，请检查数据目录权限"
+        self._refresh_alias_indexes()
+        self._notify_aliases_changed()
         return True, f"已添加干员别称: {alias} -> {character}"
 
     def remove_operator_alias(self, alias: str) -> Tuple[bool, str]:
@@ -218,8 +328,19 @@ class VoiceManager:
             else:
                 self._custom_operator_aliases[alias] = previous_custom
             return False, "别称保存失败，请检查数据目录权限"
+        self._refresh_alias_indexes()
+        self._notify_aliases_changed()
         return True, message
 
+    def _notify_aliases_changed(self) -> None:
+        if self.on_aliases_changed is None:
+            return
+
+        try:
+            self.on_aliases_changed()
+        except Exception as exc:
+            logger.warning(f"别称变更回调失败: {exc}")
+
     def _load_skin_metadata(self) -> None:
         index_path = self.data_dir / "voice_index.json"
 
@@ -256,6 +377,8 @@ class VoiceManager:
                     )
                 }
 
+            self._load_directory_scans(payload.get("directories", {}))
+
             raw_metadata = payload.get("skin_metadata", {})
 
             if not isinstance(raw_metadata, dict):
@@ -303,6 +426,35 @@ class VoiceManager:
         except (OSError, ValueError, TypeError) as exc:
             logger.warning(f"加载语音索引失败，将从本地目录重建: {exc}")
 
+    def _load_directory_scans(self, raw_directories: Any) -> None:
+        """读取上次扫描保存的语言目录签名，格式不符的条目直接丢弃。"""
+        if not isinstance(raw_directories, dict):
+            return
+
+        allowed = set(self.VOICE_DESCRIPTIONS)
+
+        for key, entry in raw_directories.items():
+            if not isinstance(key, str) or not isinstance(entry, dict):
+                continue
+
+            signature = entry.get("signature")
+            voices = entry.get("voices")
+
+            if (
+                not isinstance(signature, list)
+                or len(signature) != 2
+                or not all(isinstance(item, int) for item in signature)
+                or not isinstance(voices, list)
+            ):
+                continue
+
+            self._directory_scans[key] = {
+                "signature": signature,
+                "voices": self._sort_voice_names(
+                    [voice for voice in voices if voice in allowed]
+                ),
+            }
+
     @classmethod
     def _is_safe_component(
         cls,
@@ -401,9 +553,60 @@ class VoiceManager:
 
         return None
 
+    @staticmethod
+    def _directory_signature(directory: Path) -> Optional[Tuple[int, int]]:
+        """返回目录的 (st_mtime_ns, st_ino)，目录增删或改名文件时都会变化。"""
+        try:
+            stat = directory.stat()
+        except OSError:
+            return None
+
+        if not S_ISDIR(stat.st_mode):
+            return None
+
+        return stat.st_mtime_ns, stat.st_ino
+
+    def _directory_scan_key(self, directory: Path) -> Optional[str]:
+        try:
+            return directory.relative_to(self.voices_dir).as_posix()
+        except ValueError:
+            return None
+
     def _scan_language_dir(
         self,
         directory: Path,
+    ) -> List[str]:
+        signature = self._directory_signature(directory)
+
+        if signature is None:
+            return []
+
+        key = self._directory_scan_key(directory)
+        cached = self._directory_scans.get(key) if key else None
+
+        if key:
+            self._scanned_directories.add(key)
+
+        if cached is not None and tuple(cached["signature"]) == signature:
+            return list(cached["voices"])
+
+        voices = self._scan_language_dir_files(directory)
+
+        if key:
+            # 刚修改过的目录可能在同一时间戳内再次变化，暂不缓存，下次扫描重新确认。
+            if signature[0] < time.time_ns() - self.SCAN_MTIME_GRACE_NS:
+                self._directory_scans[key] = {
+                    "signature": list(signature),
+                    "voices": voices,
+                }
+            else:
+                self._directory_scans.pop(key, None)
+
+        return voices
+
+    def _scan_language_dir_files(
+        self,
+        directory: Path,
     ) -> List[str]:
         if not directory.is_dir() or not self._path_is_within(
             directory,
@@ -440,18 +643,222 @@ class VoiceManager:
             key=lambda name: order[name],
         )
 
-    @classmethod
-    def _is_valid_wav_file(cls, path: Path) -> bool:
-        """以最小 RIFF/WAVE 头校验兼容现有合法 WAV。"""
+    def _load_wav_validation_cache(self) -> None:
+        if not self.wav_cache_file.is_file():
+            return
+
         try:
-            if not path.is_file() or path.stat().st_size < 12:
-                return False
+            with self.wav_cache_file.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+
+            entries = payload.get("entries", {}) if isinstance(payload, dict) else {}
+
+            if not isinstance(entries, dict):
+                return
+
+            for key, entry in entries.items():
+                if (
+                    isinstance(key, str)
+                    and isinstance(entry, list)
+                    and len(entry) == 3
+                    and isinstance(entry[0], int)
+                    and isinstance(entry[1], int)
+                    and isinstance(entry[2], bool)
+                ):
+                    self._wav_validation_cache[key] = (entry[0], entry[1], entry[2])
+
+            while len(self._wav_validation_cache) > constants.MAX_WAV_CACHE_ITEMS:
+                self._wav_validation_cache.popitem(last=False)
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning(f"读取 WAV 校验缓存失败，将重新校验: {exc}")
+
+    def save_wav_validation_cache(self) -> None:
+        """有新的校验结果时原子保存缓存，供重启后复用。"""
+        with self._wav_cache_lock:
+            if not self._wav_cache_dirty:
+                return
+
+            entries = {
+                key: list(entry) for key, entry in self._wav_validation_cache.items()
+            }
+            self._wav_cache_dirty = False
+
+        try:
+            self._atomic_write_json(
+                self.wav_cache_file,
+                {"version": 1, "entries": entries},
+            )
+        except OSError as exc:
+            logger.warning(f"保存 WAV 校验缓存失败: {exc}")
+
+    def _load_voice_key_cache(self) -> None:
+        if not self.voice_key_cache_file.is_file():
+            return
+
+        try:
+            with self.voice_key_cache_file.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+
+            entries = payload.get("entries", {}) if isinstance(payload, dict) else {}
+
+            if not isinstance(entries, dict):
+                return
+
+            for character, entry in entries.items():
+                if not isinstance(entry, dict):
+                    continue
+
+                voice_map = entry.get("map")
+                fetched_at = entry.get("fetched_at")
+
+                if (
+                    not isinstance(character, str)
+                    or not isinstance(voice_map, dict)
+                    or not voice_map
+                    or not all(
+                        isinstance(key, str) and isinstance(value, str)
+                        for key, value in voice_map.items()
+                    )
+                    or not isinstance(fetched_at, (int, float))
+                ):
+                    continue
+
+                etag = entry.get("etag")
+                last_modified = entry.get("last_modified")
+                self._voice_key_cache[character] = {
+                    "map": dict(voice_map),
+                    "etag": etag if isinstance(etag, str) else None,
+                    "last_modified": (
+                        last_modified if isinstance(last_modified, str) else None
+                    ),
+                    "fetched_at": float(fetched_at),
+                }
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning(f"读取语音 key 缓存失败，将重新获取: {exc}")
+
+        while len(self._voice_key_cache) > self.MAX_VOICE_KEY_CACHE_ENTRIES:
+            self._voice_key_cache.pop(next(iter(self._voice_key_cache)))
+
+    def _store_voice_key_cache(
+        self,
+        character: str,
+        voice_map: Dict[str, str],
+        *,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        """
+        记录语音 key 映射并安排合并写入。
+
+        304 且验证器未变时只刷新内存中的获取时间，不写盘；重启后最多多发
+        一次条件请求。
+        """
+        previous = self._voice_key_cache.pop(character, None)
+        self._voice_key_cache[character] = {
+            "map": dict(voice_map),
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        }
+
+        while len(self._voice_key_cache) > self.MAX_VOICE_KEY_CACHE_ENTRIES:
+            self._voice_key_cache.pop(next(iter(self._voice_key_cache)))
+            self._voice_key_cache_dirty = True
+
+        if character in self.catalog:
+            self.catalog.record_voice_map(character, voice_map)
+
+        if (
+            previous is None
+            or previous["map"] != voice_map
+            or previous.get("etag") != etag
+            or previous.get("last_modified") != last_modified
+        ):
+            self._voice_key_cache_dirty = True
+
+        if self._voice_key_cache_dirty and (
+            self._voice_key_flush_task is None or self._voice_key_flush_task.done()
+        ):
+            self._voice_key_flush_task = asyncio.create_task(
+                self._flush_voice_key_cache_later()
+            )
+
+    async def _flush_voice_key_cache_later(self) -> None:
+        await asyncio.sleep(self.VOICE_KEY_CACHE_FLUSH_DELAY)
+        await self._flush_voice_key_cache()
+
+    async def _flush_voice_key_cache(self) -> None:
+        if not self._voice_key_cache_dirty:
+            return
+
+        self._voice_key_cache_dirty = False
+        payload = {"version": 1, "entries": dict(self._voice_key_cache)}
+
+        try:
+            await asyncio.to_thread(
+                self._atomic_write_json,
+                self.voice_key_cache_file,
+                payload,
+            )
+        except OSError as exc:
+            logger.warning(f"保存语音 key 缓存失败: {exc}")
+
+    def _wav_cache_key(self, path: Path) -> Optional[str]:
+        try:
+            return path.relative_to(self.voices_dir).as_posix()
+        except ValueError:
+            # 上传、导入暂存等语音树外的临时文件不进入缓存。
+            return None
+
+    def _is_valid_wav_file(self, path: Path) -> bool:
+        """
+        以最小 RIFF/WAVE 头校验兼容现有合法 WAV。
+
+        语音树内的文件按 (大小, st_mtime_ns) 缓存结果，未变化的文件只需一次
+        stat，不再打开读取。
+        """
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
 
+        if not S_ISREG(stat.st_mode) or stat.st_size < 12:
+            return False
+
+        key = self._wav_cache_key(path)
+
+        if key is not None:
+            with self._wav_cache_lock:
+                cached = self._wav_validation_cache.get(key)
+
+                if cached is not None and cached[:2] == (
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                ):
+                    self._wav_validation_cache.move_to_end(key)
+                    return cached[2]
+
+        try:
             with path.open("rb") as handle:
-                return cls._looks_like_wav(handle.read(12))
+                valid = self._looks_like_wav(handle.read(12))
         except OSError:
             return False
 
+        if key is not None:
+            with self._wav_cache_lock:
+                self._wav_validation_cache[key] = (
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    valid,
+                )
+                self._wav_validation_cache.move_to_end(key)
+                self._wav_cache_dirty = True
+
+                if len(self._wav_validation_cache) > constants.MAX_WAV_CACHE_ITEMS:
+                    self._wav_validation_cache.popitem(last=False)
+
+        return valid
+
     @staticmethod
     def _is_valid_png_file(path: Path) -> bool:
         try:
@@ -497,6 +904,15 @@ class VoiceManager:
     def _quarantine_stale_wav(self, path: Path) -> Optional[Path]:
         return self._quarantine_wav(path, "stale-map", "旧编号错位")
 
+    def _index_tables(self) -> Dict[str, dict]:
+        """扫描写入的目标索引；按角色重扫时换成临时表，完成后一次性合并。"""
+        return {
+            "voice_index": self.voice_index,
+            "voice_files": self.voice_files,
+            "skins": self.skin_voice_index,
+            "paths": self._voice_paths,
+        }
+
     def _record_flat_character(
         self,
         character: str,
@@ -504,6 +920,7 @@ class VoiceManager:
             str,
             List[str],
         ],
+        tables: Optional[Dict[str, dict]] = None,
     ) -> None:
         languages = {
             language: voices for language, voices in languages.items() if voices
@@ -512,8 +929,9 @@ class VoiceManager:
         if not languages:
             return
 
-        self.voice_files[character] = languages
-        self.voice_index[character] = sorted(
+        tables = tables or self._index_tables()
+        tables["voice_files"][character] = languages
+        tables["voice_index"][character] = sorted(
             languages,
             key=lambda language: int(
                 self.LANGUAGE_MAP.get(
@@ -711,13 +1129,37 @@ class VoiceManager:
         return None, matches or options
 
     def scan_voice_files(self) -> None:
-        """扫描真实、非空且名称合法的 WAV。"""
-        self.voice_index.clear()
-        self.voice_files.clear()
-        self.skin_voice_index.clear()
+        """
+        同步全量扫描真实、非空且名称合法的 WAV。
+
+        只在构造时使用，此时还没有其他扫描；运行期间改用 rescan_all，与按
+        角色重扫共用 scan_lock。
+        """
+        self._apply_full_scan(self._stage_full_scan())
+
+    async def rescan_all(self) -> None:
+        """
+        全量重扫语音目录。
+
+        在线程中扫描到临时表，再在事件循环中一次性替换；持有 scan_lock，
+        不会与按角色重扫交错修改目录签名缓存或索引。
+        """
+        async with self.scan_lock:
+            staged = await asyncio.to_thread(self._stage_full_scan)
+            self._apply_full_scan(staged)
+
+    def _stage_full_scan(self) -> Optional[Dict[str, dict]]:
+        """
+        扫描全部角色目录，结果写入临时表，不修改对外可见的索引。
+
+        语言目录签名与上次扫描一致时直接复用保存的结果，只重新校验发生
+        变化的目录；无法列出语音目录时返回 None，保留现有索引。
+        """
+        tables = {"voice_index": {}, "voice_files": {}, "skins": {}, "paths": {}}
+        self._scanned_directories = set()
 
         if not self.voices_dir.is_dir():
-            return
+            return tables
 
         try:
             character_dirs = sorted(
@@ -726,167 +1168,422 @@ class VoiceManager:
             )
         except OSError as exc:
             logger.warning(f"扫描语音目录失败: {exc}")
-            return
+            return None
 
         for character_dir in character_dirs:
-            if not character_dir.is_dir() or not self._is_safe_component(
-                character_dir.name,
-                self.MAX_CHARACTER_LENGTH,
-            ):
-                continue
+            self._scan_character_dir(character_dir, tables)
 
-            character = character_dir.name
-            normal_languages = {}
+        return tables
 
-            for language in self.LANGUAGE_MAP:
-                voices = self._scan_language_dir(character_dir / language)
-                if voices:
-                    normal_languages[language] = voices
+    def _apply_full_scan(self, staged: Optional[Dict[str, dict]]) -> None:
+        """在事件循环中同步替换全部索引，中途不会让出执行权。"""
+        if staged is None:
+            return
 
-            self._record_flat_character(
-                character,
-                normal_languages,
-            )
+        for index, key in (
+            (self.voice_index, "voice_index"),
+            (self.voice_files, "voice_files"),
+            (self.skin_voice_index, "skins"),
+            (self._voice_paths, "paths"),
+        ):
+            index.clear()
+            index.update(staged[key])
 
-            skin_root = character_dir / "skin"
+        self._refresh_fuzzy_characters(
+            self._local_base_characters() | set(self._fuzzy_character_groups())
+        )
 
-            if not skin_root.is_dir():
-                continue
+        self._rebuild_pinyin_index()
 
-            packages: Dict[
-                str,
-                Dict[str, List[str]],
-            ] = {}
+        # 只保留本次仍然存在的目录，删除的角色或皮肤不会在索引中残留。
+        self._directory_scans = {
+            key: entry
+            for key, entry in self._directory_scans.items()
+            if key in self._scanned_directories
+        }
+        self._save_voice_index()
 
-            # 新目录：
-            # 角色/skin/实际目录名/语言/*.wav
-            # 角色/skin/语言/*.wav 属于待迁移旧结构，不再登记或播放。
-            try:
-                skin_dirs = sorted(
-                    skin_root.iterdir(),
-                    key=lambda path: path.name,
-                )
-            except OSError:
-                skin_dirs = []
+    async def rescan_characters(self, characters: Iterable[str]) -> None:
+        """
+        只重新扫描指定角色目录，并把结果合并进现有索引。
 
-            for skin_dir in skin_dirs:
-                if (
-                    not skin_dir.is_dir()
-                    or skin_dir.name in self.LANGUAGE_MAP
-                    or not self._is_safe_component(
-                        skin_dir.name,
-                        self.MAX_SKIN_ID_LENGTH,
-                    )
-                ):
-                    continue
+        供目录监听和下载完成后使用：文件新增、删除或改名时只更新受影响的
+        角色，其余角色的索引保持不变。目录在线程中扫描到临时表，再在事件
+        循环中一次性替换，读取方不会看到角色暂时消失的中间状态。
+        """
+        characters = {
+            character
+            for character in characters
+            if self._is_safe_component(character, self.MAX_CHARACTER_LENGTH)
+        }
 
-                languages = {}
+        if not characters:
+            return
 
-                for language in self.LANGUAGE_MAP:
-                    voices = self._scan_language_dir(skin_dir / language)
-                    if voices:
-                        languages[language] = voices
+        async with self.scan_lock:
+            staged = await asyncio.to_thread(self._stage_characters, characters)
+            self._apply_staged_characters(staged)
 
-                if languages:
-                    resource_id, _ = self._metadata_for_directory(
-                        character,
-                        skin_dir.name,
-                    )
-                    packages[resource_id] = languages
+    def _stage_characters(self, characters: Iterable[str]) -> Dict[str, Dict[str, dict]]:
+        """在线程中扫描角色目录，结果写入临时表，不修改对外可见的索引。"""
+        staged = {}
 
-            if not packages:
-                continue
+        for character in characters:
+            prefix = f"{character}/"
+            self._scanned_directories = {
+                key
+                for key in self._scanned_directories
+                if not key.startswith(prefix)
+            }
+            tables = {"voice_index": {}, "voice_files": {}, "skins": {}, "paths": {}}
+            self._scan_character_dir(self.voices_dir / character, tables)
+            staged[character] = tables
+            self._directory_scans = {
+                key: entry
+                for key, entry in self._directory_scans.items()
+                if not key.startswith(prefix) or key in self._scanned_directories
+            }
 
-            self.skin_voice_index[character] = packages
+        return staged
 
-            aggregate: Dict[
-                str,
-                List[str],
-            ] = {}
+    def _apply_staged_characters(self, staged: Dict[str, Dict[str, dict]]) -> None:
+        """在事件循环中同步替换角色的索引项，中途不会让出执行权。"""
+        for character, tables in staged.items():
+            self._forget_character(character)
+            self.voice_index.update(tables["voice_index"])
+            self.voice_files.update(tables["voice_files"])
+            self.skin_voice_index.update(tables["skins"])
+            self._voice_paths.update(tables["paths"])
 
-            for resource_id, languages in packages.items():
-                playable_languages = self._skin_playable_languages(
-                    normal_languages,
-                    languages,
-                )
+        self._refresh_fuzzy_characters(staged)
 
-                for language, voices in playable_languages.items():
-                    aggregate.setdefault(
-                        language,
-                        [],
-                    ).extend(voices)
+        # 与全量扫描保持相同的角色顺序，列表与随机选择不会因增量更新而变化。
+        for index in (self.voice_index, self.voice_files, self.skin_voice_index):
+            ordered = sorted(
+                index.items(),
+                key=lambda item: self._base_character(item[0]) or item[0],
+            )
+            index.clear()
+            index.update(ordered)
 
-                reference = self._skin_reference(
-                    character,
-                    resource_id,
-                )
+        self._rebuild_pinyin_index()
+        self._save_voice_index()
 
-                if reference:
-                    self._record_flat_character(
-                        reference,
-                        playable_languages,
-                    )
+    def _fuzzy_character_groups(self) -> List[str]:
+        return [
+            group[len("character:") :]
+            for group in self._fuzzy_index.groups()
+            if group.startswith("character:")
+        ]
 
-            for language, voices in aggregate.items():
-                aggregate[language] = self._sort_voice_names(voices)
+    def _refresh_fuzzy_characters(self, characters: Iterable[str]) -> None:
+        """按当前索引重建若干角色的模糊匹配词；引用按基础角色只分组一次。"""
+        references: Dict[str, List[str]] = {}
 
-            self._record_flat_character(
-                f"{character}皮肤",
-                aggregate,
+        for reference in self.voice_index:
+            references.setdefault(self._base_character(reference), []).append(
+                reference
             )
 
-        if self._voice_resource_map_version < self.VOICE_RESOURCE_MAP_VERSION:
-            if not self._voice_remap_pending:
-                remap_targets = set()
-                for character, languages in self.voice_files.items():
-                    remap_targets.update(
-                        (character, language) for language in languages
-                    )
+        for character in characters:
+            self._refresh_fuzzy_character(character, references.get(character, []))
 
-                for character, packages in self.skin_voice_index.items():
-                    for languages in packages.values():
-                        remap_targets.update(
-                            (character, language) for language in languages
-                        )
+    def _refresh_fuzzy_character(self, character: str, references: List[str]) -> None:
+        """重建某角色的模糊匹配词：基础名、皮肤引用及皮肤展示名。"""
+        terms = [(reference, reference) for reference in references]
 
-                self._voice_remap_pending = remap_targets
+        for resource_id in self.skin_voice_index.get(character, {}):
+            reference = self._skin_reference(character, resource_id)
 
-        payload = {
-            "version": constants.VOICE_INDEX_VERSION,
-            "voice_resource_map_version": (
-                self._voice_resource_map_version
-                if self._voice_remap_pending
-                else self.VOICE_RESOURCE_MAP_VERSION
-            ),
-            "voice_remap_pending": sorted(self._voice_remap_pending),
-            "voice_index": self.voice_index,
-            "voice_files": self.voice_files,
-            "skins": self.skin_voice_index,
-            "skin_metadata": self.skin_metadata,
-        }
+            if reference not in self.voice_index:
+                continue
 
-        try:
-            self._atomic_write_json(
-                self.data_dir / "voice_index.json",
-                payload,
+            name = self.skin_metadata.get(character, {}).get(resource_id, {}).get(
+                "name"
             )
-        except OSError as exc:
-            logger.warning(f"保存语音索引失败: {exc}")
+            if name:
+                terms.append((str(name), reference))
 
-    def _sort_voice_names(
-        self,
-        voices: List[str],
-    ) -> List[str]:
-        order = {name: index for index, name in enumerate(self.VOICE_DESCRIPTIONS)}
+        self._fuzzy_index.replace_group(f"character:{character}", terms)
 
-        return sorted(
-            {voice for voice in voices if voice in order},
-            key=lambda voice: order[voice],
+    def _refresh_alias_indexes(self) -> None:
+        self._fuzzy_index.replace_group(
+            "aliases",
+            self.operator_aliases.items(),
         )
+        self._rebuild_pinyin_index()
 
-    @staticmethod
-    def _atomic_write_json(
-        path: Path,
+    def _rebuild_pinyin_index(self) -> None:
+        """按本地角色名、干员别称与干员目录重建拼音索引；未下载的干员同样可以解析。"""
+        terms = [(character, character) for character in self._local_base_characters()]
+
+        for alias, target in self.operator_aliases.items():
+            terms.append((alias, target))
+            terms.append((target, target))
+
+        terms.extend((name, name) for name in self.catalog.operators)
+        self._pinyin_index.rebuild(terms)
+
+    def _local_base_characters(self) -> set[str]:
+        return set(self.skin_voice_index) | {
+            self._base_character(reference) for reference in self.voice_index
+        }
+
+    def resolve_romanized_name(self, value: str) -> Optional[str]:
+        """把全拼、首字母或唯一的首字母前缀（如 amiya、nts、yfl）解析为干员名，有歧义时返回 None。"""
+        matches = self._pinyin_index.lookup(value)
+        return matches[0] if len(matches) == 1 else None
+
+    def fuzzy_match(
+        self,
+        character: str,
+        *,
+        limit: int = 1,
+        cutoff: float = constants.FUZZY_MATCH_THRESHOLD,
+    ) -> List[FuzzyCandidate]:
+        """
+        在本地可播放的角色中模糊匹配名称。
+
+        返回 (规范引用, 命中的匹配词, 相似度) 列表，按相似度降序；
+        别称指向尚未下载的角色时不会作为候选。
+        """
+        return self._fuzzy_index.search(
+            character,
+            limit=limit,
+            cutoff=cutoff,
+            accept=self.voice_index.__contains__,
+        )
+
+    def _forget_character(self, character: str) -> None:
+        """从内存索引中移除某角色及其皮肤引用。"""
+        self.skin_voice_index.pop(character, None)
+
+        for reference in list(self.voice_index):
+            if self._base_character(reference) == character:
+                self.voice_index.pop(reference, None)
+                self.voice_files.pop(reference, None)
+                self._voice_paths.pop(reference, None)
+
+    def _scan_character_dir(
+        self,
+        character_dir: Path,
+        tables: Optional[Dict[str, dict]] = None,
+    ) -> None:
+        tables = tables or self._index_tables()
+
+        if not character_dir.is_dir() or not self._is_safe_component(
+            character_dir.name,
+            self.MAX_CHARACTER_LENGTH,
+        ):
+            return
+
+        character = character_dir.name
+        normal_languages = {}
+
+        for language in self.LANGUAGE_MAP:
+            voices = self._scan_language_dir(character_dir / language)
+            if voices:
+                normal_languages[language] = voices
+
+        self._record_flat_character(
+            character,
+            normal_languages,
+            tables,
+        )
+        base_paths = {
+            (language, voice): character_dir / language / f"{voice}.wav"
+            for language, voices in normal_languages.items()
+            for voice in voices
+        }
+
+        if base_paths:
+            tables["paths"][character] = base_paths
+
+        skin_root = character_dir / "skin"
+
+        if not skin_root.is_dir():
+            return
+
+        packages: Dict[
+            str,
+            Dict[str, List[str]],
+        ] = {}
+        package_dirs: Dict[str, Path] = {}
+
+        # 新目录：
+        # 角色/skin/实际目录名/语言/*.wav
+        # 角色/skin/语言/*.wav 属于待迁移旧结构，不再登记或播放。
+        try:
+            skin_dirs = sorted(
+                skin_root.iterdir(),
+                key=lambda path: path.name,
+            )
+        except OSError:
+            skin_dirs = []
+
+        for skin_dir in skin_dirs:
+            if (
+                not skin_dir.is_dir()
+                or skin_dir.name in self.LANGUAGE_MAP
+                or not self._is_safe_component(
+                    skin_dir.name,
+                    self.MAX_SKIN_ID_LENGTH,
+                )
+            ):
+                continue
+
+            languages = {}
+
+            for language in self.LANGUAGE_MAP:
+                voices = self._scan_language_dir(skin_dir / language)
+                if voices:
+                    languages[language] = voices
+
+            if languages:
+                resource_id, _ = self._metadata_for_directory(
+                    character,
+                    skin_dir.name,
+                )
+                packages[resource_id] = languages
+                package_dirs[resource_id] = skin_dir
+
+        if not packages:
+            return
+
+        tables["skins"][character] = packages
+
+        aggregate: Dict[
+            str,
+            List[str],
+        ] = {}
+
+        for resource_id, languages in packages.items():
+            playable_languages = self._skin_playable_languages(
+                normal_languages,
+                languages,
+            )
+
+            for language, voices in playable_languages.items():
+                aggregate.setdefault(
+                    language,
+                    [],
+                ).extend(voices)
+
+            reference = self._skin_reference(
+                character,
+                resource_id,
+            )
+
+            if reference:
+                self._record_flat_character(
+                    reference,
+                    playable_languages,
+                    tables,
+                )
+                tables["paths"][reference] = {
+                    (language, voice): (
+                        package_dirs[resource_id] / language / f"{voice}.wav"
+                        if voice in languages.get(language, [])
+                        else base_paths[(language, voice)]
+                    )
+                    for language, voices in playable_languages.items()
+                    for voice in voices
+                }
+
+        for language, voices in aggregate.items():
+            aggregate[language] = self._sort_voice_names(voices)
+
+        self._record_flat_character(
+            f"{character}皮肤",
+            aggregate,
+            tables,
+        )
+
+    @contextmanager
+    def deferred_index_writes(self):
+        """
+        批量任务期间合并语音索引写入。
+
+        上下文内每 VOICE_INDEX_FLUSH_INTERVAL 秒最多落盘一次，内存中的索引
+        始终是最新的；退出时补写最后一次。
+        """
+        self._index_write_deferrals += 1
+
+        try:
+            yield
+        finally:
+            self._index_write_deferrals -= 1
+
+            if not self._index_write_deferrals and self._index_dirty:
+                self._save_voice_index()
+
+    def _save_voice_index(self) -> None:
+        if (
+            self._index_write_deferrals
+            and time.monotonic() - self._index_saved_at
+            < self.VOICE_INDEX_FLUSH_INTERVAL
+        ):
+            self._index_dirty = True
+            return
+
+        self._index_dirty = False
+        self._index_saved_at = time.monotonic()
+
+        if self._voice_resource_map_version < self.VOICE_RESOURCE_MAP_VERSION:
+            if not self._voice_remap_pending:
+                remap_targets = set()
+                for character, languages in self.voice_files.items():
+                    remap_targets.update(
+                        (character, language) for language in languages
+                    )
+
+                for character, packages in self.skin_voice_index.items():
+                    for languages in packages.values():
+                        remap_targets.update(
+                            (character, language) for language in languages
+                        )
+
+                self._voice_remap_pending = remap_targets
+
+        payload = {
+            "version": constants.VOICE_INDEX_VERSION,
+            "voice_resource_map_version": (
+                self._voice_resource_map_version
+                if self._voice_remap_pending
+                else self.VOICE_RESOURCE_MAP_VERSION
+            ),
+            "voice_remap_pending": sorted(self._voice_remap_pending),
+            "voice_index": self.voice_index,
+            "voice_files": self.voice_files,
+            "skins": self.skin_voice_index,
+            "skin_metadata": self.skin_metadata,
+            "directories": self._directory_scans,
+        }
+
+        try:
+            self._atomic_write_json(
+                self.data_dir / "voice_index.json",
+                payload,
+            )
+        except OSError as exc:
+            logger.warning(f"保存语音索引失败: {exc}")
+
+        self.save_wav_validation_cache()
+
+    def _sort_voice_names(
+        self,
+        voices: List[str],
+    ) -> List[str]:
+        order = {name: index for index, name in enumerate(self.VOICE_DESCRIPTIONS)}
+
+        return sorted(
+            {voice for voice in voices if voice in order},
+            key=lambda voice: order[voice],
+        )
+
+    @staticmethod
+    def _atomic_write_json(
+        path: Path,
         payload: Any,
     ) -> None:
         path.parent.mkdir(
@@ -974,7 +1671,68 @@ class VoiceManager:
         voice_name: str,
         language: str,
     ) -> Optional[Path]:
-        """安全解析语音路径。"""
+        """
+        安全解析语音路径。
+
+        优先查扫描时生成的路径表；别称或皮肤简写先在内存中规范化后再查表，
+        表中没有或文件已被删除的条目回退到逐个检查文件。
+        """
+        if not isinstance(language, str):
+            return None
+
+        language = language.lower()
+        key = (language, voice_name)
+        path = self._cached_voice_path(character, key)
+
+        if path is not None:
+            return path
+
+        parsed = self._parse_character_reference(character)
+
+        if parsed:
+            base_character = self.resolve_operator_alias(parsed[0])
+            reference = base_character
+
+            if parsed[1]:
+                reference, _ = self.resolve_character_reference(character)
+
+            if reference:
+                path = self._cached_voice_path(reference, key)
+
+                if path is not None:
+                    return path
+
+        return self._resolve_voice_path(character, voice_name, language)
+
+    def _cached_voice_path(
+        self,
+        reference: str,
+        key: Tuple[str, str],
+    ) -> Optional[Path]:
+        """查路径表并确认文件仍存在；扫描后被删除的文件从表中移除。"""
+        paths = self._voice_paths.get(reference)
+
+        if not paths:
+            return None
+
+        path = paths.get(key)
+
+        if path is None:
+            return None
+
+        if path.is_file():
+            return path
+
+        paths.pop(key, None)
+        return None
+
+    def _resolve_voice_path(
+        self,
+        character: str,
+        voice_name: str,
+        language: str,
+    ) -> Optional[Path]:
+        """逐个检查候选文件，用于扫描后新出现、尚未进入路径表的语音。"""
         parsed = self._parse_character_reference(character)
 
         if not parsed or voice_name not in self.VOICE_DESCRIPTIONS:
@@ -1301,6 +2059,140 @@ class VoiceManager:
         download_langs: str,
         *,
         require_no_failures: bool = False,
+        group_commit: bool = False,
+        reuse_recent: bool = True,
+    ) -> Tuple[bool, str]:
+        """
+        下载角色语音与头像。
+
+        参数相同的并发请求合并为一次下载，所有调用方拿到同一个结果；
+        reuse_recent 为 True 时，RECENT_FETCH_TTL 内已成功下载过（参数相同
+        或覆盖本次请求）的角色直接返回上次结果；为 False 时（手动下载、Page
+        重新下载）还会跳过语音 key 缓存的有效期，始终向 PRTS 发送条件请求，
+        并且不合并到未做该验证的进行中下载。group_commit 为 True 时，
+        新语音先全部写入临时文件，统一落盘后再依次改名，供批量下载减少
+        fsync 次数。
+        """
+        parsed = self._parse_character_reference(character)
+
+        if not parsed:
+            return False, "角色名称不合法"
+
+        valid_ranks = {item["rank"] for item in self.LANGUAGE_MAP.values()}
+        selected_ranks = {rank for rank in str(download_langs) if rank in valid_ranks}
+        key = (
+            self.resolve_operator_alias(parsed[0]),
+            bool(auto_download_skin),
+            "".join(sorted(selected_ranks)),
+            bool(require_no_failures),
+        )
+
+        if not key[2]:
+            return (
+                False,
+                "没有选择任何有效语言",
+            )
+
+        if reuse_recent:
+            recent = self._recent_fetch_result(key)
+
+            if recent is not None:
+                return recent
+
+        flight = self._inflight_fetches.get(key)
+        revalidate = not reuse_recent
+
+        if flight is None or (revalidate and not flight["revalidate"]):
+            task = asyncio.ensure_future(
+                self._fetch_character_voices(
+                    key[0],
+                    key[1],
+                    key[2],
+                    require_no_failures=key[3],
+                    group_commit=group_commit,
+                    revalidate=revalidate,
+                )
+            )
+            flight = {"task": task, "waiters": 0, "revalidate": revalidate}
+            self._inflight_fetches[key] = flight
+            task.add_done_callback(lambda done: self._finish_fetch(key, done))
+
+        flight["waiters"] += 1
+
+        try:
+            # 单个调用方被取消不影响其他等待者；最后一个等待者取消时才停止下载。
+            return await asyncio.shield(flight["task"])
+        except asyncio.CancelledError:
+            if flight["waiters"] == 1:
+                flight["task"].cancel()
+            raise
+        finally:
+            flight["waiters"] -= 1
+
+    def _finish_fetch(
+        self,
+        key: Tuple[str, bool, str, bool],
+        task: asyncio.Future,
+    ) -> None:
+        flight = self._inflight_fetches.get(key)
+
+        if flight is not None and flight["task"] is task:
+            del self._inflight_fetches[key]
+
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        result = task.result()
+
+        if result[0]:
+            self._recent_fetches[key] = (time.monotonic(), result)
+            self._recent_fetches.move_to_end(key)
+
+            while len(self._recent_fetches) > constants.MAX_RECENT_FETCHES:
+                self._recent_fetches.popitem(last=False)
+
+    def _recent_fetch_result(
+        self,
+        key: Tuple[str, bool, str, bool],
+    ) -> Optional[Tuple[bool, str]]:
+        """
+        查找覆盖本次请求的最近下载结果。
+
+        已含皮肤、语言为超集且失败要求不更宽松的结果都可复用；角色的本地
+        语音已被删除时视为失效。
+        """
+        character, include_skin, ranks, require_no_failures = key
+        now = time.monotonic()
+
+        if character not in self.voice_files:
+            return None
+
+        for (
+            (cached_character, cached_skin, cached_ranks, cached_strict),
+            (finished_at, result),
+        ) in reversed(self._recent_fetches.items()):
+            if now - finished_at >= self.RECENT_FETCH_TTL:
+                continue
+
+            if (
+                cached_character == character
+                and (cached_skin or not include_skin)
+                and set(ranks) <= set(cached_ranks)
+                and (cached_strict or not require_no_failures)
+            ):
+                return result
+
+        return None
+
+    async def _fetch_character_voices(
+        self,
+        character: str,
+        auto_download_skin: bool,
+        download_langs: str,
+        *,
+        require_no_failures: bool = False,
+        group_commit: bool = False,
+        revalidate: bool = False,
     ) -> Tuple[bool, str]:
         parsed = self._parse_character_reference(character)
 
@@ -1328,153 +2220,170 @@ class VoiceManager:
             remap_failed_languages = set()
             remap_skipped_languages = set()
             remap_seen_languages = set()
-
-            timeout = aiohttp.ClientTimeout(
-                total=30,
-                connect=10,
-            )
+            commit_batch = GroupCommit() if group_commit else None
 
             try:
-                async with aiohttp.ClientSession(
-                    headers=self.DEFAULT_HEADERS,
-                    timeout=timeout,
-                ) as session:
-                    character_map = await self._get_character_id_map(
-                        base_character,
-                        session=session,
-                    )
+                session = self._get_session()
 
-                    if not character_map:
-                        return (
-                            False,
-                            (f"PRTS 返回了角色 {base_character} 的空语音记录"),
-                        )
+                character_map = await self._get_character_id_map(
+                    base_character,
+                    session=session,
+                    revalidate=revalidate,
+                )
 
-                    base_url = constants.PRTS_AUDIO_BASE_URL
+                if not character_map:
+                    return (
+                        False,
+                        (f"PRTS 返回了角色 {base_character} 的空语音记录"),
+                    )
 
-                    for (
-                        language_label,
-                        voice_key,
-                    ) in character_map.items():
-                        if language_label == "语音key":
-                            continue
+                base_url = constants.PRTS_AUDIO_BASE_URL
+                # (语言, 展示名, 语音名, URL, 皮肤目录, 是否强制重下)
+                jobs: List[
+                    Tuple[str, str, str, str, Optional[str], bool]
+                ] = []
+
+                for (
+                    language_label,
+                    voice_key,
+                ) in character_map.items():
+                    if language_label == "语音key":
+                        continue
 
-                        language = self._language_from_label(language_label)
+                    language = self._language_from_label(language_label)
 
-                        if self.LANGUAGE_MAP[language]["rank"] not in selected_ranks:
-                            continue
+                    if self.LANGUAGE_MAP[language]["rank"] not in selected_ranks:
+                        continue
 
-                        is_skin = self._is_skin_label(language_label)
+                    is_skin = self._is_skin_label(language_label)
 
-                        if is_skin and not auto_download_skin:
-                            if (base_character, language) in self._voice_remap_pending:
-                                remap_skipped_languages.add(language)
-                            continue
+                    if is_skin and not auto_download_skin:
+                        if (base_character, language) in self._voice_remap_pending:
+                            remap_skipped_languages.add(language)
+                        continue
 
-                        remap_seen_languages.add(language)
-                        force_redownload = (
+                    remap_seen_languages.add(language)
+                    force_redownload = (
+                        base_character,
+                        language,
+                    ) in self._voice_remap_pending
+
+                    skin_resource_id = None
+                    skin_name = None
+                    skin_directory = None
+
+                    if is_skin:
+                        (
+                            skin_resource_id,
+                            skin_name,
+                            skin_directory,
+                        ) = self._register_skin_metadata(
                             base_character,
+                            language_label,
+                            str(voice_key),
                             language,
-                        ) in self._voice_remap_pending
+                        )
+
+                    encoded_key = quote(
+                        str(voice_key).strip().strip("/"),
+                        safe="/",
+                    )
+
+                    if not encoded_key:
+                        counts["failed"] += len(self.VOICE_DESCRIPTIONS)
+                        if force_redownload:
+                            remap_failed_languages.add(language)
+                        continue
+
+                    display_name = (
+                        (f"{base_character}皮肤[{skin_name}]")
+                        if skin_resource_id
+                        else base_character
+                    )
 
-                        skin_resource_id = None
-                        skin_name = None
-                        skin_directory = None
+                    logger.info(f"正在下载 {display_name} 的 {language} 语音...")
 
-                        if is_skin:
+                    for description, file_number in self.VOICE_RESOURCE_IDS.items():
+                        file_name = f"cn_{file_number:03d}.wav"
+                        jobs.append(
                             (
-                                skin_resource_id,
-                                skin_name,
-                                skin_directory,
-                            ) = self._register_skin_metadata(
-                                base_character,
-                                language_label,
-                                str(voice_key),
                                 language,
+                                display_name,
+                                description,
+                                f"{base_url}/{encoded_key}/{file_name}",
+                                skin_directory,
+                                force_redownload,
                             )
-
-                        encoded_key = quote(
-                            str(voice_key).strip().strip("/"),
-                            safe="/",
                         )
 
-                        if not encoded_key:
-                            counts["failed"] += len(self.VOICE_DESCRIPTIONS)
-                            if force_redownload:
-                                remap_failed_languages.add(language)
-                            continue
-
-                        display_name = (
-                            (f"{base_character}皮肤[{skin_name}]")
-                            if skin_resource_id
-                            else base_character
+                # 全部语言与皮肤的语音一次性展开，由主机信号量限制同时请求数。
+                results = await asyncio.gather(
+                    *(
+                        self._download_voice_with_retry(
+                            session,
+                            base_character,
+                            voice_url,
+                            language,
+                            description,
+                            skin_directory=skin_directory,
+                            force_redownload=force_redownload,
+                            commit_batch=commit_batch,
                         )
+                        for (
+                            language,
+                            _,
+                            description,
+                            voice_url,
+                            skin_directory,
+                            force_redownload,
+                        ) in jobs
+                    )
+                )
 
-                        logger.info(f"正在下载 {display_name} 的 {language} 语音...")
-
-                        for description, file_number in self.VOICE_RESOURCE_IDS.items():
-                            file_name = f"cn_{file_number:03d}.wav"
-                            voice_url = f"{base_url}/{encoded_key}/{file_name}"
-
-                            status = "failed"
-                            message = ""
-
-                            for attempt in range(self.DOWNLOAD_RETRIES):
-                                (
-                                    status,
-                                    message,
-                                ) = await self._download_single_voice(
-                                    session,
-                                    base_character,
-                                    voice_url,
-                                    language,
-                                    description,
-                                    skin_directory=skin_directory,
-                                    force_redownload=force_redownload,
-                                )
-
-                                if status != "failed":
-                                    break
-
-                                if attempt + 1 < self.DOWNLOAD_RETRIES:
-                                    await asyncio.sleep(0.4 * (2**attempt))
-
-                            counts[status] += 1
-
-                            if status == "failed":
-                                if force_redownload:
-                                    remap_failed_languages.add(language)
-                                logger.warning(
-                                    "下载失败 "
-                                    f"{display_name}/"
-                                    f"{language}/"
-                                    f"{description}: "
-                                    f"{message}"
-                                )
-
-                    for language in remap_seen_languages:
-                        if language not in remap_failed_languages and (
-                            language not in remap_skipped_languages
-                        ):
-                            self._voice_remap_pending.discard(
-                                (base_character, language)
-                            )
+                if commit_batch is not None:
+                    await asyncio.to_thread(commit_batch.commit)
+
+                for job, (status, message) in zip(jobs, results):
+                    language, display_name, description, _, _, force_redownload = job
+                    counts[status] += 1
+
+                    if status == "failed":
+                        if force_redownload:
+                            remap_failed_languages.add(language)
+                        logger.warning(
+                            "下载失败 "
+                            f"{display_name}/"
+                            f"{language}/"
+                            f"{description}: "
+                            f"{message}"
+                        )
 
-                    if not self._voice_remap_pending:
-                        self._voice_resource_map_version = (
-                            self.VOICE_RESOURCE_MAP_VERSION
+                for language in remap_seen_languages:
+                    if language not in remap_failed_languages and (
+                        language not in remap_skipped_languages
+                    ):
+                        self._voice_remap_pending.discard(
+                            (base_character, language)
                         )
 
-                    (
-                        image_ok,
-                        image_message,
-                    ) = await self.fetch_character_image(
-                        base_character,
-                        session=session,
+                if not self._voice_remap_pending:
+                    self._voice_resource_map_version = (
+                        self.VOICE_RESOURCE_MAP_VERSION
                     )
 
-                    if not image_ok:
-                        logger.debug(f"获取头像跳过 {base_character}: {image_message}")
+                (
+                    image_ok,
+                    image_message,
+                ) = await self.fetch_character_image(
+                    base_character,
+                    session=session,
+                )
+
+                if not image_ok:
+                    logger.debug(f"获取头像跳过 {base_character}: {image_message}")
+
+                # 只有该角色目录发生变化，无需全量扫描；批量下载时尤其明显。
+                await self.rescan_characters([base_character])
 
             except PRTSLookupError as exc:
                 logger.warning(f"获取 {base_character} 的 PRTS 记录失败: {exc}")
@@ -1491,22 +2400,135 @@ class VoiceManager:
             except Exception as exc:
                 logger.exception(f"下载语音或头像异常: {exc}")
                 return False, str(exc)
+            finally:
+                if commit_batch is not None:
+                    commit_batch.discard()
 
-            self.scan_voice_files()
+            self.catalog.save_if_dirty()
 
             success = (counts["downloaded"] > 0 or counts["existed"] > 0) and (
                 not require_no_failures or counts["failed"] == 0
             )
 
-            summary = (
-                "下载完成："
-                f"新增 {counts['downloaded']}，"
-                f"已存在 {counts['existed']}，"
-                f"不存在 {counts['not_found']}，"
-                f"失败 {counts['failed']}"
+            summary = (
+                "下载完成："
+                f"新增 {counts['downloaded']}，"
+                f"已存在 {counts['existed']}，"
+                f"不存在 {counts['not_found']}，"
+                f"失败 {counts['failed']}"
+            )
+
+            return success, summary
+
+    def _lazy_language(
+        self,
+        available: Iterable[str],
+        download_langs: str,
+        language_rank: str,
+    ) -> Optional[str]:
+        """在允许下载且 PRTS 提供的语言中，按播放优先级选出一种。"""
+        available = set(available)
+        allowed = set(str(download_langs))
+        by_rank = {info["rank"]: code for code, info in self.LANGUAGE_MAP.items()}
+
+        for rank in f"{language_rank}{''.join(sorted(allowed))}":
+            code = by_rank.get(rank)
+
+            if rank in allowed and code in available:
+                return code
+
+        return None
+
+    async def fetch_single_voice(
+        self,
+        character: str,
+        download_langs: str,
+        language_rank: str,
+        *,
+        language: Optional[str] = None,
+        voice: Optional[str] = None,
+    ) -> Tuple[bool, str, Optional[str], Optional[str]]:
+        """
+        只下载一条语音供立即播放，返回 (是否成功, 说明, 语言, 语音名)。
+
+        未指定语言时按播放优先级在允许下载的语言中选择；未指定语音时随机
+        挑选，PRTS 上不存在则换一条，最多尝试 LAZY_VOICE_ATTEMPTS 次。
+        皮肤语音与其余语音由调用方另行补齐。
+        """
+        parsed = self._parse_character_reference(character)
+
+        if not parsed or parsed[1]:
+            return False, "单条下载只支持基础角色", None, None
+
+        base_character = self.resolve_operator_alias(parsed[0])
+
+        if voice is not None and voice not in self.VOICE_RESOURCE_IDS:
+            return False, f"不支持的语音名称: {voice}", None, None
+
+        async with self._lock_for(base_character):
+            try:
+                character_map = await self._get_character_id_map(base_character)
+            except PRTSLookupError as exc:
+                return False, str(exc), None, None
+
+            if not character_map:
+                return (
+                    False,
+                    f"PRTS 返回了角色 {base_character} 的空语音记录",
+                    None,
+                    None,
+                )
+
+            voice_keys: Dict[str, str] = {}
+
+            for language_label, voice_key in character_map.items():
+                if language_label == "语音key" or self._is_skin_label(language_label):
+                    continue
+
+                voice_keys.setdefault(
+                    self._language_from_label(language_label),
+                    str(voice_key).strip().strip("/"),
+                )
+
+            if language is None:
+                language = self._lazy_language(
+                    voice_keys,
+                    download_langs,
+                    language_rank,
+                )
+
+            if not language or not voice_keys.get(language):
+                return False, "PRTS 上没有所选语言的语音", None, None
+
+            encoded_key = quote(voice_keys[language], safe="/")
+            candidates = (
+                [voice]
+                if voice is not None
+                else random.sample(
+                    list(self.VOICE_RESOURCE_IDS),
+                    min(constants.LAZY_VOICE_ATTEMPTS, len(self.VOICE_RESOURCE_IDS)),
+                )
             )
+            message = "没有可下载的语音"
+
+            for description in candidates:
+                file_name = f"cn_{self.VOICE_RESOURCE_IDS[description]:03d}.wav"
+                status, message = await self._download_voice_with_retry(
+                    self._get_session(),
+                    base_character,
+                    f"{constants.PRTS_AUDIO_BASE_URL}/{encoded_key}/{file_name}",
+                    language,
+                    description,
+                )
 
-            return success, summary
+                if status in {"downloaded", "existed"}:
+                    await self.rescan_characters([base_character])
+                    return True, message, language, description
+
+                if status != "not_found":
+                    break
+
+        return False, message, None, None
 
     async def migrate_legacy_skin_directories(
         self,
@@ -1577,7 +2599,7 @@ class VoiceManager:
                 logger.warning(f"{character} 旧版皮肤迁移暂缓，已保留原文件: {message}")
                 continue
 
-            self.scan_voice_files()
+            await self.rescan_all()
             packages = self.skin_voice_index.get(character, {})
             skin_root = self.voices_dir / character / "skin"
 
@@ -1639,7 +2661,7 @@ class VoiceManager:
                 except (OSError, RuntimeError, ValueError) as exc:
                     logger.warning(f"移除旧版皮肤目录失败 {legacy_dir}: {exc}")
 
-        self.scan_voice_files()
+        await self.rescan_all()
 
     async def refresh_local_skin_metadata(self) -> None:
         """
@@ -1648,7 +2670,7 @@ class VoiceManager:
         local_* ID 只用于离线过渡。这里仅请求角色语音页补齐映射，
         不重新下载音频；后续正常下载仍会复用合法 WAV，只补缺失或损坏项。
         """
-        self.scan_voice_files()
+        await self.rescan_all()
         pending = []
 
         for character, packages in self.skin_voice_index.items():
@@ -1658,47 +2680,40 @@ class VoiceManager:
         if not pending:
             return
 
-        timeout = aiohttp.ClientTimeout(
-            total=30,
-            connect=10,
-        )
+        session = self._get_session()
 
-        async with aiohttp.ClientSession(
-            headers=self.DEFAULT_HEADERS,
-            timeout=timeout,
-        ) as session:
-            for character in pending:
-                logger.info(f"正在为 {character} 的现有皮肤目录补齐 PRTS 稳定索引")
+        for character in pending:
+            logger.info(f"正在为 {character} 的现有皮肤目录补齐 PRTS 稳定索引")
 
-                try:
-                    character_map = await self._get_character_id_map(
-                        character,
-                        session=session,
-                    )
+            try:
+                character_map = await self._get_character_id_map(
+                    character,
+                    session=session,
+                )
 
-                    for language_label, voice_key in (character_map or {}).items():
-                        if language_label == "语音key" or not self._is_skin_label(
-                            language_label
-                        ):
-                            continue
+                for language_label, voice_key in (character_map or {}).items():
+                    if language_label == "语音key" or not self._is_skin_label(
+                        language_label
+                    ):
+                        continue
 
-                        language = self._language_from_label(language_label)
-                        self._register_skin_metadata(
-                            character,
-                            language_label,
-                            str(voice_key),
-                            language,
-                        )
-                except (
-                    PRTSLookupError,
-                    aiohttp.ClientError,
-                    asyncio.TimeoutError,
-                ) as exc:
-                    logger.warning(
-                        f"{character} 的皮肤稳定索引暂未补齐，将在下次启动重试: {exc}"
+                    language = self._language_from_label(language_label)
+                    self._register_skin_metadata(
+                        character,
+                        language_label,
+                        str(voice_key),
+                        language,
                     )
+            except (
+                PRTSLookupError,
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+            ) as exc:
+                logger.warning(
+                    f"{character} 的皮肤稳定索引暂未补齐，将在下次启动重试: {exc}"
+                )
 
-        self.scan_voice_files()
+        await self.rescan_all()
 
         for character in pending:
             if any(
@@ -1709,6 +2724,122 @@ class VoiceManager:
                     f"{character} 仍有无法与 PRTS 对应的本地皮肤目录，已保留离线索引"
                 )
 
+    def _get_session(self) -> aiohttp.ClientSession:
+        """返回共享会话，已关闭或尚未创建时重新创建。"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=constants.HTTP_POOL_LIMIT,
+                limit_per_host=max(
+                    constants.HTTP_POOL_LIMIT_PER_HOST,
+                    self._download_concurrency + 2,
+                ),
+                ttl_dns_cache=constants.HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=constants.HTTP_KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.DEFAULT_HEADERS,
+                timeout=aiohttp.ClientTimeout(
+                    total=30,
+                    connect=10,
+                ),
+            )
+
+        return self._session
+
+    async def close(self) -> None:
+        """停止目录后台补齐，写入语音 key 缓存，关闭共享 HTTP 会话与解析线程池，插件停用时调用。"""
+        await self.catalog.stop()
+
+        flush_task = self._voice_key_flush_task
+        self._voice_key_flush_task = None
+
+        if flush_task is not None and not flush_task.done():
+            flush_task.cancel()
+
+            try:
+                await flush_task
+            except asyncio.CancelledError:
+                pass
+
+        await self._flush_voice_key_cache()
+        session = self._session
+        self._session = None
+
+        if session is not None and not session.closed:
+            await session.close()
+
+        self._parse_pool.shutdown()
+        self.catalog.save_if_dirty()
+
+    def parse_pool_stats(self) -> Dict[str, Any]:
+        """解析线程池的排队深度与耗时统计。"""
+        return self._parse_pool.stats()
+
+    def rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """各 PRTS 主机的限流与熔断状态。"""
+        return self._rate_limiter.stats()
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """取得目标主机的并发下载信号量。"""
+        host = urlparse(url).hostname or ""
+        semaphore = self._host_semaphores.get(host)
+
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._download_concurrency)
+            self._host_semaphores[host] = semaphore
+
+        return semaphore
+
+    async def _download_voice_with_retry(
+        self,
+        session: aiohttp.ClientSession,
+        character: str,
+        url: str,
+        lang: str,
+        filename: str,
+        *,
+        skin_directory: Optional[str] = None,
+        force_redownload: bool = False,
+        commit_batch: Optional[GroupCommit] = None,
+    ) -> Tuple[str, str]:
+        """
+        在主机并发额度内下载单条语音，失败时指数退避重试，服务端给出
+        Retry-After 时按其等待。
+
+        退避等待期间释放额度，避免重试中的任务占住其他语音的下载位置。
+        中断时已写入的部分保留在 .part 文件中，下一次尝试用 Range 续传；
+        最后一次尝试失败后清理残留。
+        """
+        semaphore = self._host_semaphore(url)
+        status = "failed"
+        message = ""
+
+        for attempt in range(self.DOWNLOAD_RETRIES):
+            async with semaphore:
+                status, message = await self._download_single_voice(
+                    session,
+                    character,
+                    url,
+                    lang,
+                    filename,
+                    skin_directory=skin_directory,
+                    force_redownload=force_redownload,
+                    keep_partial=attempt + 1 < self.DOWNLOAD_RETRIES,
+                    commit_batch=commit_batch,
+                )
+
+            # 主机已熔断时重试没有意义，直接放弃剩余次数。
+            if status != "failed" or self._rate_limiter.is_open(url):
+                break
+
+            if attempt + 1 < self.DOWNLOAD_RETRIES:
+                await asyncio.sleep(
+                    self._rate_limiter.for_url(url).retry_delay(attempt)
+                )
+
+        return status, message
+
     async def _download_single_voice(
         self,
         session: aiohttp.ClientSession,
@@ -1719,9 +2850,15 @@ class VoiceManager:
         *,
         skin_directory: Optional[str] = None,
         force_redownload: bool = False,
+        keep_partial: bool = False,
+        commit_batch: Optional[GroupCommit] = None,
     ) -> Tuple[str, str]:
         """
         返回 downloaded/existed/not_found/failed。
+
+        响应按块直接写入 .part 文件，内存占用只与块大小有关；keep_partial 为
+        True 时，网络中断或可重试的 HTTP 状态留下的部分内容保留给下一次调用续传。传入
+        commit_batch 时不单独 fsync 和改名，交由调用方批量提交。
         """
         parsed = self._parse_character_reference(character)
 
@@ -1813,12 +2950,38 @@ class VoiceManager:
                 f"无法访问目标目录: {exc}",
             )
 
+        partial = path.with_name(f".{path.name}.part")
+        offset = self._resume_offset(partial)
+        headers = {}
+
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = self._partial_validators[str(partial)]
+
+        try:
+            limiter = await self._rate_limiter.acquire(url)
+        except CircuitOpenError as exc:
+            if not keep_partial:
+                self._discard_partial(partial)
+
+            return (
+                "failed",
+                str(exc),
+            )
+
+        completed = False
+
         try:
             async with session.get(
                 url,
+                headers=headers or None,
                 allow_redirects=True,
             ) as response:
+                limiter.observe(response.status, response.headers)
+
                 if response.status == 404:
+                    self._discard_partial(partial)
+
                     if (
                         force_redownload
                         and path.is_file()
@@ -1834,7 +2997,37 @@ class VoiceManager:
                         "文件不存在(404)",
                     )
 
-                if response.status != 200:
+                if response.status == 206 and offset:
+                    expected_total = self._content_range_total(
+                        response.headers.get("Content-Range"),
+                        offset,
+                    )
+
+                    if expected_total is False:
+                        self._discard_partial(partial)
+                        return (
+                            "failed",
+                            "续传响应的 Content-Range 不匹配",
+                        )
+                elif response.status == 200:
+                    # 服务器忽略了 Range 或资源已变化，丢弃旧内容从头写入。
+                    offset = 0
+                    expected_total = None
+                    validator = self._range_validator(response.headers)
+
+                    if validator:
+                        self._partial_validators[str(partial)] = validator
+                    else:
+                        self._partial_validators.pop(str(partial), None)
+                else:
+                    # 429 / 5xx 等临时错误时保留已下载部分及其校验值，重试仍可续传；
+                    # 其他状态或最后一次尝试才清理。
+                    if not (
+                        keep_partial
+                        and response.status in self.RETRYABLE_PAGE_STATUSES
+                    ):
+                        self._discard_partial(partial)
+
                     return (
                         "failed",
                         f"HTTP错误: {response.status}",
@@ -1842,60 +3035,78 @@ class VoiceManager:
 
                 content_length = response.headers.get("Content-Length")
 
-                if content_length:
+                if content_length and expected_total is None:
                     try:
-                        if int(content_length) > self.MAX_VOICE_BYTES:
-                            return (
-                                "failed",
-                                "音频文件过大",
-                            )
+                        expected_total = offset + int(content_length)
                     except ValueError:
                         pass
 
-                data = bytearray()
+                if expected_total and expected_total > self.MAX_VOICE_BYTES:
+                    self._discard_partial(partial)
+                    return (
+                        "failed",
+                        "音频文件过大",
+                    )
+
+                received = offset
+                # 从头下载时凑满前 12 字节就校验文件头，不是 WAV 立即停止接收。
+                header = bytearray() if offset == 0 else None
+                failure = None
 
-                async for chunk in response.content.iter_chunked(64 * 1024):
-                    data.extend(chunk)
+                with partial.open("ab" if offset else "wb") as handle:
+                    async for chunk in response.content.iter_chunked(
+                        self.DOWNLOAD_CHUNK_BYTES
+                    ):
+                        received += len(chunk)
 
-                    if len(data) > self.MAX_VOICE_BYTES:
-                        return (
-                            "failed",
-                            "音频文件过大",
-                        )
+                        if received > self.MAX_VOICE_BYTES:
+                            failure = "音频文件过大"
+                            break
+
+                        if header is not None:
+                            header.extend(chunk[: 12 - len(header)])
+
+                            if len(header) >= 12:
+                                if not self._looks_like_wav(header):
+                                    failure = "响应内容不是有效 WAV"
+                                    break
+
+                                header = None
+
+                        handle.write(chunk)
+                    else:
+                        completed = True
+
+                        if commit_batch is None:
+                            handle.flush()
+                            os.fsync(handle.fileno())
 
-                if not self._looks_like_wav(data):
+                if not completed:
+                    self._discard_partial(partial)
                     return (
                         "failed",
-                        "响应内容不是有效 WAV",
+                        failure,
                     )
 
-            fd, temp_name = tempfile.mkstemp(
-                prefix=f".{path.name}.",
-                suffix=".tmp",
-                dir=str(save_dir),
-            )
+            with partial.open("rb") as handle:
+                header = handle.read(12)
 
-            try:
-                with os.fdopen(
-                    fd,
-                    "wb",
-                ) as handle:
-                    handle.write(data)
-                    handle.flush()
-                    os.fsync(handle.fileno())
+            if not self._looks_like_wav(header):
+                self._discard_partial(partial)
+                return (
+                    "failed",
+                    "响应内容不是有效 WAV",
+                )
 
+            if commit_batch is not None:
+                commit_batch.add(partial, path)
+            else:
                 os.replace(
-                    temp_name,
+                    partial,
                     path,
                 )
-            except Exception:
-                try:
-                    os.close(fd)
-                except OSError:
-                    pass
 
-                Path(temp_name).unlink(missing_ok=True)
-                raise
+            self._partial_validators.pop(str(partial), None)
 
             return (
                 "downloaded",
@@ -1906,22 +3117,86 @@ class VoiceManager:
             aiohttp.ClientError,
             asyncio.TimeoutError,
         ) as exc:
+            limiter.observe_error()
+
+            if not keep_partial or str(partial) not in self._partial_validators:
+                self._discard_partial(partial)
+
             return (
                 "failed",
                 f"网络请求失败: {exc}",
             )
         except OSError as exc:
+            self._discard_partial(partial)
             return (
                 "failed",
                 f"写入文件失败: {exc}",
             )
         except Exception as exc:
+            self._discard_partial(partial)
             logger.warning(f"下载语音失败 {url}: {exc}")
             return (
                 "failed",
                 f"未知错误: {exc}",
             )
 
+    def _resume_offset(self, partial: Path) -> int:
+        """返回可续传的字节数；没有校验值的残留文件无法确认来源，直接删除。"""
+        if str(partial) not in self._partial_validators:
+            partial.unlink(missing_ok=True)
+            return 0
+
+        try:
+            size = partial.stat().st_size
+        except OSError:
+            self._partial_validators.pop(str(partial), None)
+            return 0
+
+        if size <= 0 or size > self.MAX_VOICE_BYTES:
+            self._discard_partial(partial)
+            return 0
+
+        return size
+
+    def _discard_partial(self, partial: Path) -> None:
+        self._partial_validators.pop(str(partial), None)
+
+        try:
+            partial.unlink(missing_ok=True)
+        except OSError as exc:
+            logger.debug(f"清理未完成的下载失败 {partial}: {exc}")
+
+    @staticmethod
+    def _range_validator(headers) -> Optional[str]:
+        """If-Range 只接受强 ETag，没有时退回 Last-Modified。"""
+        etag = headers.get("ETag")
+
+        if etag and not etag.startswith("W/"):
+            return etag
+
+        return headers.get("Last-Modified") or None
+
+    @staticmethod
+    def _content_range_total(
+        content_range: Optional[str],
+        offset: int,
+    ) -> Union[int, None, bool]:
+        """
+        解析 206 响应的 Content-Range。
+
+        起点与请求的续传位置一致时返回总长度（未知时为 None），否则返回 False。
+        """
+        match = re.fullmatch(
+            r"\s*bytes\s+(\d+)-(\d+)/(\d+|\*)\s*",
+            content_range or "",
+        )
+
+        if not match or int(match.group(1)) != offset:
+            return False
+
+        total = match.group(3)
+        return None if total == "*" else int(total)
+
     @staticmethod
     def _looks_like_wav(
         data: Union[bytes, bytearray],
@@ -1953,12 +3228,46 @@ class VoiceManager:
             for allowed in constants.PRTS_ALLOWED_HOSTS
         )
 
+    @staticmethod
+    def _parse_voice_key_map(html: str) -> Optional[Dict[str, str]]:
+        """从语音记录页提取 语言标签 -> voice key；页面中没有语音记录节点时返回 None。"""
+        voice_data = extract_voice_base(html)
+
+        if voice_data is None:
+            return None
+
+        result = {}
+
+        for item in voice_data.strip().split(","):
+            if ":" not in item:
+                continue
+
+            language, path = item.split(
+                ":",
+                1,
+            )
+
+            language = language.strip()
+            path = path.strip()
+
+            if language and path:
+                result[language] = path
+
+        return result
+
     async def _get_character_id_map(
         self,
         character: str,
         *,
         session: Optional[aiohttp.ClientSession] = None,
+        revalidate: bool = False,
     ) -> Optional[Dict[str, str]]:
+        """
+        获取角色语音记录页的 语言标签 -> voice key。
+
+        缓存在 VOICE_KEY_CACHE_TTL 内直接复用；revalidate 为真时跳过有效期，
+        带 ETag / Last-Modified 发送条件请求，页面未变化时仍只需一次 304。
+        """
         parsed = self._parse_character_reference(character)
 
         if not parsed:
@@ -1972,28 +3281,63 @@ class VoiceManager:
 
         url = constants.PRTS_VOICE_PAGE_URL.format(character=encoded_character)
 
-        owns_session = session is None
+        cached = self._voice_key_cache.get(base_character)
 
-        if owns_session:
-            session = aiohttp.ClientSession(
-                headers=self.DEFAULT_HEADERS,
-                timeout=aiohttp.ClientTimeout(
-                    total=15,
-                    connect=10,
-                ),
-            )
+        if (
+            cached
+            and not revalidate
+            and time.time() - cached["fetched_at"] < self.VOICE_KEY_CACHE_TTL
+        ):
+            return dict(cached["map"])
+
+        # 缓存过期或要求重新验证时带上验证器，页面未变化时 PRTS 返回 304，无需重新下载解析。
+        conditional_headers = {}
+
+        if cached and cached.get("etag"):
+            conditional_headers["If-None-Match"] = cached["etag"]
+
+        if cached and cached.get("last_modified"):
+            conditional_headers["If-Modified-Since"] = cached["last_modified"]
+
+        if session is None:
+            session = self._get_session()
 
         try:
-            assert session is not None
             html = None
+            etag = None
+            last_modified = None
 
             for attempt in range(self.CHARACTER_PAGE_RETRIES):
+                limiter = await self._rate_limiter.acquire(url)
+
                 try:
-                    async with session.get(url) as response:
+                    async with session.get(
+                        url,
+                        headers=conditional_headers or None,
+                        timeout=aiohttp.ClientTimeout(
+                            total=15,
+                            connect=10,
+                        ),
+                    ) as response:
                         status = response.status
+                        limiter.observe(status, response.headers)
+
+                        if status == 304 and cached:
+                            self._store_voice_key_cache(
+                                base_character,
+                                cached["map"],
+                                etag=response.headers.get("ETag") or cached.get("etag"),
+                                last_modified=(
+                                    response.headers.get("Last-Modified")
+                                    or cached.get("last_modified")
+                                ),
+                            )
+                            return dict(cached["map"])
 
                         if status == 200:
                             html = await response.text()
+                            etag = response.headers.get("ETag")
+                            last_modified = response.headers.get("Last-Modified")
                             break
 
                         if status == 404:
@@ -2020,103 +3364,90 @@ class VoiceManager:
                             )
 
                 except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                    limiter.observe_error()
+
                     if attempt + 1 >= self.CHARACTER_PAGE_RETRIES:
                         raise PRTSLookupError(f"访问 PRTS 时网络异常: {exc}") from exc
 
-                await asyncio.sleep(0.4 * (2**attempt))
+                await asyncio.sleep(limiter.retry_delay(attempt))
 
             if html is None:
                 raise PRTSLookupError("PRTS 页面请求未返回内容")
 
-            soup = BeautifulSoup(
-                html,
-                "html.parser",
-            )
-            voice_div = soup.find(
-                "div",
-                attrs={"data-voice-base": True},
-            )
+            result = await self._parse_pool.run(self._parse_voice_key_map, html)
 
-            if not voice_div:
+            if result is None:
                 raise PRTSLookupError("PRTS 页面结构可能已变化：未找到语音记录节点")
 
-            voice_data = voice_div.get("data-voice-base") or ""
-            voice_data = str(voice_data).strip()
-
-            result = {}
-
-            for item in voice_data.split(","):
-                if ":" not in item:
-                    continue
-
-                language, path = item.split(
-                    ":",
-                    1,
-                )
-
-                language = language.strip()
-                path = path.strip()
-
-                if language and path:
-                    result[language] = path
-
             if not result:
                 raise PRTSLookupError("PRTS 页面结构可能已变化：语音记录内容为空")
 
+            self._store_voice_key_cache(
+                base_character,
+                result,
+                etag=etag,
+                last_modified=last_modified,
+            )
             return result
 
         except PRTSLookupError:
             raise
+        except CircuitOpenError as exc:
+            raise PRTSLookupError(str(exc)) from exc
         except Exception as exc:
             logger.error(f"解析 PRTS 页面失败: {exc}")
             raise PRTSLookupError(f"解析 PRTS 页面失败: {exc}") from exc
-        finally:
-            if owns_session and session is not None:
-                await session.close()
+
+    def _characters_missing_avatar(self, characters: List[str]) -> set[str]:
+        return {
+            character
+            for character in characters
+            if not self._is_valid_png_file(self.assets_dir / f"{character}.png")
+        }
 
     async def ensure_assets(self) -> None:
         try:
-            missing = set()
+            characters = set()
 
-            for character in self.voice_index:
+            for character in list(self.voice_index):
                 parsed = self._parse_character_reference(character)
 
-                if not parsed:
-                    continue
-
-                base_character = self.resolve_operator_alias(parsed[0])
-                avatar_path = self.assets_dir / f"{base_character}.png"
+                if parsed:
+                    characters.add(self.resolve_operator_alias(parsed[0]))
 
-                if not self._is_valid_png_file(avatar_path):
-                    missing.add(base_character)
+            missing = await self._parse_pool.run(
+                self._characters_missing_avatar,
+                sorted(characters),
+            )
 
             if not missing:
                 return
 
-            timeout = aiohttp.ClientTimeout(
-                total=30,
-                connect=10,
-            )
+            session = self._get_session()
 
-            async with aiohttp.ClientSession(
-                headers=self.DEFAULT_HEADERS,
-                timeout=timeout,
-            ) as session:
-                for character in sorted(missing):
-                    (
-                        success,
-                        message,
-                    ) = await self.fetch_character_image(
-                        character,
-                        session=session,
-                    )
+            for character in sorted(missing):
+                (
+                    success,
+                    message,
+                ) = await self.fetch_character_image(
+                    character,
+                    session=session,
+                )
 
-                    if not success:
-                        logger.debug(f"获取头像跳过 {character}: {message}")
+                if not success:
+                    logger.debug(f"获取头像跳过 {character}: {message}")
 
         except Exception as exc:
             logger.warning(f"资源检查过程出现异常: {exc}")
 
+    def _discard_avatar_thumbnails(self, base_char: str) -> None:
+        """头像被替换后删除旧的头像缩略图，下次渲染时重新生成。"""
+        for path in self.avatar_thumbs_dir.glob(f"{glob.escape(base_char)}.*.png"):
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as exc:
+                logger.debug(f"删除头像缩略图失败 {path}: {exc}")
+
     async def fetch_character_image(
         self,
         base_char: str,
@@ -2139,21 +3470,17 @@ class VoiceManager:
 
         page_url = constants.PRTS_AVATAR_PAGE_URL.format(character=encoded_character)
 
-        owns_session = session is None
+        if session is None:
+            session = self._get_session()
 
-        if owns_session:
-            session = aiohttp.ClientSession(
-                headers=self.DEFAULT_HEADERS,
-                timeout=aiohttp.ClientTimeout(
-                    total=30,
-                    connect=10,
-                ),
-            )
+        limiter = None
 
         try:
-            assert session is not None
+            limiter = await self._rate_limiter.acquire(page_url)
 
             async with session.get(page_url) as response:
+                limiter.observe(response.status, response.headers)
+
                 if response.status != 200:
                     return (
                         False,
@@ -2162,16 +3489,9 @@ class VoiceManager:
 
                 html = await response.text()
 
-            soup = BeautifulSoup(
-                html,
-                "html.parser",
-            )
-            meta = soup.find(
-                "meta",
-                attrs={"property": "og:image"},
-            )
+            image_link = await self._parse_pool.run(extract_og_image, html)
 
-            if not meta or not meta.get("content"):
+            if not image_link:
                 return (
                     False,
                     "未找到头像图片链接",
@@ -2179,7 +3499,7 @@ class VoiceManager:
 
             image_url = urljoin(
                 constants.PRTS_BASE_URL,
-                str(meta["content"]),
+                image_link,
             )
 
             if not self._is_trusted_prts_url(image_url):
@@ -2188,7 +3508,11 @@ class VoiceManager:
                     "头像链接来源不可信",
                 )
 
+            limiter = await self._rate_limiter.acquire(image_url)
+
             async with session.get(image_url) as image_response:
+                limiter.observe(image_response.status, image_response.headers)
+
                 if image_response.status != 200:
                     return (
                         False,
@@ -2207,76 +3531,92 @@ class VoiceManager:
                     except ValueError:
                         pass
 
-                image_data = bytearray()
+                save_path = self._safe_path(
+                    self.assets_dir,
+                    f"{base_char}.png",
+                )
 
-                async for chunk in image_response.content.iter_chunked(64 * 1024):
-                    image_data.extend(chunk)
+                if save_path is None:
+                    return (
+                        False,
+                        "头像保存路径越界",
+                    )
 
-                    if len(image_data) > self.MAX_IMAGE_BYTES:
-                        return (
-                            False,
-                            "头像文件过大",
-                        )
+                fd, temp_name = tempfile.mkstemp(
+                    prefix=f".{save_path.name}.",
+                    suffix=".tmp",
+                    dir=str(self.assets_dir),
+                )
+                temp_path = Path(temp_name)
+                failure = None
 
-            try:
-                with PILImage.open(BytesIO(image_data)) as image:
-                    image.verify()
+                try:
+                    with os.fdopen(
+                        fd,
+                        "wb",
+                    ) as handle:
+                        received = 0
+                        header = bytearray()
+
+                        async for chunk in image_response.content.iter_chunked(
+                            self.DOWNLOAD_CHUNK_BYTES
+                        ):
+                            received += len(chunk)
 
-                    if image.format != "PNG":
-                        raise ValueError("图片格式不是 PNG")
-            except (OSError, ValueError):
-                return (
-                    False,
-                    "响应内容不是有效 PNG",
-                )
+                            if received > self.MAX_IMAGE_BYTES:
+                                failure = "头像文件过大"
+                                break
 
-            save_path = self._safe_path(
-                self.assets_dir,
-                f"{base_char}.png",
-            )
+                            if len(header) < len(self.PNG_SIGNATURE):
+                                header.extend(
+                                    chunk[: len(self.PNG_SIGNATURE) - len(header)]
+                                )
 
-            if save_path is None:
-                return (
-                    False,
-                    "头像保存路径越界",
-                )
+                                if not self.PNG_SIGNATURE.startswith(bytes(header)):
+                                    failure = "响应内容不是有效 PNG"
+                                    break
 
-            fd, temp_name = tempfile.mkstemp(
-                prefix=f".{save_path.name}.",
-                suffix=".tmp",
-                dir=str(self.assets_dir),
-            )
+                            handle.write(chunk)
+                        else:
+                            handle.flush()
+                            os.fsync(handle.fileno())
 
-            try:
-                with os.fdopen(
-                    fd,
-                    "wb",
-                ) as handle:
-                    handle.write(image_data)
-                    handle.flush()
-                    os.fsync(handle.fileno())
+                    if failure is None and not await self._parse_pool.run(
+                        self._is_valid_png_file,
+                        temp_path,
+                    ):
+                        failure = "响应内容不是有效 PNG"
 
-                os.replace(
-                    temp_name,
-                    save_path,
-                )
-            except Exception:
-                try:
-                    os.close(fd)
-                except OSError:
-                    pass
+                    if failure is not None:
+                        temp_path.unlink(missing_ok=True)
+                        return (
+                            False,
+                            failure,
+                        )
 
-                Path(temp_name).unlink(missing_ok=True)
-                raise
+                    os.replace(
+                        temp_path,
+                        save_path,
+                    )
+                except BaseException:
+                    temp_path.unlink(missing_ok=True)
+                    raise
 
+            self._discard_avatar_thumbnails(base_char)
+            self.catalog.record_avatar(base_char, image_url)
             logger.info(f"下载 {base_char} 头像成功")
 
             return True, "下载成功"
 
+        except CircuitOpenError as exc:
+            return False, str(exc)
         except (
             aiohttp.ClientError,
             asyncio.TimeoutError,
         ) as exc:
+            if limiter is not None:
+                limiter.observe_error()
+
             return (
                 False,
                 f"网络错误: {exc}",
@@ -2289,6 +3629,3 @@ class VoiceManager:
         except Exception as exc:
             logger.warning(f"获取头像失败 {base_char}: {exc}")
             return False, str(exc)
-        finally:
-            if owns_session and session is not None:
-                await session.close()
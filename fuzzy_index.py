@@ -0,0 +1,138 @@
+"""角色名称模糊匹配索引：按字符倒排预筛候选，再用 difflib 相似度精确打分。"""
+from collections import Counter
+from difflib import SequenceMatcher
+from heapq import nlargest
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+# (匹配词, 指向的规范引用)
+FuzzyTerm = Tuple[str, str]
+# (规范引用, 命中的匹配词, 相似度)
+FuzzyCandidate = Tuple[str, str, float]
+
+
+class FuzzyIndex:
+    """
+    名称模糊匹配索引。
+
+    匹配词按分组登记（通常一个角色一组），扫描时只替换变化的分组。
+    查询时先用字符倒排表累计与每个匹配词的公共字符数，得到与
+    SequenceMatcher.quick_ratio 相同的上界；低于阈值的候选直接跳过，
+    其余再计算 ratio，结果与 difflib.get_close_matches 的阈值语义一致。
+    """
+
+    def __init__(self) -> None:
+        self._groups: Dict[str, List[int]] = {}
+        # 匹配词编号 -> (匹配词, 规范引用, 字符计数)
+        self._terms: Dict[int, Tuple[str, str, Counter]] = {}
+        # 字符 -> 匹配词编号 -> 该字符在匹配词中出现的次数
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def groups(self) -> List[str]:
+        return list(self._groups)
+
+    def clear(self) -> None:
+        self._groups.clear()
+        self._terms.clear()
+        self._postings.clear()
+
+    def replace_group(self, group: str, terms: Iterable[FuzzyTerm]) -> None:
+        """用新的匹配词替换某分组，空列表等价于移除分组。"""
+        self.remove_group(group)
+        term_ids = []
+        seen: Set[FuzzyTerm] = set()
+
+        for term, target in terms:
+            term = term.strip()
+
+            if not term or (term, target) in seen:
+                continue
+
+            seen.add((term, target))
+            term_id = self._next_id
+            self._next_id += 1
+            counts = Counter(term)
+            self._terms[term_id] = (term, target, counts)
+
+            for char, count in counts.items():
+                self._postings.setdefault(char, {})[term_id] = count
+
+            term_ids.append(term_id)
+
+        if term_ids:
+            self._groups[group] = term_ids
+
+    def remove_group(self, group: str) -> None:
+        for term_id in self._groups.pop(group, []):
+            _, _, counts = self._terms.pop(term_id)
+
+            for char in counts:
+                postings = self._postings.get(char)
+
+                if postings is None:
+                    continue
+
+                postings.pop(term_id, None)
+
+                if not postings:
+                    del self._postings[char]
+
+    def search(
+        self,
+        query: str,
+        *,
+        limit: int = 1,
+        cutoff: float = 0.6,
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> List[FuzzyCandidate]:
+        """
+        返回相似度不低于 cutoff 的候选，按相似度降序，同一引用只保留最高分。
+
+        accept 用于按规范引用过滤候选，在截取前 limit 个之前执行。
+        """
+        query = query.strip()
+
+        if not query or limit <= 0:
+            return []
+
+        query_counts = Counter(query)
+        overlaps: Dict[int, int] = {}
+
+        for char, count in query_counts.items():
+            for term_id, term_count in self._postings.get(char, {}).items():
+                overlaps[term_id] = overlaps.get(term_id, 0) + min(count, term_count)
+
+        matcher = SequenceMatcher()
+        matcher.set_seq2(query)
+        best: Dict[str, Tuple[float, str]] = {}
+
+        for term_id, overlap in overlaps.items():
+            term, target, _ = self._terms[term_id]
+
+            if accept is not None and not accept(target):
+                continue
+
+            # 公共字符数给出的上界即 quick_ratio，不够阈值就无需精确比较。
+            if 2.0 * overlap / (len(term) + len(query)) < cutoff:
+                continue
+
+            matcher.set_seq1(term)
+            score = matcher.ratio()
+
+            if score < cutoff:
+                continue
+
+            previous = best.get(target)
+
+            if previous is None or (score, term) > previous:
+                best[target] = (score, term)
+
+        ranked = nlargest(
+            limit,
+            best.items(),
+            key=lambda item: (item[1][0], item[1][1]),
+        )
+        return [(target, term, score) for target, (score, term) in ranked]
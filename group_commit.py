@@ -0,0 +1,134 @@
+"""批量提交：一批临时文件统一落盘后再依次改名，减少批量下载与导入时的 fsync 次数。"""
+import ctypes
+import ctypes.util
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from astrbot.api import logger
+
+from . import constants
+
+_libc = None
+
+
+def _load_syncfs():
+    """取得 libc 的 syncfs，非 Linux 或不可用时返回 None。"""
+    global _libc
+
+    if _libc is None:
+        try:
+            _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        except OSError:
+            _libc = False
+
+    return getattr(_libc, "syncfs", None) if _libc else None
+
+
+def _syncfs(path: Path) -> bool:
+    """对 path 所在的文件系统执行一次 syncfs，成功返回 True。"""
+    syncfs = _load_syncfs()
+
+    if syncfs is None:
+        return False
+
+    fd = os.open(str(path), os.O_RDONLY)
+
+    try:
+        return syncfs(fd) == 0
+    finally:
+        os.close(fd)
+
+
+def _fsync_file(path: Path) -> None:
+    fd = os.open(str(path), os.O_RDONLY)
+
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def sync_files(paths: List[Path]) -> None:
+    """
+    让一批已写完的文件落盘。
+
+    文件数达到 GROUP_COMMIT_SYNCFS_MIN 时，每个文件系统只执行一次 syncfs；
+    数量较少或系统不支持时逐个 fsync。
+    """
+    if len(paths) >= constants.GROUP_COMMIT_SYNCFS_MIN:
+        # 设备号 -> 该设备上的任意一个文件
+        devices: Dict[int, Path] = {}
+
+        for path in paths:
+            devices.setdefault(os.stat(path).st_dev, path)
+
+        if all(_syncfs(path) for path in devices.values()):
+            return
+
+    for path in paths:
+        _fsync_file(path)
+
+
+class GroupCommit:
+    """
+    收集 (临时文件, 目标路径)，commit 时先让全部临时文件落盘，再逐个原子改名。
+
+    每个目标仍由一次 os.replace 替换，读者只会看到旧文件或完整的新文件；
+    与逐个提交的区别只在于落盘操作合并为一次。
+    """
+
+    def __init__(self) -> None:
+        self._pending: List[Tuple[Path, Path]] = []
+        self._synced = False
+        # 最近一次 commit 已改名的目标，改名中途失败时供调用方回滚。
+        self.committed: List[Path] = []
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def targets(self) -> List[Path]:
+        """尚未提交的目标路径。"""
+        return [target for _, target in self._pending]
+
+    def add(self, temp_path: Path, target: Path) -> None:
+        self._pending.append((Path(temp_path), Path(target)))
+        self._synced = False
+
+    def sync(self) -> None:
+        """只让当前批次的临时文件落盘，不改名；之后的 commit 不再重复落盘。"""
+        if self._pending and not self._synced:
+            sync_files([temp_path for temp_path, _ in self._pending])
+
+        self._synced = True
+
+    def commit(self) -> List[Path]:
+        """落盘并改名，返回已提交的目标路径；改名失败时其余临时文件被清理。"""
+        self.sync()
+        pending, self._pending = self._pending, []
+        self._synced = False
+        self.committed = []
+
+        if not pending:
+            return []
+
+        try:
+            for temp_path, target in pending:
+                os.replace(temp_path, target)
+                self.committed.append(target)
+        except OSError:
+            for temp_path, _ in pending[len(self.committed) :]:
+                temp_path.unlink(missing_ok=True)
+            raise
+
+        return list(self.committed)
+
+    def discard(self) -> None:
+        """放弃尚未提交的临时文件。"""
+        pending, self._pending = self._pending, []
+
+        for temp_path, _ in pending:
+            try:
+                temp_path.unlink(missing_ok=True)
+            except OSError as exc:
+                logger.debug(f"清理未提交的临时文件失败 {temp_path}: {exc}")
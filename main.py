@@ -1,10 +1,10 @@
 import asyncio
-import difflib
 import json
 import random
+import re
 import time
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from uuid import uuid4
 
 from astrbot.api import AstrBotConfig, logger
@@ -14,10 +14,13 @@ from astrbot.api.star import Context, Star, StarTools, register
 
 # 引入拆分后的模块
 from . import constants
+from .bulk_fetch import BulkFetchScheduler, collect_targets
+from .catalog import CatalogError
 from .config import PluginConfig
 from .data_source import VoiceManager
 from .renderer import VoiceRenderer
 from .voice_page import VoicePageManager
+from .watcher import VoiceDirectoryWatcher
 
 
 @register(
@@ -39,24 +42,52 @@ class MyPlugin(Star):
         self.plugin_config = PluginConfig.from_dict(config)
 
         # 3. 初始化核心模块
-        self.voice_mgr = VoiceManager(self.data_dir, self.plugin_dir)
+        self.voice_mgr = VoiceManager(
+            self.data_dir,
+            self.plugin_dir,
+            download_concurrency=self.plugin_config.download_concurrency,
+        )
         self.renderer = VoiceRenderer(
             font_path=self.plugin_dir / "SourceHanSerifCN-Medium-6.otf",
             output_dir=self.data_dir / "render_cache",
+            thumb_dir=self.voice_mgr.avatar_thumbs_dir,
         )
 
-        # 4. 加载自定义指令
+        # 4. 加载自定义指令，并预编译为 触发词 -> 语音文件 的查找表
         self.custom_mappings = self._load_custom_commands()
+        self._trigger_table: Dict[str, Tuple[str, str, str]] = {}
+        self._trigger_stats = {"hits": 0, "misses": 0, "fallbacks": 0}
+        self._compile_triggers()
+        # 命令或 Page 修改别称后，经别称解析的绑定需要指向新的角色。
+        self.voice_mgr.on_aliases_changed = self._compile_triggers
 
         # 5. 文件扫描缓存
         self._last_scan_time = 0
+        # 只串行化是否需要扫描的判断；扫描本身由 VoiceManager.scan_lock 与按角色重扫互斥。
         self._scan_lock = asyncio.Lock()
         self._cooldowns: Dict[Tuple[str, str], float] = {}
+        # 单条下载后在后台补齐语音包的任务，插件停用时取消。
+        self._backfill_tasks: Set[asyncio.Task] = set()
+        self.voice_watcher: Optional[VoiceDirectoryWatcher] = (
+            VoiceDirectoryWatcher(
+                self.voice_mgr.voices_dir,
+                self._apply_voice_changes,
+            )
+            if self.plugin_config.watch_voice_dir
+            else None
+        )
 
         # 6. 启动后台迁移与资源检查
         self._startup_task = asyncio.create_task(self._initialize_resources())
 
         # 7. 注册 AstrBot Plugin Page 管理端
+        # 批量下载调度器，进度保存在 bulk_fetch.json，启动后继续未完成的任务。
+        self.bulk_fetcher = BulkFetchScheduler(
+            self.voice_mgr,
+            self.data_dir / "bulk_fetch.json",
+            on_fetched=self._compile_triggers,
+        )
+
         self.voice_page = VoicePageManager(
             context=context,
             voice_mgr=self.voice_mgr,
@@ -64,6 +95,9 @@ class MyPlugin(Star):
             save_custom_commands=self._save_custom_commands,
             scan_callback=self._scan_if_needed,
             valid_trigger=self._valid_trigger,
+            trigger_stats=self._trigger_dispatch_stats,
+            render_stats=self.renderer.cache_stats,
+            bulk_fetcher=self.bulk_fetcher,
             default_language_rank=self.plugin_config.default_language_rank,
             default_download_langs=self.plugin_config.auto_download_language,
             default_download_skin=self.plugin_config.auto_download_skin,
@@ -156,6 +190,7 @@ class MyPlugin(Star):
                 file.flush()
 
             temp_path.replace(self.custom_cmd_file)
+            self._compile_triggers()
             return True
 
         except Exception as exc:
@@ -172,6 +207,69 @@ class MyPlugin(Star):
                 except OSError:
                     pass
 
+    def _compile_triggers(self) -> None:
+        """
+        把自定义绑定预编译为 触发词 -> (语音路径, 角色, 语音)。
+
+        绑定变更或索引重扫后重建。需要选择皮肤、校正旧编号或文件缺失的
+        绑定不进入表中，由 on_message 的完整流程处理并给出日志。
+        """
+        table = {}
+
+        for trigger, info in self.custom_mappings.items():
+            if not isinstance(info, dict):
+                continue
+
+            character = info.get("character")
+            voice = info.get("voice")
+            lang_code = info.get("lang")
+
+            if (
+                not self.voice_mgr.validate_character(character)
+                or voice not in self.voice_mgr.VOICE_DESCRIPTIONS
+            ):
+                continue
+
+            resolved_character, _ = self.voice_mgr.resolve_character_reference(
+                character
+            )
+
+            if not resolved_character:
+                continue
+
+            lang_code = lang_code or self.voice_mgr.choose_language(
+                resolved_character,
+                self.plugin_config.default_language_rank,
+            )
+
+            if (
+                lang_code not in self.voice_mgr.LANGUAGE_MAP
+                or self.voice_mgr.needs_voice_resource_remap(
+                    resolved_character,
+                    lang_code,
+                )
+            ):
+                continue
+
+            path = self.voice_mgr.get_voice_path(
+                resolved_character,
+                voice,
+                lang_code,
+            )
+
+            if path:
+                table[trigger] = (str(path), resolved_character, voice)
+
+        self._trigger_table = table
+
+    def _trigger_dispatch_stats(self) -> dict:
+        """快捷触发词命中统计，供 Page 概览确认消息监听开销。"""
+        return {
+            **self._trigger_stats,
+            "bindings": len(self.custom_mappings),
+            "compiled": len(self._trigger_table),
+        }
+
     async def _initialize_resources(self) -> None:
         try:
             await self.voice_mgr.migrate_legacy_skin_directories(
@@ -184,6 +282,21 @@ class MyPlugin(Star):
         except Exception as exc:
             logger.warning(f"启动资源迁移或检查失败，将在下次启动重试: {exc}")
 
+        try:
+            # 名单在有效期内不发请求，过期后按 ETag 条件刷新。
+            await self.voice_mgr.catalog.refresh_roster()
+        except asyncio.CancelledError:
+            raise
+        except CatalogError as exc:
+            logger.warning(f"刷新 PRTS 干员目录失败，将使用本地快照: {exc}")
+
+        if self.voice_watcher is not None:
+            self.voice_watcher.start()
+
+        if self.bulk_fetcher.auto_resumable:
+            _, message = self.bulk_fetcher.resume()
+            logger.info(f"检测到未完成的批量下载：{message}")
+
     async def _scan_if_needed(
         self,
         force: bool = False,
@@ -200,13 +313,24 @@ class MyPlugin(Star):
 
         async with self._scan_lock:
             current_time = time.monotonic()
+            # 目录监听运行时索引已随文件变化增量更新，只有强制刷新才全量扫描。
+            watching = self.voice_watcher is not None and self.voice_watcher.running
+            expired = current_time - self._last_scan_time > constants.SCAN_CACHE_DURATION
 
-            if force or current_time - self._last_scan_time > constants.SCAN_CACHE_DURATION:
-                await asyncio.to_thread(self.voice_mgr.scan_voice_files)
+            if force or (expired and not watching):
+                await self.voice_mgr.rescan_all()
                 self._last_scan_time = current_time
+                self._compile_triggers()
 
                 logger.debug(f"执行文件扫描，下次扫描时间: {constants.SCAN_CACHE_DURATION}秒后")
 
+    async def _apply_voice_changes(self, characters: Set[str]) -> None:
+        """目录监听回调：只重扫发生变化的角色目录。"""
+        await self.voice_mgr.rescan_characters(characters)
+        self._compile_triggers()
+
+        logger.debug(f"语音目录变化，已增量更新: {', '.join(sorted(characters))}")
+
     async def _repair_voice_mapping_if_needed(
         self,
         character: str,
@@ -232,8 +356,76 @@ class MyPlugin(Star):
             character,
             language,
         )
+
+        if repaired:
+            self._compile_triggers()
+
         return repaired, message
 
+    async def _fetch_voice_lazily(
+        self,
+        character: str,
+        lang: Optional[str],
+        voice: Optional[str],
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        只下载本次要播放的一条语音，成功后在后台补齐完整语音包。
+
+        返回 (语言, 语音名)；失败时返回 (None, None)，调用方回退为完整下载。
+        指定的语言无效或不在 auto_download_language 中时同样回退，与完整
+        下载一样只获取配置允许的语言。
+        """
+        requested_lang = None
+
+        if lang:
+            requested_lang = self.voice_mgr.LANG_ALIAS.get(lang.strip().lower())
+            language_info = self.voice_mgr.LANGUAGE_MAP.get(requested_lang or "")
+
+            if (
+                language_info is None
+                or language_info["rank"]
+                not in self.plugin_config.auto_download_language
+            ):
+                logger.debug(f"单条下载不支持语言参数 {lang}，改为完整下载")
+                return None, None
+
+        success, message, language, voice_name = (
+            await self.voice_mgr.fetch_single_voice(
+                character,
+                self.plugin_config.auto_download_language,
+                self.plugin_config.default_language_rank,
+                language=requested_lang,
+                voice=voice.strip() if voice else None,
+            )
+        )
+
+        if not success:
+            logger.debug(f"单条下载 {character} 失败，改为完整下载: {message}")
+            return None, None
+
+        self._schedule_backfill(character)
+        return language, voice_name
+
+    def _schedule_backfill(self, character: str) -> None:
+        """后台下载单条下载模式下尚未获取的语言、语音与皮肤。"""
+
+        async def backfill() -> None:
+            success, message = await self.voice_mgr.fetch_character_voices(
+                character,
+                self.plugin_config.auto_download_skin,
+                self.plugin_config.auto_download_language,
+            )
+
+            if success:
+                self._compile_triggers()
+                logger.info(f"已在后台补齐 {character} 的语音: {message}")
+            else:
+                logger.warning(f"后台补齐 {character} 的语音失败: {message}")
+
+        task = asyncio.create_task(backfill())
+        self._backfill_tasks.add(task)
+        task.add_done_callback(self._backfill_tasks.discard)
+
     @staticmethod
     def _skin_choice_message(
         character: str,
@@ -425,10 +617,32 @@ class MyPlugin(Star):
     ) -> None:
         """监听所有消息并处理自定义触发词。"""
         msg = event.message_str.strip()
+        compiled = self._trigger_table.get(msg)
+
+        # 预编译后文件被删除时移出查找表，改走下面的完整流程。
+        if compiled is not None and not Path(compiled[0]).is_file():
+            self._trigger_table.pop(msg, None)
+            compiled = None
+
+        if compiled is not None:
+            self._trigger_stats["hits"] += 1
+            path, character, voice = compiled
+            logger.info(f"触发自定义语音: {msg} -> {character} {voice}")
+            await event.send(
+                MessageChain(
+                    [
+                        Record.fromFileSystem(path),
+                    ]
+                )
+            )
+            return
 
         if msg not in self.custom_mappings:
+            self._trigger_stats["misses"] += 1
             return
 
+        # 未能预编译的绑定走完整校验流程，便于记录具体原因或触发旧编号校正。
+        self._trigger_stats["fallbacks"] += 1
         cfg = self.custom_mappings[msg]
 
         if not isinstance(cfg, dict):
@@ -544,6 +758,21 @@ class MyPlugin(Star):
             character
         )
 
+        # 本地名称与别称都未命中时，才按完整全拼或首字母解析，且必须唯一命中；
+        # 目录中的官方名称（如 W）原样保留。
+        if (
+            not resolved_character
+            and not skin_options
+            and VoiceManager._base_character(character) not in self.voice_mgr.catalog
+        ):
+            romanized = self.voice_mgr.resolve_romanized_name(character)
+
+            if romanized:
+                character = romanized
+                resolved_character, skin_options = (
+                    self.voice_mgr.resolve_character_reference(character)
+                )
+
         if skin_options and not resolved_character:
             yield event.plain_result(
                 self._skin_choice_message(
@@ -556,21 +785,28 @@ class MyPlugin(Star):
         if resolved_character:
             character = resolved_character
 
+        # 单条下载模式下刚下载的语言，优先于按优先级选择
+        lazy_lang = None
+
         # 检查角色是否存在
         if character not in self.voice_mgr.voice_index:
-            all_names = list(self.voice_mgr.voice_index.keys())
+            catalog = self.voice_mgr.catalog
+            base_character = VoiceManager._base_character(character)
+            # 目录中存在的干员只是尚未下载，不再猜测为本地的相近名称。
+            known_operator = catalog.ready and base_character in catalog
+            # 名单未命中时先条件刷新；刷新失败则不据此拒绝，交给在线下载判断。
+            roster_current = True
 
-            matches = difflib.get_close_matches(
-                character,
-                all_names,
-                n=1,
-                cutoff=constants.FUZZY_MATCH_THRESHOLD,
-            )
+            if catalog.ready and not known_operator:
+                roster_current = await catalog.refresh_on_miss()
+                known_operator = base_character in catalog
+
+            matches = [] if known_operator else self.voice_mgr.fuzzy_match(character)
 
             guessed_character = None
 
             if matches:
-                guessed_character = matches[0]
+                guessed_character = matches[0][0]
 
                 yield event.plain_result(
                     f"本地未找到「{character}」，"
@@ -597,6 +833,22 @@ class MyPlugin(Star):
                     character = resolved_character
 
             if not guessed_character:
+                if catalog.ready and not known_operator:
+                    candidates = catalog.fuzzy_match(character)
+
+                    if candidates:
+                        yield event.plain_result(
+                            f"本地未找到「{character}」，"
+                            f"猜测您是指「{candidates[0][0]}」"
+                            "...已自动切换。"
+                        )
+                        character = candidates[0][0]
+                    elif roster_current:
+                        yield event.plain_result(
+                            f"未找到角色 {character}，PRTS 干员目录中也没有相近的名称"
+                        )
+                        return
+
                 if not self.plugin_config.auto_download:
                     yield event.plain_result(f"未找到角色 {character} (自动下载已关闭)")
                     return
@@ -610,17 +862,29 @@ class MyPlugin(Star):
 
                 yield event.plain_result(f"未找到 {character}，正在尝试从 PRTS 获取...")
 
-                success, message = await self.voice_mgr.fetch_character_voices(
-                    character,
-                    self.plugin_config.auto_download_skin,
-                    self.plugin_config.auto_download_language,
-                )
+                lazy_voice = None
 
-                if not success:
-                    yield event.plain_result(f"获取失败: {message}")
-                    return
+                if self.plugin_config.lazy_download:
+                    lazy_lang, lazy_voice = await self._fetch_voice_lazily(
+                        character,
+                        lang,
+                        voice,
+                    )
+
+                if lazy_voice:
+                    voice = lazy_voice
+                else:
+                    success, message = await self.voice_mgr.fetch_character_voices(
+                        character,
+                        self.plugin_config.auto_download_skin,
+                        self.plugin_config.auto_download_language,
+                    )
 
-                await self._scan_if_needed(force=True)
+                    if not success:
+                        yield event.plain_result(f"获取失败: {message}")
+                        return
+
+                    await self._scan_if_needed(force=True)
 
                 resolved_character, skin_options = (
                     self.voice_mgr.resolve_character_reference(character)
@@ -649,6 +913,8 @@ class MyPlugin(Star):
             if not target_lang:
                 yield event.plain_result(f"不支持的语言参数: {lang}")
                 return
+        elif lazy_lang:
+            target_lang = lazy_lang
         else:
             target_lang = self.voice_mgr.choose_language(
                 character,
@@ -714,21 +980,51 @@ class MyPlugin(Star):
     async def mrfz_list_handler(
         self,
         event: AstrMessageEvent,
+        page: Optional[str] = None,
     ):
-        """生成并发送本地语音列表图片。"""
+        """生成并发送本地语音列表图片，默认第 1 页，“全部”生成完整长图。"""
+        page = (page or "").strip()
+        page_number: Optional[int] = 1
+
+        if page in {"全部", "all"}:
+            page_number = None
+        elif page:
+            if not page.isdigit() or int(page) < 1:
+                yield event.plain_result("页码必须是正整数，或使用 /mrfz_list 全部")
+                return
+
+            page_number = int(page)
+
         yield event.plain_result("正在读取 PRTS 终端数据...")
 
         render_data = await self._get_list_render_data()
+        page_count = self.renderer.list_page_count(
+            render_data,
+            self.voice_mgr.VOICE_DESCRIPTIONS,
+        )
+
+        if page_number is not None and page_number > page_count:
+            yield event.plain_result(f"页码超出范围，当前共 {page_count} 页")
+            return
 
         try:
             img_path = await asyncio.to_thread(
                 self.renderer.render_image,
                 render_data,
                 self.voice_mgr.VOICE_DESCRIPTIONS,
+                page_number,
             )
 
             yield event.image_result(str(img_path))
 
+            if page_number is not None and page_count > 1:
+                hint = f"第 {page_number}/{page_count} 页"
+
+                if page_number < page_count:
+                    hint += f"，使用 /mrfz_list {page_number + 1} 查看下一页"
+
+                yield event.plain_result(hint)
+
         except Exception as exc:
             logger.error(
                 f"渲染错误: {exc}",
@@ -969,6 +1265,7 @@ class MyPlugin(Star):
             character,
             True,
             "123456",
+            reuse_recent=False,
         )
 
         if success:
@@ -976,6 +1273,167 @@ class MyPlugin(Star):
 
         yield event.plain_result(message)
 
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @filter.command(
+        "mrfz_fetch_all",
+        alias={
+            "批量下载语音",
+        },
+    )
+    async def mrfz_fetch_all(
+        self,
+        event: AstrMessageEvent,
+        targets: Optional[str] = None,
+    ):
+        """批量下载多名角色的语音，默认下载所有绑定引用的角色与自定义别称的目标。"""
+        targets = (targets or "").strip()
+
+        if targets in {"状态", "进度"}:
+            progress = self.bulk_fetcher.progress()
+
+            if not progress["total"]:
+                yield event.plain_result("当前没有批量下载任务")
+                return
+
+            failed = [
+                item["character"]
+                for item in progress["items"]
+                if item["status"] == "failed"
+            ]
+            lines = [
+                f"批量下载{'进行中' if progress['running'] else '已停止'}："
+                f"完成 {progress['done']}/{progress['total']}，"
+                f"失败 {progress['failed']}，待处理 {progress['pending']}",
+            ]
+
+            if failed:
+                lines.append(f"失败角色：{'、'.join(failed[:20])}")
+
+            if progress["resumable"]:
+                lines.append("可使用 /mrfz_fetch_all 继续 恢复下载")
+
+            yield event.plain_result("\n".join(lines))
+            return
+
+        if targets == "继续":
+            _, message = self.bulk_fetcher.resume()
+            yield event.plain_result(message)
+            return
+
+        remaining = self._cooldown_remaining(
+            event,
+            "fetch_all",
+            30.0,
+        )
+
+        if remaining > 0:
+            yield event.plain_result(f"操作过于频繁，请 {remaining:.0f} 秒后重试")
+            return
+
+        characters = None
+
+        if targets and targets not in {"绑定", "全部"}:
+            characters = [
+                name for name in re.split(r"[,，、\s]+", targets) if name
+            ]
+
+            if not characters or not all(
+                self.voice_mgr.validate_character(name) for name in characters
+            ):
+                yield event.plain_result("角色名称不合法")
+                return
+
+        success, message = self.bulk_fetcher.start(
+            collect_targets(
+                self.custom_mappings,
+                self.voice_mgr.custom_operator_aliases,
+                characters,
+                bindings_only=targets == "绑定",
+            ),
+            languages=self.plugin_config.auto_download_language,
+            include_skin=self.plugin_config.auto_download_skin,
+        )
+
+        if success:
+            message += "，可使用 /mrfz_fetch_all 状态 查看进度"
+
+        yield event.plain_result(message)
+
+    @filter.permission_type(filter.PermissionType.ADMIN)
+    @filter.command(
+        "mrfz_catalog",
+        alias={
+            "干员目录",
+        },
+    )
+    async def mrfz_catalog(
+        self,
+        event: AstrMessageEvent,
+        action: Optional[str] = None,
+    ):
+        """查看或刷新 PRTS 干员目录快照。"""
+        catalog = self.voice_mgr.catalog
+        action = (action or "").strip()
+
+        if action in {"刷新", "完整"}:
+            remaining = self._cooldown_remaining(
+                event,
+                "catalog",
+                60.0,
+            )
+
+            if remaining > 0:
+                yield event.plain_result(f"操作过于频繁，请 {remaining:.0f} 秒后重试")
+                return
+
+            try:
+                added, removed = await catalog.refresh_roster(force=True)
+            except CatalogError as exc:
+                yield event.plain_result(f"刷新干员目录失败: {exc}")
+                return
+
+            message = f"干员名单已刷新：新增 {added}，移除 {removed}"
+
+            if action == "完整":
+                pending = catalog.start_detail_refresh()
+
+                if pending is None:
+                    message += "；干员详情已在后台补齐中"
+                else:
+                    message += f"，正在后台补齐 {pending} 名干员的皮肤与语音信息"
+
+                message += "，可使用 /mrfz_catalog 查看进度"
+
+            yield event.plain_result(message)
+            return
+
+        stats = catalog.stats()
+
+        if not stats["operators"]:
+            yield event.plain_result(
+                "尚未建立干员目录，可使用 /mrfz_catalog 刷新 获取干员名单"
+            )
+            return
+
+        lines = [
+            f"PRTS 干员目录：{stats['operators']} 名干员，"
+            f"已获取详情 {stats['detailed']} 名，皮肤 {stats['skins']} 套"
+        ]
+
+        if stats["refreshingDetails"]:
+            progress = stats["detailProgress"]
+            lines.append(
+                "正在后台补齐详情："
+                f"{progress['updated'] + progress['failed']}/{progress['total']}，"
+                f"失败 {progress['failed']}"
+            )
+
+        yield event.plain_result(
+            "\n".join(lines) + "\n"
+            "/mrfz_catalog 刷新：更新干员名单\n"
+            "/mrfz_catalog 完整：同时补齐缺失或过期的干员详情"
+        )
+
     @filter.command(
         "mrfz_help",
         alias={"明日方舟语音帮助"},
@@ -996,6 +1454,7 @@ class MyPlugin(Star):
                     self.renderer.render_image,
                     render_data,
                     self.voice_mgr.VOICE_DESCRIPTIONS,
+                    1,
                 ),
             )
 
@@ -1023,20 +1482,46 @@ class MyPlugin(Star):
             yield event.plain_result(f"帮助生成失败: {exc}")
 
     async def terminate(self) -> None:
-        """插件停用或重载时停止后台迁移与资源检查任务。"""
+        """插件停用或重载时停止目录监听、后台迁移与资源检查任务，并关闭 HTTP 会话。"""
         voice_page = getattr(self, "voice_page", None)
 
         if voice_page is not None:
             await voice_page.terminate()
 
+        voice_watcher = getattr(self, "voice_watcher", None)
+
+        if voice_watcher is not None:
+            await voice_watcher.stop()
+
         task = getattr(self, "_startup_task", None)
 
-        if task is None or task.done():
-            return
+        if task is not None and not task.done():
+            task.cancel()
 
-        task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
 
-        try:
-            await task
-        except asyncio.CancelledError:
-            pass
+        bulk_fetcher = getattr(self, "bulk_fetcher", None)
+
+        if bulk_fetcher is not None:
+            await bulk_fetcher.stop()
+
+        backfill_tasks = list(getattr(self, "_backfill_tasks", ()))
+
+        for backfill_task in backfill_tasks:
+            backfill_task.cancel()
+
+        await asyncio.gather(*backfill_tasks, return_exceptions=True)
+
+        renderer = getattr(self, "renderer", None)
+
+        if renderer is not None:
+            renderer.close()
+
+        # 后台任务全部结束后再关闭共享 HTTP 会话。
+        voice_mgr = getattr(self, "voice_mgr", None)
+
+        if voice_mgr is not None:
+            await voice_mgr.close()
@@ -0,0 +1,163 @@
+"""PRTS 页面字段提取：先定位目标属性所在的标签，只解析这一个标签；未命中时回退 BeautifulSoup。"""
+import html as html_lib
+import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+# (标签名, 属性) -> 命中时返回的属性值
+AttributeMatcher = Callable[[str, Dict[str, Optional[str]]], Optional[str]]
+
+# 从标签起点向后最多交给 HTMLParser 的字符数，足以容纳完整的语音记录属性。
+MAX_TAG_LENGTH = 64 * 1024
+
+
+class _TagFound(Exception):
+    pass
+
+
+class _FirstTagParser(HTMLParser):
+    """只解析片段中的第一个开始标签，解析到后立即停止。"""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.tag: Optional[str] = None
+        self.attrs: Dict[str, Optional[str]] = {}
+
+    def handle_starttag(self, tag, attrs) -> None:
+        self.tag = tag
+        self.attrs = dict(attrs)
+        raise _TagFound
+
+
+def _inside_raw_block(html: str, position: int) -> bool:
+    """位置是否处于未闭合的注释或脚本中，这些地方出现的标签文本不算数。"""
+    if html.rfind("<!--", 0, position) > html.rfind("-->", 0, position):
+        return True
+
+    lowered_window = html[max(0, position - MAX_TAG_LENGTH) : position].lower()
+    return lowered_window.rfind("<script") > lowered_window.rfind("</script")
+
+
+def find_tag_attribute(
+    html: str,
+    marker: str,
+    matcher: AttributeMatcher,
+) -> Optional[str]:
+    """
+    按 marker 文本定位候选标签并逐个校验。
+
+    每个候选只解析其所在的一个标签，找到第一个满足 matcher 的标签即返回，
+    不再处理页面其余部分；没有可确认的结果时返回 None。
+    """
+    position = 0
+
+    while True:
+        index = html.find(marker, position)
+
+        if index < 0:
+            return None
+
+        position = index + len(marker)
+        tag_start = html.rfind("<", 0, index)
+
+        if (
+            tag_start < 0
+            or not html[tag_start + 1 : tag_start + 2].isalpha()
+            or _inside_raw_block(html, tag_start)
+        ):
+            continue
+
+        parser = _FirstTagParser()
+
+        try:
+            parser.feed(html[tag_start : index + MAX_TAG_LENGTH])
+        except _TagFound:
+            pass
+
+        if parser.tag is None:
+            continue
+
+        value = matcher(parser.tag, parser.attrs)
+
+        if value is not None:
+            return value
+
+
+def _voice_base_matcher(tag: str, attrs: Dict[str, Optional[str]]) -> Optional[str]:
+    if tag != "div" or "data-voice-base" not in attrs:
+        return None
+
+    return attrs["data-voice-base"] or ""
+
+
+def _og_image_matcher(tag: str, attrs: Dict[str, Optional[str]]) -> Optional[str]:
+    if tag != "meta" or attrs.get("property") != "og:image":
+        return None
+
+    return attrs.get("content") or ""
+
+
+def extract_voice_base(html: str) -> Optional[str]:
+    """返回第一个语音记录节点的 data-voice-base 属性，页面中没有时返回 None。"""
+    value = find_tag_attribute(html, "data-voice-base", _voice_base_matcher)
+
+    if value is not None:
+        return value
+
+    soup = BeautifulSoup(
+        html,
+        "html.parser",
+    )
+    voice_div = soup.find(
+        "div",
+        attrs={"data-voice-base": True},
+    )
+
+    if not voice_div:
+        return None
+
+    return str(voice_div.get("data-voice-base") or "")
+
+
+def extract_og_image(html: str) -> Optional[str]:
+    """返回 og:image 的 content，页面中没有该 meta 时返回 None。"""
+    value = find_tag_attribute(html, "og:image", _og_image_matcher)
+
+    if value is not None:
+        return value
+
+    soup = BeautifulSoup(
+        html,
+        "html.parser",
+    )
+    meta = soup.find(
+        "meta",
+        attrs={"property": "og:image"},
+    )
+
+    if not meta:
+        return None
+
+    return str(meta.get("content") or "")
+
+
+def extract_attribute_values(html: str, attribute: str) -> List[str]:
+    """
+    按文档顺序返回所有标签上某属性的取值（已反转义、去重）。
+
+    用于干员一览这类属性密集的大页面，避免为每个节点建立解析树。
+    """
+    pattern = re.compile(
+        rf"<[a-zA-Z][^<>]*?\s{re.escape(attribute)}\s*=\s*(?:\"([^\"]*)\"|'([^']*)')"
+    )
+    values = {}
+
+    for match in pattern.finditer(html):
+        value = html_lib.unescape(match.group(1) or match.group(2) or "").strip()
+
+        if value:
+            values.setdefault(value, None)
+
+    return list(values)
@@ -0,0 +1,263 @@
+"""PRTS 请求限流：按主机划分的自适应令牌桶与熔断器，遇到 429/5xx 时自动降速并遵守 Retry-After。"""
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlparse
+
+from . import constants
+
+# 视为“服务端要求降速”的状态码，其余状态码都算作正常响应。
+THROTTLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """主机处于熔断或限流等待过长时抛出，retry_after 为建议的等待秒数。"""
+
+    def __init__(self, host: str, retry_after: float) -> None:
+        self.host = host
+        self.retry_after = max(0.0, retry_after)
+        super().__init__(f"{host} 暂时限流，请约 {int(self.retry_after) + 1} 秒后重试")
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 的秒数或 HTTP 日期，无法解析时返回 None。"""
+    if not value:
+        return None
+
+    value = value.strip()
+
+    if value.isdigit():
+        return float(value)
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class HostLimiter:
+    """
+    单个主机的令牌桶与熔断器。
+
+    令牌按 rate 每秒补充，上限 burst。收到 429/5xx 时速率减半，正常响应
+    后逐步恢复；连续失败达到阈值或 Retry-After 过长时进入熔断（open），
+    冷却结束后只放行一个探测请求（half-open），成功才恢复（closed）。
+    """
+
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.base_rate = float(constants.RATE_LIMIT_RATE)
+        self.rate = self.base_rate
+        self.burst = float(constants.RATE_LIMIT_BURST)
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        # Retry-After 要求的最早下一次请求时间
+        self._blocked_until = 0.0
+        self.state = "closed"
+        self._failures = 0
+        self._cooldown = float(constants.BREAKER_COOLDOWN)
+        self._open_until = 0.0
+        self._probe_started: Optional[float] = None
+        self._throttled = 0
+        self._rejected = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.burst,
+            self._tokens + (now - self._refilled_at) * self.rate,
+        )
+        self._refilled_at = now
+
+    def _admit(self, now: float) -> None:
+        """熔断检查；half-open 时只允许一个探测请求通过。"""
+        if self.state == "open":
+            if now < self._open_until:
+                self._rejected += 1
+                raise CircuitOpenError(self.host, self._open_until - now)
+
+            self.state = "half_open"
+            self._probe_started = None
+
+        if self.state == "half_open":
+            if (
+                self._probe_started is not None
+                and now - self._probe_started < constants.BREAKER_PROBE_TIMEOUT
+            ):
+                self._rejected += 1
+                raise CircuitOpenError(self.host, 1.0)
+
+            self._probe_started = now
+
+    async def acquire(self) -> None:
+        """等待一个令牌；需要等待超过 RATE_LIMIT_MAX_WAIT 秒时直接拒绝。"""
+        while True:
+            now = time.monotonic()
+            self._admit(now)
+            self._refill(now)
+            wait = self._blocked_until - now
+
+            if wait <= 0 and self._tokens >= 1:
+                self._tokens -= 1
+                return
+
+            if wait <= 0:
+                wait = (1 - self._tokens) / self.rate
+
+            if wait > constants.RATE_LIMIT_MAX_WAIT:
+                self._rejected += 1
+                raise CircuitOpenError(self.host, wait)
+
+            if self.state == "half_open":
+                # 探测请求等待期间让出名额，避免其他请求以为探测仍在进行。
+                self._probe_started = None
+
+            await asyncio.sleep(wait)
+
+    def observe(
+        self,
+        status: int,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """根据响应状态调整速率与熔断状态。"""
+        if status not in THROTTLE_STATUSES:
+            self._record_success()
+            return
+
+        self._throttled += 1
+        self.rate = max(constants.RATE_LIMIT_MIN_RATE, self.rate / 2)
+        retry_after = parse_retry_after((headers or {}).get("Retry-After"))
+
+        if retry_after is not None:
+            self._blocked_until = max(
+                self._blocked_until,
+                time.monotonic() + retry_after,
+            )
+
+        self._record_failure(retry_after)
+
+    def observe_error(self) -> None:
+        """连接失败或超时，与 5xx 一样计入连续失败，但不改变速率。"""
+        self._record_failure(None)
+
+    def _record_success(self) -> None:
+        self._failures = 0
+        self.rate = min(self.base_rate, self.rate + constants.RATE_LIMIT_RECOVERY)
+
+        if self.state == "half_open":
+            self.state = "closed"
+            self._probe_started = None
+            self._cooldown = float(constants.BREAKER_COOLDOWN)
+
+    def _record_failure(self, retry_after: Optional[float]) -> None:
+        self._failures += 1
+        now = time.monotonic()
+
+        if self.state == "half_open":
+            # 探测失败，冷却时间翻倍后重新熔断。
+            self._cooldown = min(
+                self._cooldown * 2,
+                float(constants.BREAKER_MAX_COOLDOWN),
+            )
+        elif not (
+            self._failures >= constants.BREAKER_FAILURE_THRESHOLD
+            or (
+                retry_after is not None
+                and retry_after > constants.RATE_LIMIT_MAX_WAIT
+            )
+        ):
+            return
+
+        self.state = "open"
+        self._probe_started = None
+        self._open_until = now + max(self._cooldown, retry_after or 0.0)
+
+    def retry_delay(self, attempt: int) -> float:
+        """
+        重试前的等待时间：指数退避与 Retry-After 取较大者。
+
+        已熔断时不再等待，下一次 acquire 会直接拒绝。
+        """
+        if self.state == "open":
+            return 0.0
+
+        return max(
+            constants.RETRY_BACKOFF_BASE * (2**attempt),
+            self._blocked_until - time.monotonic(),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+
+        if self.state != "open":
+            self._refill(now)
+
+        return {
+            "state": self.state,
+            "tokens": round(self._tokens, 2),
+            "rate": round(self.rate, 2),
+            "burst": self.burst,
+            "failures": self._failures,
+            "retryAfter": round(max(0.0, self._blocked_until - now), 1),
+            "openFor": round(max(0.0, self._open_until - now), 1)
+            if self.state == "open"
+            else 0.0,
+            "throttled": self._throttled,
+            "rejected": self._rejected,
+        }
+
+
+class _Unlimited:
+    """非 PRTS 主机不限流，接口与 HostLimiter 一致。"""
+
+    async def acquire(self) -> None:
+        return None
+
+    def observe(self, status: int, headers: Optional[Mapping[str, str]] = None) -> None:
+        return None
+
+    def observe_error(self) -> None:
+        return None
+
+    def retry_delay(self, attempt: int) -> float:
+        return constants.RETRY_BACKOFF_BASE * (2**attempt)
+
+
+_UNLIMITED = _Unlimited()
+
+
+class PRTSRateLimiter:
+    """按主机名分配 HostLimiter，只对 PRTS_ALLOWED_HOSTS 及其子域名生效。"""
+
+    def __init__(self) -> None:
+        self._hosts: Dict[str, HostLimiter] = {}
+
+    def for_url(self, url: str):
+        host = (urlparse(url).hostname or "").lower()
+
+        if not any(
+            host == allowed or host.endswith(f".{allowed}")
+            for allowed in constants.PRTS_ALLOWED_HOSTS
+        ):
+            return _UNLIMITED
+
+        limiter = self._hosts.get(host)
+
+        if limiter is None:
+            limiter = HostLimiter(host)
+            self._hosts[host] = limiter
+
+        return limiter
+
+    async def acquire(self, url: str):
+        """取得 url 所属主机的令牌并返回对应限流器，供请求结束后上报状态。"""
+        limiter = self.for_url(url)
+        await limiter.acquire()
+        return limiter
+
+    def is_open(self, url: str) -> bool:
+        limiter = self.for_url(url)
+        return isinstance(limiter, HostLimiter) and limiter.state == "open"
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {host: limiter.stats() for host, limiter in sorted(self._hosts.items())}
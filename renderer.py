@@ -1,11 +1,17 @@
 import asyncio
+import glob
+import hashlib
+import json
 import math
+import os
 import tempfile
 import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from io import BytesIO
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from PIL import Image, ImageChops, ImageDraw, ImageEnhance, ImageFont, ImageOps
 
@@ -15,6 +21,28 @@ Color = Tuple[int, ...]
 Points = List[Tuple[int, int]]
 
 
+@dataclass
+class ListBlock:
+    """A full-width strip of the archive list: a section header or one grid row.
+
+    ``height`` includes the spacing below the strip, so stacking blocks
+    reproduces the original single-image layout exactly.
+    """
+
+    kind: str  # "section", "cards" or "modules"
+    height: int
+    section: int = 0
+    title_cn: str = ""
+    title_en: str = ""
+    count: int = 0
+    items: List[Any] = field(default_factory=list)
+    # Index of the first item within its section.
+    start: int = 0
+    card_height: int = 0
+    style: str = ""  # "custom", "operator" or "skin"
+    header: Optional["ListBlock"] = None
+
+
 class VoiceRenderer:
     """Render the Rhodes-Island-style voice archive and help panels."""
 
@@ -38,7 +66,34 @@ class VoiceRenderer:
     GRID_GAP = 14
     GRID_COLS = 3
 
-    def __init__(self, font_path: Optional[str] = None, output_dir: Optional[str] = None) -> None:
+    # The terminal grid repeats every GRID_STEP px.  Page content starts below
+    # the header band and ends above the footer band, so both bands can be
+    # rendered once and pasted as sprites.
+    GRID_STEP = 48
+    HEADER_BAND = 176
+    FOOTER_BAND = 64
+    CHROME_CACHE_LIMIT = 32
+
+    # Bump whenever a layout change should invalidate previously cached PNGs.
+    RENDERER_VERSION = 2
+    # Cached renders kept per output type; the least recently served go first.
+    RENDER_CACHE_LIMIT = 24
+
+    # Paginated list pages are at most this tall; only the last one is shorter.
+    LIST_PAGE_HEIGHT = 3600
+    LIST_TOP = 190
+    LIST_BOTTOM = 72
+    MODULE_COLS = 5
+
+    # List blocks are drawn as independent tiles on this many threads.
+    RENDER_WORKERS = min(4, os.cpu_count() or 1)
+
+    def __init__(
+        self,
+        font_path: Optional[str] = None,
+        output_dir: Optional[str] = None,
+        thumb_dir: Optional[str] = None,
+    ) -> None:
         self.font_path = font_path
         self._font_cache: Dict[Tuple[int, bool, bool], ImageFont.FreeTypeFont] = {}
         self._font_bytes_cache: Dict[str, Optional[bytes]] = {}
@@ -50,6 +105,23 @@ class VoiceRenderer:
             "help": threading.Lock(),
             "list": threading.Lock(),
         }
+        # Per output type; only touched while holding the matching output lock.
+        self._cache_counters = {
+            prefix: {"hits": 0, "misses": 0} for prefix in self._output_locks
+        }
+        self._font_signature_cache: Optional[List[Any]] = None
+        # Grid tiles and header/footer sprites, keyed by canvas width and
+        # whatever else changes their pixels.
+        self._chrome_cache: Dict[Tuple[Any, ...], Image.Image] = {}
+        # Re-entrant: header and footer sprites are built on top of the grid tile.
+        self._chrome_lock = threading.RLock()
+        # Pre-masked avatars are persisted here when a directory is given.
+        self.thumb_dir = Path(thumb_dir) if thumb_dir else None
+        if self.thumb_dir is not None:
+            self.thumb_dir.mkdir(parents=True, exist_ok=True)
+        self._mask_cache: Dict[int, Image.Image] = {}
+        self._tile_executor: Optional[ThreadPoolExecutor] = None
+        self._tile_executor_lock = threading.Lock()
 
     def _font_candidates(self, *, bold: bool, mono: bool) -> Sequence[Path]:
         base = Path(__file__).parent
@@ -160,21 +232,109 @@ class VoiceRenderer:
     def _new_rgba(size: Tuple[int, int], color: Color = (0, 0, 0, 0)) -> Image.Image:
         return Image.new("RGBA", size, color)
 
-    def _new_output_path(self, prefix: str) -> Path:
+    def _new_output_path(self, prefix: str, digest: str) -> Path:
         if prefix not in self._output_locks:
             raise ValueError(f"不支持的渲染输出类型: {prefix}")
 
-        return self.output_dir / f"{prefix}.png"
+        return self.output_dir / f"{prefix}-{digest}.png"
 
-    def _save_output(self, image: Image.Image, prefix: str) -> Path:
-        """同类图片串行原子覆盖，始终只保留一个最终文件。"""
-        path = self._new_output_path(prefix)
+    @staticmethod
+    def _file_signature(path: Optional[str]) -> Optional[List[int]]:
+        """Size and mtime of a file, or None when it is missing."""
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _font_signature(self) -> List[Any]:
+        """Describe every font the renderer may pick, so swapping one busts the cache."""
+        if self._font_signature_cache is None:
+            signature = []
+            for bold, mono in ((False, False), (True, False), (False, True)):
+                for candidate in self._font_candidates(bold=bold, mono=mono):
+                    stat = self._file_signature(str(candidate))
+                    if stat is not None:
+                        signature.append([str(candidate), *stat])
+            self._font_signature_cache = signature
+        return self._font_signature_cache
+
+    def _cache_key(self, prefix: str, payload: Any) -> str:
+        blob = json.dumps(
+            {
+                "renderer": self.RENDERER_VERSION,
+                "prefix": prefix,
+                "canvas": self.CANVAS_WIDTH,
+                "fonts": self._font_signature(),
+                "input": payload,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:24]
+
+    def _render_cached(
+        self,
+        prefix: str,
+        payload: Any,
+        render: Callable[[], Image.Image],
+    ) -> Path:
+        """Return the PNG for ``payload``, rendering it only on a cache miss.
+
+        The cache is content addressed: the file name is a hash of the render
+        input, so identical requests reuse the same file and a changed input
+        simply produces a new one.  Renders of the same type are serialised,
+        which also lets a concurrent identical request hit the fresh file.
+        """
+        path = self._new_output_path(prefix, self._cache_key(prefix, payload))
+        counters = self._cache_counters[prefix]
 
         with self._output_locks[prefix]:
-            self._save_atomic(image, path)
+            if path.is_file():
+                counters["hits"] += 1
+                try:
+                    # Refresh mtime so pruning keeps recently served renders.
+                    os.utime(path)
+                except OSError:
+                    pass
+                return path
+
+            counters["misses"] += 1
+            self._save_atomic(render(), path)
+            self._prune_cache(prefix, keep=path)
 
         return path
 
+    def _prune_cache(self, prefix: str, *, keep: Path) -> None:
+        entries = []
+        for path in self.output_dir.glob(f"{prefix}-*.png"):
+            try:
+                entries.append((path.stat().st_mtime_ns, path))
+            except OSError:
+                continue
+        entries.sort(reverse=True)
+
+        stale = [path for _, path in entries[self.RENDER_CACHE_LIMIT :]]
+        # Fixed-name output written by older versions of the renderer.
+        stale.append(self.output_dir / f"{prefix}.png")
+        for path in stale:
+            if path != keep:
+                path.unlink(missing_ok=True)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and cached file counts per output type."""
+        stats: Dict[str, Any] = {"hits": 0, "misses": 0}
+        for prefix, counters in self._cache_counters.items():
+            entries = sum(1 for _ in self.output_dir.glob(f"{prefix}-*.png"))
+            stats[prefix] = {**counters, "entries": entries}
+            stats["hits"] += counters["hits"]
+            stats["misses"] += counters["misses"]
+        return stats
+
     @staticmethod
     def _save_atomic(image: Image.Image, path: Path) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
@@ -264,15 +424,39 @@ class VoiceRenderer:
 
         return name, "未命名时装"
 
+    def _chrome_sprite(
+        self, key: Tuple[Any, ...], build: Callable[[], Image.Image]
+    ) -> Image.Image:
+        with self._chrome_lock:
+            sprite = self._chrome_cache.get(key)
+            if sprite is None:
+                sprite = build()
+                if len(self._chrome_cache) >= self.CHROME_CACHE_LIMIT:
+                    self._chrome_cache.pop(next(iter(self._chrome_cache)))
+                self._chrome_cache[key] = sprite
+        return sprite
+
+    def _grid_tile(self, width: int) -> Image.Image:
+        """One GRID_STEP-high strip of the terminal grid, tiled down the page."""
+
+        def build() -> Image.Image:
+            step = self.GRID_STEP
+            tile = self._new_rgba((width, step), self.COLOR_BG + (255,))
+            draw = ImageDraw.Draw(tile)
+            for x in range(0, width, step):
+                draw.line((x, 0, x, step), fill=self.COLOR_GRID, width=1)
+            draw.line((0, 0, width, 0), fill=self.COLOR_GRID, width=1)
+            return tile
+
+        return self._chrome_sprite(("grid", width), build)
+
     def _draw_background(self, image: Image.Image, draw: ImageDraw.ImageDraw) -> None:
         width, height = image.size
-        draw.rectangle((0, 0, width, height), fill=self.COLOR_BG)
 
         # Fine terminal grid; intentionally subtle so dense data remains readable.
-        for x in range(0, width, 48):
-            draw.line((x, 0, x, height), fill=self.COLOR_GRID, width=1)
-        for y in range(0, height, 48):
-            draw.line((0, y, width, y), fill=self.COLOR_GRID, width=1)
+        tile = self._grid_tile(width)
+        for y in range(0, height, self.GRID_STEP):
+            image.paste(tile, (0, y))
 
         draw.rectangle((20, 20, width - 20, height - 20), outline=(45, 51, 54), width=1)
         draw.rectangle((20, 20, 27, height - 20), fill=self.COLOR_YELLOW)
@@ -288,6 +472,45 @@ class VoiceRenderer:
             draw.line((x, y, x + sx * mark, y), fill=self.COLOR_MUTED, width=2)
             draw.line((x, y, x, y + sy * mark), fill=self.COLOR_MUTED, width=2)
 
+    def _paste_header(self, image: Image.Image, *, page_code: str, title: str) -> int:
+        """Paste the background and header band; same pixels as drawing them."""
+        width = image.width
+
+        def build() -> Image.Image:
+            # Tall enough that the bottom frame and registration marks stay
+            # below the band.
+            height = self.HEADER_BAND + self.GRID_STEP * 2
+            band = self._new_rgba((width, height), self.COLOR_BG + (255,))
+            draw = ImageDraw.Draw(band)
+            self._draw_background(band, draw)
+            self._draw_header(draw, width, page_code=page_code, title=title)
+            return band.crop((0, 0, width, self.HEADER_BAND))
+
+        image.paste(self._chrome_sprite(("header", width, page_code, title), build))
+        return self.HEADER_BAND
+
+    def _paste_footer(self, image: Image.Image) -> None:
+        """Paste the background and footer band along the bottom edge."""
+        width, height = image.size
+        # Horizontal grid lines are anchored to the top edge, so the band
+        # depends on where the last line falls relative to the bottom.
+        phase = height % self.GRID_STEP
+
+        def build() -> Image.Image:
+            band_height = self.GRID_STEP * 3 + phase
+            band = self._new_rgba((width, band_height), self.COLOR_BG + (255,))
+            draw = ImageDraw.Draw(band)
+            self._draw_background(band, draw)
+            self._draw_footer(draw, width, band_height)
+            return band.crop(
+                (0, band_height - self.FOOTER_BAND, width, band_height)
+            )
+
+        image.paste(
+            self._chrome_sprite(("footer", width, phase), build),
+            (0, height - self.FOOTER_BAND),
+        )
+
     def _draw_hazard(
         self,
         draw: ImageDraw.ImageDraw,
@@ -388,7 +611,7 @@ class VoiceRenderer:
             font=self._load_font(12, mono=True),
             fill=self.COLOR_MUTED,
         )
-        return 176
+        return self.HEADER_BAND
 
     def _draw_section_header(
         self,
@@ -472,29 +695,82 @@ class VoiceRenderer:
         pdraw.rectangle((8, 8, size - 8, size - 8), outline=self.COLOR_MUTED, width=1)
         return placeholder
 
-    def _paste_cut_avatar(
-        self, image: Image.Image, avatar_path: Optional[str], x: int, y: int, size: int
-    ) -> None:
+    def _cut_mask(self, size: int) -> Image.Image:
+        """Cut-corner avatar mask, built once per size and shared by all cards."""
+        mask = self._mask_cache.get(size)
+        if mask is None:
+            mask = Image.new("L", (size, size), 0)
+            mdraw = ImageDraw.Draw(mask)
+            cut = 10
+            mdraw.polygon(
+                [
+                    (0, 0),
+                    (size - cut, 0),
+                    (size, cut),
+                    (size, size),
+                    (cut, size),
+                    (0, size - cut),
+                ],
+                fill=255,
+            )
+            self._mask_cache[size] = mask
+        return mask
+
+    def _masked_avatar(self, avatar_path: Optional[str], size: int) -> Image.Image:
         avatar = self._open_avatar(avatar_path, size).convert("RGBA")
-        mask = Image.new("L", (size, size), 0)
-        mdraw = ImageDraw.Draw(mask)
-        cut = 10
-        mdraw.polygon(
-            [
-                (0, 0),
-                (size - cut, 0),
-                (size, cut),
-                (size, size),
-                (cut, size),
-                (0, size - cut),
-            ],
-            fill=255,
-        )
         # Preserve transparent regions from the source portrait while also
         # applying the terminal-style cut-corner mask.  putalpha(mask) alone
         # would make every source pixel inside the polygon opaque again.
-        avatar.putalpha(ImageChops.multiply(avatar.getchannel("A"), mask))
-        image.alpha_composite(avatar, (x, y))
+        avatar.putalpha(ImageChops.multiply(avatar.getchannel("A"), self._cut_mask(size)))
+        return avatar
+
+    def _thumbnail_path(self, avatar_path: Optional[str], size: int) -> Optional[Path]:
+        """``{stem}.{size}.{digest}.png``; the digest covers the source signature."""
+        if self.thumb_dir is None:
+            return None
+        signature = self._file_signature(avatar_path)
+        if signature is None:
+            return None
+        source = Path(str(avatar_path))
+        digest = hashlib.sha256(
+            json.dumps([self.RENDERER_VERSION, str(source), *signature]).encode("utf-8")
+        ).hexdigest()[:16]
+        return self.thumb_dir / f"{source.stem}.{size}.{digest}.png"
+
+    def _avatar_thumbnail(self, avatar_path: Optional[str], size: int) -> Image.Image:
+        """Ready-to-paste avatar, read from the thumbnail cache when possible.
+
+        Missing portraits are not cached; their placeholder is cheap to draw.
+        A replaced portrait changes its signature and therefore its file name,
+        and the outdated thumbnail is removed when the new one is written.
+        """
+        thumb_path = self._thumbnail_path(avatar_path, size)
+        if thumb_path is None:
+            return self._masked_avatar(avatar_path, size)
+
+        if thumb_path.is_file():
+            try:
+                with Image.open(thumb_path) as cached:
+                    if cached.size == (size, size):
+                        return cached.convert("RGBA")
+            except (OSError, ValueError):
+                pass
+
+        avatar = self._masked_avatar(avatar_path, size)
+        try:
+            self._save_atomic(avatar, thumb_path)
+            stem = glob.escape(Path(str(avatar_path)).stem)
+            for path in self.thumb_dir.glob(f"{stem}.{size}.*.png"):
+                if path != thumb_path:
+                    path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return avatar
+
+    def _paste_cut_avatar(
+        self, image: Image.Image, avatar_path: Optional[str], x: int, y: int, size: int
+    ) -> None:
+        image.alpha_composite(self._avatar_thumbnail(avatar_path, size), (x, y))
 
     def _draw_language_tags(
         self,
@@ -711,12 +987,18 @@ class VoiceRenderer:
         return await asyncio.to_thread(self._render_help_logic)
 
     def _render_help_logic(self) -> str:
+        # The help panel is static, so only the font set and renderer version
+        # (both part of every cache key) can change its output.
+        output_path = self._render_cached("help", {}, self._draw_help_page)
+        return str(output_path.absolute())
+
+    def _draw_help_page(self) -> Image.Image:
         width = self.CANVAS_WIDTH
         height = 1440
         image = self._new_rgba((width, height), self.COLOR_BG + (255,))
         draw = ImageDraw.Draw(image)
         self._draw_background(image, draw)
-        self._draw_header(draw, width, page_code="TRM-01", title="明日方舟语音帮助")
+        self._paste_header(image, page_code="TRM-01", title="明日方舟语音帮助")
 
         left = self.PAGE_MARGIN
         content_width = width - self.PAGE_MARGIN * 2
@@ -988,9 +1270,9 @@ class VoiceRenderer:
             592,
             card_width,
             2,
-            "/mrfz_list",
+            "/mrfz_list [页码]",
             "读取本地干员、时装与语言索引。",
-            "/mrfz_list",
+            "/mrfz_list 2",
         )
         draw_command_card(
             left + card_width + gap,
@@ -1133,69 +1415,244 @@ class VoiceRenderer:
         draw_micro_label(left + 650, status_y + 9, "运行状态")
         draw_status_light(left + 650, status_y + 25, "ALL SYSTEMS NOMINAL")
 
-        self._draw_footer(draw, width, height)
-        output_path = self._save_output(image.convert("RGB"), "help")
-        return str(output_path.absolute())
+        self._paste_footer(image)
+        return image.convert("RGB")
 
-    def render_image(self, data: Dict, voice_descriptions: List[str]) -> str:
-        """Render the detailed archive list using the existing renderer API."""
-        custom_commands = list(data.get("custom_commands") or [])
-        operators = list(data.get("operators") or [])
-        skin_operators = list(data.get("skin_operators") or [])
+    def render_image(
+        self,
+        data: Dict,
+        voice_descriptions: List[str],
+        page: Optional[int] = None,
+    ) -> str:
+        """Render the archive list, either whole or a single 1-based page.
 
-        custom_card_h = 108
-        operator_card_h = 112
-        skin_card_h = 124
-        modules_cols = 5
-        modules_rows = (
-            math.ceil(len(voice_descriptions) / modules_cols)
-            if voice_descriptions
-            else 0
+        Only the requested page is drawn, and each page is cached on the
+        blocks it contains, so editing one page leaves the others cached.
+        """
+        blocks = self._list_blocks(data, voice_descriptions)
+        page_code = "DB-03"
+        page_height = None
+
+        if page is not None:
+            pages = self._paginate(blocks)
+            if not 1 <= page <= len(pages):
+                raise ValueError(f"页码超出范围: {page}/{len(pages)}")
+            blocks = pages[page - 1]
+            if len(pages) > 1:
+                page_code = f"DB-03 / {page:02d}-{len(pages):02d}"
+            if page < len(pages):
+                page_height = self.LIST_PAGE_HEIGHT
+
+        payload = {
+            "page_code": page_code,
+            "page_height": page_height,
+            "blocks": [self._block_payload(block) for block in blocks],
+            # Avatars are referenced by path; include their signatures so a
+            # re-downloaded portrait produces a new cache key.
+            "avatars": {
+                str(item["avatar_path"]): self._file_signature(item["avatar_path"])
+                for block in blocks
+                if block.kind == "cards"
+                for item in block.items
+                if isinstance(item, dict) and item.get("avatar_path")
+            },
+        }
+        output_path = self._render_cached(
+            "list",
+            payload,
+            lambda: self._draw_list_page(
+                blocks, page_code=page_code, height=page_height
+            ),
         )
-        modules_h = 58 + 14 + modules_rows * 42 + max(0, modules_rows - 1) * 8 + 30
+        return str(output_path.absolute())
 
-        total_height = 190
-        total_height += self._section_height(len(custom_commands), custom_card_h)
-        total_height += self._section_height(len(operators), operator_card_h)
-        total_height += self._section_height(len(skin_operators), skin_card_h)
-        total_height += modules_h + 72
+    def list_page_count(self, data: Dict, voice_descriptions: List[str]) -> int:
+        """Number of pages ``render_image`` accepts; cheap, nothing is drawn."""
+        return len(self._paginate(self._list_blocks(data, voice_descriptions)))
 
-        image = self._new_rgba(
-            (self.CANVAS_WIDTH, total_height), self.COLOR_BG + (255,)
-        )
-        draw = ImageDraw.Draw(image)
-        self._draw_background(image, draw)
-        self._draw_header(
-            draw, self.CANVAS_WIDTH, page_code="DB-03", title="干员语音档案"
-        )
+    @staticmethod
+    def _block_payload(block: ListBlock) -> List[Any]:
+        return [
+            block.kind,
+            block.height,
+            block.section,
+            block.title_cn,
+            block.title_en,
+            block.count,
+            block.items,
+            block.start,
+            block.card_height,
+            block.style,
+        ]
 
-        _, card_width = self._grid_dimensions()
-        current_y = 190
+    def _list_blocks(self, data: Dict, voice_descriptions: List[str]) -> List[ListBlock]:
+        blocks: List[ListBlock] = []
         section_no = 1
+        sections = (
+            ("custom_commands", "自定义快捷指令", "CUSTOM SHORTCUT ROUTES", 108, "custom"),
+            ("operators", "已登记干员", "REGISTERED OPERATORS", 112, "operator"),
+            ("skin_operators", "时装语音记录", "OUTFIT VOICE RECORDS", 124, "skin"),
+        )
 
-        def draw_grid_section(
-            items: List[Dict],
-            cn: str,
-            en: str,
-            card_height: int,
-            *,
-            custom: bool = False,
-            skin: bool = False,
-        ) -> None:
-            nonlocal current_y, section_no
+        for key, title_cn, title_en, card_height, style in sections:
+            items = list(data.get(key) or [])
             if not items:
-                return
-            current_y = self._draw_section_header(
-                draw, current_y, section_no, cn, en, len(items)
-            )
+                continue
+            header = ListBlock("section", 72, section_no, title_cn, title_en, len(items))
+            blocks.append(header)
             section_no += 1
-            for index, item in enumerate(items):
-                row, col = divmod(index, self.GRID_COLS)
+            rows = math.ceil(len(items) / self.GRID_COLS)
+            for row in range(rows):
+                start = row * self.GRID_COLS
+                blocks.append(
+                    ListBlock(
+                        "cards",
+                        card_height + (28 if row == rows - 1 else self.GRID_GAP),
+                        items=items[start : start + self.GRID_COLS],
+                        start=start,
+                        card_height=card_height,
+                        style=style,
+                        header=header,
+                    )
+                )
+
+        descriptions = list(voice_descriptions)
+        header = ListBlock(
+            "section",
+            72,
+            section_no,
+            "系统语音模块",
+            "SYSTEM VOICE MODULES",
+            len(descriptions),
+        )
+        blocks.append(header)
+        rows = math.ceil(len(descriptions) / self.MODULE_COLS)
+        if not rows:
+            header.height += 30
+        for row in range(rows):
+            start = row * self.MODULE_COLS
+            blocks.append(
+                ListBlock(
+                    "modules",
+                    42 + (30 if row == rows - 1 else 8),
+                    items=descriptions[start : start + self.MODULE_COLS],
+                    start=start,
+                    header=header,
+                )
+            )
+        return blocks
+
+    def _paginate(self, blocks: List[ListBlock]) -> List[List[ListBlock]]:
+        capacity = self.LIST_PAGE_HEIGHT - self.LIST_TOP - self.LIST_BOTTOM
+        pages: List[List[ListBlock]] = []
+        current: List[ListBlock] = []
+        used = 0
+
+        for index, block in enumerate(blocks):
+            needed = block.height
+            following = blocks[index + 1] if index + 1 < len(blocks) else None
+            if block.kind == "section" and following and following.header is block:
+                # Never leave a section header alone at the bottom of a page.
+                needed += following.height
+            if current and used + needed > capacity:
+                pages.append(current)
+                current, used = [], 0
+                if block.header is not None:
+                    # Repeat the section header above a continued section.
+                    current.append(block.header)
+                    used += block.header.height
+            current.append(block)
+            used += block.height
+
+        pages.append(current)
+        return pages
+
+    def _draw_list_page(
+        self,
+        blocks: List[ListBlock],
+        *,
+        page_code: str,
+        height: Optional[int] = None,
+    ) -> Image.Image:
+        if height is None:
+            height = (
+                self.LIST_TOP + sum(block.height for block in blocks) + self.LIST_BOTTOM
+            )
+
+        image = self._new_rgba((self.CANVAS_WIDTH, height), self.COLOR_BG + (255,))
+        draw = ImageDraw.Draw(image)
+        self._draw_background(image, draw)
+        self._paste_header(image, page_code=page_code, title="干员语音档案")
+
+        tops = []
+        current_y = self.LIST_TOP
+        for block in blocks:
+            tops.append(current_y)
+            current_y += block.height
+
+        executor = self._get_tile_executor() if len(blocks) > 1 else None
+        if executor is None:
+            for block, top in zip(blocks, tops):
+                self._draw_list_block(image, draw, block, top)
+        else:
+            # Every block draws strictly inside its own strip, so each strip
+            # can be cut out with its background, drawn on a worker thread
+            # and pasted back.  The result is identical to drawing in place.
+            tiles = [
+                image.crop((0, top, image.width, top + block.height))
+                for block, top in zip(blocks, tops)
+            ]
+            for tile, top in zip(
+                executor.map(self._draw_list_tile, blocks, tiles), tops
+            ):
+                image.paste(tile, (0, top))
+
+        self._paste_footer(image)
+        return image.convert("RGB")
+
+    def _draw_list_tile(self, block: ListBlock, tile: Image.Image) -> Image.Image:
+        self._draw_list_block(tile, ImageDraw.Draw(tile), block, 0)
+        return tile
+
+    def _get_tile_executor(self) -> Optional[ThreadPoolExecutor]:
+        if self.RENDER_WORKERS <= 1:
+            return None
+        with self._tile_executor_lock:
+            if self._tile_executor is None:
+                self._tile_executor = ThreadPoolExecutor(
+                    max_workers=self.RENDER_WORKERS,
+                    thread_name_prefix="mrfz-render",
+                )
+            return self._tile_executor
+
+    def close(self) -> None:
+        """Stop the tile worker threads; they are recreated on the next render."""
+        with self._tile_executor_lock:
+            executor, self._tile_executor = self._tile_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _draw_list_block(
+        self,
+        image: Image.Image,
+        draw: ImageDraw.ImageDraw,
+        block: ListBlock,
+        y: int,
+    ) -> None:
+        if block.kind == "section":
+            self._draw_section_header(
+                draw, y, block.section, block.title_cn, block.title_en, block.count
+            )
+            return
+
+        if block.kind == "cards":
+            _, card_width = self._grid_dimensions()
+            for col, item in enumerate(block.items):
                 x = self.PAGE_MARGIN + col * (card_width + self.GRID_GAP)
-                y = current_y + row * (card_height + self.GRID_GAP)
-                if custom:
+                index = block.start + col + 1
+                if block.style == "custom":
                     self._draw_custom_card(
-                        image, draw, item, x, y, card_width, card_height, index + 1
+                        image, draw, item, x, y, card_width, block.card_height, index
                     )
                 else:
                     self._draw_operator_card(
@@ -1205,52 +1662,22 @@ class VoiceRenderer:
                         x,
                         y,
                         card_width,
-                        card_height,
-                        index + 1,
-                        is_skin=skin,
+                        block.card_height,
+                        index,
+                        is_skin=block.style == "skin",
                     )
-            rows = math.ceil(len(items) / self.GRID_COLS)
-            current_y += rows * card_height + max(0, rows - 1) * self.GRID_GAP + 28
-
-        draw_grid_section(
-            custom_commands,
-            "自定义快捷指令",
-            "CUSTOM SHORTCUT ROUTES",
-            custom_card_h,
-            custom=True,
-        )
-        draw_grid_section(
-            operators,
-            "已登记干员",
-            "REGISTERED OPERATORS",
-            operator_card_h,
-        )
-        draw_grid_section(
-            skin_operators,
-            "时装语音记录",
-            "OUTFIT VOICE RECORDS",
-            skin_card_h,
-            skin=True,
-        )
-
-        current_y = self._draw_section_header(
-            draw,
-            current_y,
-            section_no,
-            "系统语音模块",
-            "SYSTEM VOICE MODULES",
-            len(voice_descriptions),
-        )
+            return
+
         module_gap = 10
         module_width = (
-            self.CANVAS_WIDTH - self.PAGE_MARGIN * 2 - module_gap * (modules_cols - 1)
-        ) // modules_cols
+            self.CANVAS_WIDTH
+            - self.PAGE_MARGIN * 2
+            - module_gap * (self.MODULE_COLS - 1)
+        ) // self.MODULE_COLS
         module_height = 42
 
-        for index, description in enumerate(voice_descriptions):
-            row, col = divmod(index, modules_cols)
+        for col, description in enumerate(block.items):
             x = self.PAGE_MARGIN + col * (module_width + module_gap)
-            y = current_y + row * (module_height + 8)
             self._draw_cut_panel(
                 draw,
                 (x, y, module_width, module_height),
@@ -1261,7 +1688,7 @@ class VoiceRenderer:
             draw.rectangle((x, y, x + 4, y + module_height - 7), fill=self.COLOR_YELLOW)
             draw.text(
                 (x + 12, y + 6),
-                f"M-{index + 1:02d}",
+                f"M-{block.start + col + 1:02d}",
                 font=self._load_font(9, bold=True, mono=True),
                 fill=self.COLOR_CYAN,
             )
@@ -1271,10 +1698,6 @@ class VoiceRenderer:
             )
             draw.text((x + 54, y + 12), fitted, font=text_font, fill=self.COLOR_TEXT)
 
-        self._draw_footer(draw, self.CANVAS_WIDTH, total_height)
-        output_path = self._save_output(image.convert("RGB"), "list")
-        return str(output_path.absolute())
-
     def _draw_footer(
         self,
         draw: ImageDraw.ImageDraw,
@@ -26,6 +26,8 @@ from astrbot.api.web import (
 )
 
 from . import constants
+from .bulk_fetch import collect_targets
+from .group_commit import GroupCommit
 
 
 PLUGIN_NAME = constants.PLUGIN_NAME
@@ -55,6 +57,9 @@ class VoicePageManager:
         save_custom_commands: Callable[[], bool],
         scan_callback: Callable[[bool], Awaitable[None]],
         valid_trigger: Callable[[object], bool],
+        trigger_stats: Callable[[], dict],
+        render_stats: Callable[[], dict],
+        bulk_fetcher,
         default_language_rank: str,
         default_download_langs: str,
         default_download_skin: bool,
@@ -65,6 +70,9 @@ class VoicePageManager:
         self.save_custom_commands = save_custom_commands
         self.scan_callback = scan_callback
         self.valid_trigger = valid_trigger
+        self.trigger_stats = trigger_stats
+        self.render_stats = render_stats
+        self.bulk_fetcher = bulk_fetcher
         self.default_language_rank = str(default_language_rank)
         self.default_download_langs = str(default_download_langs)
         self.default_download_skin = bool(default_download_skin)
@@ -156,6 +164,18 @@ class VoicePageManager:
                 "Preview a PRTS download task",
             ),
             ("/fetch", self.start_fetch, ["POST"], "Start a PRTS download task"),
+            (
+                "/fetch/bulk",
+                self.bulk_fetch,
+                ["GET", "POST"],
+                "Start or read a bulk PRTS download",
+            ),
+            (
+                "/fetch/bulk/cancel",
+                self.cancel_bulk_fetch,
+                ["POST"],
+                "Cancel the bulk PRTS download",
+            ),
             (
                 "/preview/discard",
                 self.discard_preview,
@@ -854,6 +874,11 @@ class VoicePageManager:
                 "languageCount": len(languages),
                 "voiceTypes": len(self.voice_mgr.VOICE_DESCRIPTIONS),
                 "bindings": len(self.custom_mappings),
+                "triggerDispatch": self.trigger_stats(),
+                "renderCache": self.render_stats(),
+                "parserPool": self.voice_mgr.parse_pool_stats(),
+                "rateLimit": self.voice_mgr.rate_limit_stats(),
+                "catalog": self.voice_mgr.catalog.stats(),
                 "storage": storage,
                 "runningTasks": sum(
                     item.get("status") in {"queued", "running"}
@@ -1127,6 +1152,56 @@ class VoicePageManager:
             logger.warning(f"备份文件失败 {target}: {exc}")
             return None
 
+    def _commit_import(self, batch: GroupCommit) -> int:
+        """
+        提交导入批次，返回备份的文件数。
+
+        暂存文件先全部落盘，再备份将被覆盖的文件，最后依次原子改名；改名
+        中途失败时，已替换的文件从备份恢复、新增的文件删除，档案回到导入前。
+        """
+        try:
+            batch.sync()
+        except OSError:
+            batch.discard()
+            raise
+
+        existed = {target for target in batch.targets() if target.is_file()}
+        backups = {}
+
+        for target in existed:
+            backup = self._backup_existing(target, "import")
+
+            if backup is not None:
+                backups[target] = backup
+
+        try:
+            batch.commit()
+        except OSError:
+            for target in batch.committed:
+                try:
+                    if target in backups:
+                        self._restore_backup(backups[target], target)
+                    elif target not in existed:
+                        target.unlink(missing_ok=True)
+                    else:
+                        logger.error(f"导入失败且没有备份，无法恢复 {target}")
+                except OSError as exc:
+                    logger.error(f"导入失败后恢复 {target} 出错: {exc}")
+            raise
+
+        return len(backups)
+
+    @staticmethod
+    def _restore_backup(backup: Path, target: Path) -> None:
+        """把备份复制回原位置，先写临时文件再原子替换。"""
+        temp_path = target.with_name(f".{target.name}.{uuid4().hex}.restore")
+
+        try:
+            shutil.copy2(backup, temp_path)
+            os.replace(temp_path, target)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
     async def _save_upload(
         self,
         upload: PluginUploadFile,
@@ -1460,6 +1535,8 @@ class VoicePageManager:
             imported = 0
             skipped = 0
 
+            batch = GroupCommit()
+
             async with self._mutation_lock:
                 for _, action, staged_path, target in plan:
                     if action == "skip":
@@ -1467,14 +1544,11 @@ class VoicePageManager:
                         continue
 
                     target.parent.mkdir(parents=True, exist_ok=True)
-
-                    if action == "overwrite":
-                        if self._backup_existing(target, "import") is not None:
-                            backups += 1
-
-                    os.replace(staged_path, target)
+                    batch.add(staged_path, target)
                     imported += 1
 
+                backups = await asyncio.to_thread(self._commit_import, batch)
+
             if imported:
                 await self.scan_callback(True)
 
@@ -1537,7 +1611,7 @@ class VoicePageManager:
                     zip_path,
                     Path(stage_name),
                 )
-                backups = 0
+                batch = GroupCommit()
 
                 async with self._mutation_lock:
                     for voice, staged_path in staged.items():
@@ -1547,11 +1621,9 @@ class VoicePageManager:
                             voice,
                         )
                         target.parent.mkdir(parents=True, exist_ok=True)
+                        batch.add(staged_path, target)
 
-                        if self._backup_existing(target, "import") is not None:
-                            backups += 1
-
-                        os.replace(staged_path, target)
+                    backups = await asyncio.to_thread(self._commit_import, batch)
 
             await self.scan_callback(True)
             await self._audit(
@@ -2026,6 +2098,12 @@ class VoicePageManager:
         if not self.voice_mgr.validate_character(character):
             raise ValueError("角色名称不合法")
 
+        return {
+            "character": character,
+            **self._normalize_fetch_options(payload),
+        }
+
+    def _normalize_fetch_options(self, payload: dict) -> dict:
         rank_to_language = {
             str(info["rank"]): code
             for code, info in self.voice_mgr.LANGUAGE_MAP.items()
@@ -2041,7 +2119,6 @@ class VoicePageManager:
             raise ValueError("请选择至少一种下载语言")
 
         return {
-            "character": character,
             "languages": ranks,
             "languageCodes": [rank_to_language[rank] for rank in ranks],
             "includeSkin": bool(
@@ -2078,6 +2155,16 @@ class VoicePageManager:
             overwritten = 0
             missing = 0
             damaged = 0
+            catalog = self.voice_mgr.catalog
+            catalog_entry = catalog.entry(
+                self.voice_mgr.resolve_operator_alias(character)
+            )
+            catalog_skins = 0
+            catalog_slots = 0
+            warnings = []
+
+            if catalog.ready and catalog_entry is None:
+                warnings.append("PRTS 干员目录中没有该名称，任务可能失败，请检查拼写。")
 
             for reference in references:
                 for language in language_codes:
@@ -2099,6 +2186,37 @@ class VoicePageManager:
                         else:
                             missing += 1
 
+            if catalog_entry and catalog_entry["detailsAt"]:
+                unavailable = [
+                    self.voice_mgr.LANGUAGE_MAP[language]["name"]
+                    for language in language_codes
+                    if language not in catalog_entry["languages"]
+                ]
+
+                if unavailable:
+                    warnings.append(f"PRTS 未提供以下语言：{'、'.join(unavailable)}。")
+
+                if operation["includeSkin"]:
+                    # 目录中已登记、但本地尚无文件的皮肤包按缺失计入。
+                    local_skins = {
+                        str(info.get("name", ""))
+                        for info in self.voice_mgr.skin_metadata.get(
+                            catalog_entry["name"],
+                            {},
+                        ).values()
+                    }
+
+                    for skin_name, codes in catalog_entry["skins"].items():
+                        if skin_name in local_skins:
+                            continue
+
+                        catalog_skins += 1
+                        catalog_slots += sum(
+                            language in codes for language in language_codes
+                        ) * len(self.voice_mgr.VOICE_DESCRIPTIONS)
+
+                    missing += catalog_slots
+
             language_names = [
                 self.voice_mgr.LANGUAGE_MAP[language]["name"]
                 for language in language_codes
@@ -2110,12 +2228,13 @@ class VoicePageManager:
                 "languageCodes": language_codes,
                 "languageNames": language_names,
                 "includeSkin": operation["includeSkin"],
-                "knownArchives": len(references),
+                "knownArchives": len(references) + catalog_skins,
                 "knownSlots": (
                     len(references)
                     * len(language_codes)
                     * len(self.voice_mgr.VOICE_DESCRIPTIONS)
-                ),
+                )
+                + catalog_slots,
                 "existing": existing,
                 "overwritten": overwritten,
                 "missing": missing,
@@ -2125,9 +2244,12 @@ class VoicePageManager:
                         "有效本地文件会跳过；损坏、缺失或"
                         "待编号修复的条目会重新请求。"
                     ),
+                    *warnings,
                     *(
                         [
-                            "PRTS 中尚未登记到本地的新皮肤包会在"
+                            f"干员目录中尚未下载的 {catalog_skins} 套皮肤已计入缺失数量。"
+                            if catalog_entry and catalog_entry["detailsAt"]
+                            else "PRTS 中尚未登记到本地的新皮肤包会在"
                             "任务执行时加入，未计入上述数量。"
                         ]
                         if operation["includeSkin"]
@@ -2173,6 +2295,7 @@ class VoicePageManager:
                     character,
                     include_skin,
                     languages,
+                    reuse_recent=False,
                 )
 
             await self.scan_callback(True)
@@ -2193,6 +2316,68 @@ class VoicePageManager:
         )
         return json_response(record, status_code=202)
 
+    async def bulk_fetch(self):
+        if request.method == "GET":
+            return json_response(self.bulk_fetcher.progress())
+
+        payload = await request.json(default={})
+
+        if not isinstance(payload, dict):
+            return error_response("请求格式无效")
+
+        if payload.get("resume"):
+            success, message = self.bulk_fetcher.resume()
+            target = "resume"
+        else:
+            characters = payload.get("characters")
+
+            if characters is not None and (
+                not isinstance(characters, list)
+                or not characters
+                or not all(
+                    self.voice_mgr.validate_character(name) for name in characters
+                )
+            ):
+                return error_response("角色名称不合法", status_code=400)
+
+            try:
+                options = self._normalize_fetch_options(payload)
+            except ValueError as exc:
+                return error_response(str(exc), status_code=400)
+
+            success, message = self.bulk_fetcher.start(
+                collect_targets(
+                    self.custom_mappings,
+                    self.voice_mgr.custom_operator_aliases,
+                    [name.strip() for name in characters] if characters else None,
+                    bindings_only=bool(payload.get("bindingsOnly")),
+                ),
+                languages=options["languages"],
+                include_skin=options["includeSkin"],
+            )
+            target = "bindings" if characters is None else ",".join(characters)
+
+        if not success:
+            return error_response(message, status_code=409)
+
+        await self._audit(
+            "bulk_fetch",
+            target[:200],
+            details={"message": message},
+        )
+        return json_response(
+            {"message": message, **self.bulk_fetcher.progress()},
+            status_code=202,
+        )
+
+    async def cancel_bulk_fetch(self):
+        if not self.bulk_fetcher.running:
+            return error_response("没有正在执行的批量下载任务")
+
+        await self.bulk_fetcher.stop(cancel=True)
+        await self._audit("bulk_fetch_cancel", "bulk_fetch")
+        return json_response(self.bulk_fetcher.progress())
+
     async def tasks(self):
         items = sorted(
             (dict(item) for item in self._tasks.values()),
@@ -0,0 +1,172 @@
+"""语音目录监听：文件变化时按角色增量更新索引，替代周期性全量扫描。"""
+import asyncio
+import os
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from astrbot.api import logger
+
+from . import constants
+
+try:
+    # 可选依赖：基于 inotify（Linux）等系统事件监听，未安装时使用轮询。
+    import watchfiles
+except ImportError:
+    watchfiles = None
+
+# 角色目录名集合 -> 更新索引的回调
+ChangeCallback = Callable[[Set[str]], Awaitable[None]]
+# 目录相对路径、st_mtime_ns、st_ino
+DirectorySignature = Tuple[str, int, int]
+
+
+class VoiceDirectoryWatcher:
+    """监听 voices 目录，把变化归并到角色后交给回调增量重扫。"""
+
+    def __init__(
+        self,
+        voices_dir: Path,
+        on_change: ChangeCallback,
+        *,
+        poll_interval: float = constants.WATCH_POLL_INTERVAL,
+        debounce_ms: int = constants.WATCH_DEBOUNCE_MS,
+    ) -> None:
+        self.voices_dir = Path(voices_dir)
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.debounce_ms = debounce_ms
+        self.mode = "stopped"
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event = asyncio.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+
+        self._stop_event = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        task = self._task
+        self._task = None
+        self._stop_event.set()
+
+        if task is None or task.done():
+            self.mode = "stopped"
+            return
+
+        task.cancel()
+
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+        self.mode = "stopped"
+
+    async def _run(self) -> None:
+        if watchfiles is not None:
+            try:
+                await self._watch_events()
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"语音目录事件监听不可用，改用轮询: {exc}")
+
+        await self._poll()
+
+    def _character_of(self, path: str) -> Optional[str]:
+        try:
+            relative = Path(path).relative_to(self.voices_dir)
+        except ValueError:
+            return None
+
+        # 下载和导入使用的 .xxx.tmp 临时文件最终会改名为 WAV，忽略中间过程。
+        if not relative.parts or relative.name.startswith("."):
+            return None
+
+        return relative.parts[0]
+
+    async def _dispatch(self, characters: Set[str]) -> None:
+        if not characters:
+            return
+
+        try:
+            await self.on_change(characters)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning(f"按目录变化更新语音索引失败: {exc}")
+
+    async def _watch_events(self) -> None:
+        self.mode = "inotify"
+        logger.info(f"已启用语音目录事件监听: {self.voices_dir}")
+
+        async for changes in watchfiles.awatch(
+            self.voices_dir,
+            stop_event=self._stop_event,
+            debounce=self.debounce_ms,
+            recursive=True,
+        ):
+            characters = {
+                character
+                for _, path in changes
+                if (character := self._character_of(path))
+            }
+            await self._dispatch(characters)
+
+    def _tree_signature(self, character_dir: str) -> Tuple[DirectorySignature, ...]:
+        """收集角色目录下所有子目录的签名，文件增删或改名都会改变父目录签名。"""
+        signatures = []
+
+        for root, _, _ in os.walk(character_dir):
+            try:
+                stat = os.stat(root)
+            except OSError:
+                continue
+
+            signatures.append(
+                (os.path.relpath(root, character_dir), stat.st_mtime_ns, stat.st_ino)
+            )
+
+        return tuple(sorted(signatures))
+
+    def _snapshot(self) -> Dict[str, Tuple[DirectorySignature, ...]]:
+        snapshot = {}
+
+        try:
+            entries = list(os.scandir(self.voices_dir))
+        except OSError:
+            return snapshot
+
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    snapshot[entry.name] = self._tree_signature(entry.path)
+            except OSError:
+                continue
+
+        return snapshot
+
+    async def _poll(self) -> None:
+        self.mode = "polling"
+        logger.info(
+            f"已启用语音目录轮询监听（{self.poll_interval} 秒）: {self.voices_dir}"
+        )
+        previous = await asyncio.to_thread(self._snapshot)
+
+        while not self._stop_event.is_set():
+            await asyncio.sleep(self.poll_interval)
+            current = await asyncio.to_thread(self._snapshot)
+            changed = {
+                character
+                for character in previous.keys() | current.keys()
+                if previous.get(character) != current.get(character)
+            }
+            previous = current
+            await self._dispatch(changed)
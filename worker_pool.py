@@ -0,0 +1,144 @@
+"""CPU 密集任务线程池：页面解析与图片校验移出事件循环，并记录排队深度与耗时。"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from . import constants
+
+T = TypeVar("T")
+
+
+class BoundedWorkerPool:
+    """
+    有界线程池。
+
+    同时提交到线程池的任务不超过 max_workers + max_queue，超出部分在事件
+    循环中等待，不会让线程池内部队列无限增长；等待与执行耗时分别统计。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_workers: int = constants.PARSE_POOL_WORKERS,
+        max_queue: int = constants.PARSE_POOL_QUEUE,
+    ) -> None:
+        self.name = name
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._max_depth = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+        self._run_max = 0.0
+
+    def _ensure_started(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=self.name,
+            )
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers + self.max_queue)
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """在线程池中执行 func(*args) 并返回结果，异常原样抛出。"""
+        self._ensure_started()
+        assert self._executor is not None and self._slots is not None
+        submitted = time.perf_counter()
+        self._waiting += 1
+
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        try:
+            with self._lock:
+                self._queued += 1
+                self._max_depth = max(
+                    self._max_depth,
+                    self._queued + self._running + self._waiting,
+                )
+
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                self._call,
+                submitted,
+                func,
+                args,
+            )
+        finally:
+            self._slots.release()
+
+    def _call(self, submitted: float, func: Callable[..., T], args: tuple) -> T:
+        started = time.perf_counter()
+        waited = started - submitted
+
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        failed = False
+
+        try:
+            return func(*args)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+
+            with self._lock:
+                self._running -= 1
+                self._run_total += elapsed
+                self._run_max = max(self._run_max, elapsed)
+
+                if failed:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """返回当前排队深度与累计耗时（毫秒），供 Page 概览展示。"""
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "workers": self.max_workers,
+                "capacity": self.max_workers + self.max_queue,
+                "waiting": self._waiting,
+                "queued": self._queued,
+                "running": self._running,
+                "maxDepth": self._max_depth,
+                "completed": self._completed,
+                "failed": self._failed,
+                "avgWaitMs": round(self._wait_total / finished * 1000, 2)
+                if finished
+                else 0.0,
+                "maxWaitMs": round(self._wait_max * 1000, 2),
+                "avgRunMs": round(self._run_total / finished * 1000, 2)
+                if finished
+                else 0.0,
+                "maxRunMs": round(self._run_max * 1000, 2),
+            }
+
+    def shutdown(self) -> None:
+        executor = self._executor
+        self._executor = None
+        self._slots = None
+
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)